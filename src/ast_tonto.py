@@ -0,0 +1,242 @@
+# Nós da árvore sintática (AST) produzidos pelas regras de parser_tonto.
+# A síntese (contexto.sintese) guarda estes nós: "classes", "tipos" e "enums"
+# são dicts nome -> nó e "generalizacoes"/"relacoes_externas" listas de nós.
+# Todos os nós usam __slots__ (bem menos memória que um dict por declaração)
+# e guardam a posição no código (linha, inicio, fim) nos próprios slots.
+
+from collections import namedtuple
+
+from estereotipos_tonto import codigo_estereotipo, NOMES
+
+# Trecho do código: linha inicial e deslocamentos [inicio, fim) (lexpos)
+Span = namedtuple("Span", "linha inicio fim")
+
+
+class No:
+    """
+    Base dos nós. CAMPOS lista os atributos que descrevem o elemento do
+    modelo: a igualdade compara só esses campos (não a posição), de modo que
+    a mesma declaração em outra linha continua igual. A posição fica em
+    linha/inicio/fim (None sem posição) e sai como Span em `span`.
+    """
+
+    __slots__ = ('linha', 'inicio', 'fim')
+    CAMPOS = ()
+
+    def _posicionar(self, span):
+        self.linha, self.inicio, self.fim = span if span is not None else (None, None, None)
+
+    @property
+    def span(self):
+        return None if self.linha is None else Span(self.linha, self.inicio, self.fim)
+
+    def __eq__(self, outro):
+        return type(self) is type(outro) and all(getattr(self, c) == getattr(outro, c) for c in self.CAMPOS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        campos = ", ".join(f"{c}={getattr(self, c)!r}" for c in self.CAMPOS)
+        return f"{type(self).__name__}({campos})"
+
+    def filhos(self):
+        """Nós diretamente contidos neste (atributos, relações internas, cardinalidades)."""
+        for campo in self.CAMPOS:
+            valor = getattr(self, campo)
+            if isinstance(valor, No):
+                yield valor
+            elif isinstance(valor, list):
+                yield from (item for item in valor if isinstance(item, No))
+
+    def como_dict(self):
+        """Representação em tipos básicos (para JSON), com o tipo do nó em "no"."""
+        dados = {"no": type(self).__name__}
+        for campo in self.CAMPOS:
+            dados[campo] = _como_basico(getattr(self, campo))
+        span = self.span
+        dados["span"] = span._asdict() if span else None
+        return dados
+
+
+def _como_basico(valor):
+    if isinstance(valor, No):
+        return valor.como_dict()
+    if isinstance(valor, list):
+        return [_como_basico(v) for v in valor]
+    return valor
+
+
+class Cardinalidade(No):
+    """[minimo..maximo]; maximo None é '*'."""
+
+    __slots__ = ('minimo', 'maximo')
+    CAMPOS = __slots__
+
+    def __init__(self, minimo, maximo, span=None):
+        self.minimo = minimo
+        self.maximo = maximo
+        self._posicionar(span)
+
+    @property
+    def texto(self):
+        maximo = '*' if self.maximo is None else self.maximo
+        return f"[{maximo}]" if self.minimo == self.maximo else f"[{self.minimo}..{maximo}]"
+
+
+class Atributo(No):
+    __slots__ = ('nome', 'tipo', 'cardinalidade', 'meta')
+    CAMPOS = __slots__
+
+    def __init__(self, nome, tipo, cardinalidade=None, meta=None, span=None):
+        self.nome = nome
+        self.tipo = tipo
+        self.cardinalidade = cardinalidade
+        self.meta = meta
+        self._posicionar(span)
+
+
+# Tuplas de um código só, compartilhadas por todas as relações com o mesmo estereótipo
+_UNITARIAS = tuple((codigo,) for codigo in range(len(NOMES)))
+
+
+def _codigos(estereotipos):
+    codigos = tuple(codigo_estereotipo(e) for e in estereotipos)
+    return _UNITARIAS[codigos[0]] if len(codigos) == 1 else codigos
+
+
+class _ComEstereotipos(No):
+    """Relação: os estereótipos são guardados como códigos (estereotipos_tonto) em `codigos`."""
+
+    __slots__ = ('codigos',)
+
+    @property
+    def estereotipos(self):
+        return [NOMES[codigo] for codigo in self.codigos]
+
+
+class RelacaoInterna(_ComEstereotipos):
+    """Relação declarada no corpo de uma classe, da classe para `alvo`."""
+
+    __slots__ = ('nome', 'simbolo', 'cardinalidade_origem', 'cardinalidade_destino', 'alvo')
+    CAMPOS = ('estereotipos',) + __slots__
+
+    def __init__(self, estereotipos, alvo, nome=None, simbolo=None, cardinalidade_origem=None,
+                 cardinalidade_destino=None, span=None):
+        self.codigos = _codigos(estereotipos)
+        self.nome = nome
+        self.simbolo = simbolo
+        self.cardinalidade_origem = cardinalidade_origem
+        self.cardinalidade_destino = cardinalidade_destino
+        self.alvo = alvo
+        self._posicionar(span)
+
+    @property
+    def descricao(self):
+        return f"-> {self.alvo}"
+
+
+class Classe(No):
+    """O estereótipo é guardado como código (estereotipos_tonto) em `codigo`."""
+
+    __slots__ = ('nome', 'codigo', 'natureza', 'heranca', 'atributos', 'relacoes_internas')
+    CAMPOS = ('nome', 'estereotipo', 'natureza', 'heranca', 'atributos', 'relacoes_internas')
+
+    def __init__(self, nome, estereotipo, heranca=None, atributos=None, relacoes_internas=None, natureza=None,
+                 span=None):
+        self.nome = nome
+        self.codigo = codigo_estereotipo(estereotipo)
+        self.natureza = natureza
+        self.heranca = heranca if heranca is not None else []
+        self.atributos = atributos if atributos is not None else []
+        self.relacoes_internas = relacoes_internas if relacoes_internas is not None else []
+        self._posicionar(span)
+
+    @property
+    def estereotipo(self):
+        return NOMES[self.codigo]
+
+
+class TipoDado(No):
+    """datatype com atributos, ou que apenas especializa outro tipo."""
+
+    __slots__ = ('nome', 'atributos', 'especializa')
+    CAMPOS = __slots__
+
+    def __init__(self, nome, atributos=None, especializa=None, span=None):
+        self.nome = nome
+        self.atributos = atributos if atributos is not None else []
+        self.especializa = especializa
+        self._posicionar(span)
+
+
+class Enumeracao(No):
+    __slots__ = ('nome', 'itens')
+    CAMPOS = __slots__
+
+    def __init__(self, nome, itens, span=None):
+        self.nome = nome
+        self.itens = itens
+        self._posicionar(span)
+
+
+class Genset(No):
+    """forma é "inline" (genset ... where ... specializes) ou "block"."""
+
+    __slots__ = ('nome', 'forma', 'modificadores', 'geral', 'especificos')
+    CAMPOS = __slots__
+
+    def __init__(self, nome, geral, especificos, modificadores=None, forma="block", span=None):
+        self.nome = nome
+        self.forma = forma
+        self.modificadores = modificadores if modificadores is not None else []
+        self.geral = geral
+        self.especificos = especificos
+        self._posicionar(span)
+
+
+class RelacaoExterna(_ComEstereotipos):
+    __slots__ = ('origem', 'nome', 'simbolo', 'cardinalidade_origem', 'cardinalidade_destino', 'alvo')
+    CAMPOS = ('estereotipos',) + __slots__
+
+    def __init__(self, estereotipos, origem, alvo, nome=None, simbolo=None, cardinalidade_origem=None,
+                 cardinalidade_destino=None, span=None):
+        self.codigos = _codigos(estereotipos)
+        self.origem = origem
+        self.nome = nome
+        self.simbolo = simbolo
+        self.cardinalidade_origem = cardinalidade_origem
+        self.cardinalidade_destino = cardinalidade_destino
+        self.alvo = alvo
+        self._posicionar(span)
+
+    @property
+    def descricao(self):
+        return f"rel: {self.nome} ({self.origem} -> {self.alvo})"
+
+
+def nos_da_sintese(sintese):
+    """Declarações de topo da síntese: classes, tipos, enums, gensets e relações externas."""
+    yield from sintese["classes"].values()
+    yield from sintese["tipos"].values()
+    yield from sintese["enums"].values()
+    yield from sintese["generalizacoes"]
+    yield from sintese["relacoes_externas"]
+
+
+class Visitante:
+    """
+    Percorre nós chamando visitar_<NomeDoNo>(no) (ex.: visitar_Classe); sem
+    um método específico, visita os filhos. Subclasses chamam
+    self.visitar_filhos(no) para continuar a descida.
+    """
+
+    def visitar(self, no):
+        return getattr(self, "visitar_" + type(no).__name__, self.visitar_filhos)(no)
+
+    def visitar_filhos(self, no):
+        for filho in no.filhos():
+            self.visitar(filho)
+
+    def visitar_sintese(self, sintese):
+        for no in nos_da_sintese(sintese):
+            self.visitar(no)
@@ -0,0 +1,860 @@
+import os
+import sys
+import glob
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+import time
+
+DIR_SRC = os.path.dirname(os.path.abspath(__file__))
+DIR_TESTES = os.path.join(DIR_SRC, "..", "tests")
+MODULOS_ANALISADOR = ["contexto_tonto.py", "lexico_tonto.py", "lexico_rapido_tonto.py", "parser_tonto.py",
+                      "ast_tonto.py", "estereotipos_tonto.py", "semantico_tonto.py"]
+
+# Script executado em um processo novo: mede o import e a construção do lexer/parser
+SCRIPT_INICIALIZACAO = (
+    "import time; t0 = time.perf_counter(); import parser_tonto; t1 = time.perf_counter(); "
+    "parser_tonto.construir_parser(); parser_tonto.build_lexer(); "
+    "print(t1 - t0, time.perf_counter() - t1)"
+)
+
+
+def _medir_processo(pasta):
+    inicio = time.perf_counter()
+    saida = subprocess.run(
+        [sys.executable, "-c", SCRIPT_INICIALIZACAO],
+        cwd=pasta, capture_output=True, text=True, check=True
+    )
+    total = time.perf_counter() - inicio
+    importacao, construcao = saida.stdout.strip().splitlines()[-1].split()
+    return total, float(importacao), float(construcao)
+
+
+def benchmark_inicializacao(repeticoes=5):
+    """
+    Compara a inicialização a frio (sem parsetab/lextab, tabelas geradas do zero)
+    com a inicialização a quente (tabelas já gravadas e reaproveitadas).
+    Usa uma cópia dos módulos em uma pasta temporária para não tocar nas tabelas do projeto.
+    Retorna um dict {"frio": [...], "quente": [...]} com tuplas
+    (processo, importacao, construcao) em segundos.
+    """
+    resultados = {"frio": [], "quente": []}
+    with tempfile.TemporaryDirectory() as pasta:
+        for modulo in MODULOS_ANALISADOR:
+            shutil.copy(os.path.join(DIR_SRC, modulo), pasta)
+
+        for _ in range(repeticoes):
+            for tabela in ("parsetab.py", "lextab.py", "parser.out"):
+                caminho = os.path.join(pasta, tabela)
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+            shutil.rmtree(os.path.join(pasta, "__pycache__"), ignore_errors=True)
+            resultados["frio"].append(_medir_processo(pasta))
+
+        for _ in range(repeticoes):
+            resultados["quente"].append(_medir_processo(pasta))
+    return resultados
+
+
+def benchmark_chamadas(caminho, repeticoes=20):
+    """
+    Tempo médio por chamada de analisar_sintaxe no mesmo processo, comparando
+    o parser reaproveitado com a reconstrução das tabelas a cada chamada.
+    """
+    import ply.yacc as yacc
+    import parser_tonto
+    from contexto_tonto import ContextoAnalise
+
+    with open(caminho, 'r', encoding='utf-8') as f:
+        codigo = f.read()
+
+    parser_tonto.analisar_sintaxe(codigo)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        parser_tonto.analisar_sintaxe(codigo)
+    reaproveitado = (time.perf_counter() - inicio) / repeticoes
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        parser = yacc.yacc(module=parser_tonto, tabmodule='_sem_tabela', write_tables=False, debug=False,
+                           errorlog=yacc.NullLogger())
+        parser.contexto = ContextoAnalise()
+        parser.parse(codigo, lexer=parser_tonto.build_lexer(parser.contexto))
+    reconstruido = (time.perf_counter() - inicio) / repeticoes
+    return {"reaproveitado": reaproveitado, "reconstruido": reconstruido}
+
+
+# Conjuntos de etapas (--stages de main.py) medidos por benchmark_etapas
+ETAPAS_INICIALIZACAO = ("lex", "lex,parse", "lex,parse,sem")
+
+
+def _tempo_de_import(stderr):
+    """
+    Saída de -X importtime -> (µs, [(µs, módulo)]): a soma do tempo cumulativo
+    dos imports de topo (os aninhados já estão no cumulativo de quem os importou).
+    """
+    total, modulos = 0, []
+    for linha in stderr.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+        _, cumulativo, nome = linha.split("|")
+        # Pula o cabeçalho e os imports aninhados (nome recuado)
+        if not cumulativo.strip().isdigit() or nome[1:2] == " ":
+            continue
+        total += int(cumulativo)
+        modulos.append((int(cumulativo), nome.strip()))
+    return total, modulos
+
+
+def benchmark_etapas(caminho, repeticoes=5):
+    """
+    Inicialização de main.py (sem cache) para cada conjunto de ETAPAS_INICIALIZACAO:
+    tempo do processo e tempo de import, medido com -X importtime (que também
+    pesa um pouco no tempo do processo). As tabelas são geradas antes das medidas.
+    Retorna {etapas: (processo_s, import_s, [(µs, módulo) dos 3 imports mais pesados])},
+    com a execução mais rápida de cada conjunto.
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as saida:
+        comando = [sys.executable, "-X", "importtime", os.path.join(DIR_SRC, "main.py"), caminho,
+                   "--no-cache", "--saida", saida]
+        subprocess.run(comando, cwd=DIR_SRC, capture_output=True, check=True)
+        for etapas in ETAPAS_INICIALIZACAO:
+            melhor = None
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                execucao = subprocess.run(comando + ["--stages", etapas], cwd=DIR_SRC, capture_output=True,
+                                          text=True, check=True)
+                processo = time.perf_counter() - inicio
+                if melhor is None or processo < melhor[0]:
+                    importacao, modulos = _tempo_de_import(execucao.stderr)
+                    melhor = (processo, importacao / 1e6, sorted(modulos, reverse=True)[:3])
+            resultados[etapas] = melhor
+    return resultados
+
+
+def _resultado(contexto):
+    return (contexto.tabela, contexto.sintese, contexto.erros_lexicos,
+            contexto.erros_sintaticos, contexto.padroes, contexto.erros_semanticos)
+
+
+def verificar_concorrencia(arquivos, threads=8, rodadas=20, semente=0):
+    """
+    Teste de estresse da API reentrante: analisa os arquivos em um pool de
+    threads, em ordem embaralhada e com repetições, sobre o mesmo parser
+    compartilhado, e compara cada resultado com a análise serial do arquivo.
+    Retorna (total de análises, lista de arquivos com resultado divergente).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from contexto_tonto import analisar_documento
+    from lexico_tonto import ler_codigo
+
+    codigos = {a: ler_codigo(a) for a in arquivos}
+    esperado = {a: _resultado(analisar_documento(c)) for a, c in codigos.items()}
+
+    tarefas = list(arquivos) * rodadas
+    random.Random(semente).shuffle(tarefas)
+
+    def _analisar(arquivo):
+        return arquivo, _resultado(analisar_documento(codigos[arquivo]))
+
+    # Trocas de thread bem mais frequentes que o padrão para forçar intercalações
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    divergentes = []
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for arquivo, obtido in pool.map(_analisar, tarefas):
+                if obtido != esperado[arquivo]:
+                    divergentes.append(arquivo)
+    finally:
+        sys.setswitchinterval(intervalo)
+    return len(tarefas), divergentes
+
+
+def _prefixo(i):
+    letras = ""
+    while True:
+        letras = chr(ord('a') + i % 26) + letras
+        i //= 26
+        if i == 0:
+            return "Q" + letras
+
+
+def escalar_modelo(codigo, copias):
+    """
+    Replica as declarações de um modelo `copias` vezes, prefixando os nomes de
+    classes de cada cópia (QaPessoa, QbPessoa, ...) para que não colidam.
+    O cabeçalho (imports/package) aparece uma única vez.
+    """
+    import re
+    inicio_corpo = re.search(r'^package[^\n]*\n', codigo, re.M)
+    corte = inicio_corpo.end() if inicio_corpo else 0
+    cabecalho, corpo = codigo[:corte], codigo[corte:]
+    nome = re.compile(r'\b([A-Z][A-Za-z0-9_]*)\b')
+    return cabecalho + "".join(nome.sub(lambda m, p=_prefixo(i): p + m.group(1), corpo) for i in range(copias))
+
+
+class ClienteLSP:
+    """Cliente mínimo do LSP por stdio, usado para medir o servidor sem um editor."""
+
+    def __init__(self):
+        self.processo = subprocess.Popen([sys.executable, os.path.join(DIR_SRC, "lsp_tonto.py")],
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL, cwd=DIR_SRC)
+        self._id = 0
+
+    def enviar(self, metodo, params, requisicao=False):
+        from lsp_tonto import escrever_mensagem
+        mensagem = {"jsonrpc": "2.0", "method": metodo, "params": params}
+        if requisicao:
+            self._id += 1
+            mensagem["id"] = self._id
+        escrever_mensagem(self.processo.stdin, mensagem)
+
+    def esperar(self, metodo=None):
+        from lsp_tonto import ler_mensagem
+        while True:
+            mensagem = ler_mensagem(self.processo.stdout)
+            if mensagem is None or metodo is None or mensagem.get("method") == metodo:
+                return mensagem
+
+    def encerrar(self):
+        self.enviar("shutdown", None, requisicao=True)
+        self.esperar()
+        self.enviar("exit", None)
+        self.processo.wait(timeout=10)
+
+
+def benchmark_lsp(caminho, copias=20, teclas=50):
+    """
+    Abre um modelo escalado no servidor LSP e mede, para cada tecla digitada
+    (mudança incremental de um caractere), o tempo até os diagnósticos chegarem.
+    Retorna (linhas do documento, tempo da abertura, lista de latências) em segundos.
+    """
+    from lexico_tonto import ler_codigo
+    texto = escalar_modelo(ler_codigo(caminho), copias)
+    linhas = texto.split('\n')
+    # Digita dentro de um comentário no meio do documento
+    alvo = len(linhas) // 2
+    uri = "file:///benchmark.tonto"
+
+    cliente = ClienteLSP()
+    try:
+        cliente.enviar("initialize", {"capabilities": {}}, requisicao=True)
+        cliente.esperar()
+        inicio = time.perf_counter()
+        cliente.enviar("textDocument/didOpen",
+                       {"textDocument": {"uri": uri, "languageId": "tonto", "version": 1, "text": texto}})
+        cliente.esperar("textDocument/publishDiagnostics")
+        abertura = time.perf_counter() - inicio
+
+        latencias = []
+        for versao in range(2, teclas + 2):
+            caractere = len(linhas[alvo]) if versao == 2 else len(linhas[alvo]) + versao - 3
+            mudanca = {"range": {"start": {"line": alvo, "character": caractere},
+                                 "end": {"line": alvo, "character": caractere}},
+                       "text": "// " if versao == 2 else "x"}
+            inicio = time.perf_counter()
+            cliente.enviar("textDocument/didChange",
+                           {"textDocument": {"uri": uri, "version": versao}, "contentChanges": [mudanca]})
+            cliente.esperar("textDocument/publishDiagnostics")
+            latencias.append(time.perf_counter() - inicio)
+    finally:
+        cliente.encerrar()
+    return len(linhas), abertura, latencias
+
+
+def benchmark_servidor(caminho, clientes=8, pedidos=100, workers=None, processos=4):
+    """
+    Vazão e latência do servidor local (servidor_tonto): `clientes` threads,
+    cada uma com sua conexão, pedem `pedidos` análises de `caminho`. Para
+    comparar, as mesmas threads executam `processos` vezes cada um
+    main.py --format json (um processo novo por análise).
+    Retorna {"servidor": (pedidos/s, latências em s, lotes), "processo": pedidos/s}.
+    """
+    import threading
+    from servidor_tonto import Despachante, criar_servidor, ClienteTonto
+
+    def _em_threads(tarefa):
+        threads = [threading.Thread(target=tarefa) for _ in range(clientes)]
+        inicio = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - inicio
+
+    despachante = Despachante(workers)
+    servidor = criar_servidor(despachante, porta=0)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    porta = servidor.server_address[1]
+    latencias = []
+
+    def _cliente():
+        cliente = ClienteTonto(porta=porta)
+        for _ in range(pedidos):
+            inicio = time.perf_counter()
+            cliente.analisar(caminho)
+            latencias.append(time.perf_counter() - inicio)
+        cliente.fechar()
+
+    try:
+        ClienteTonto(porta=porta).analisar(caminho)
+        lotes_antes = despachante.metricas.lotes
+        tempo = _em_threads(_cliente)
+        lotes = despachante.metricas.lotes - lotes_antes
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+        despachante.fechar()
+
+    comando = [sys.executable, os.path.join(DIR_SRC, "main.py"), caminho, "--format", "json", "--no-cache"]
+
+    def _processos():
+        for _ in range(processos):
+            subprocess.run(comando, cwd=DIR_SRC, capture_output=True, check=True)
+
+    tempo_processos = _em_threads(_processos)
+    return {"servidor": (clientes * pedidos / tempo, sorted(latencias), lotes),
+            "processo": clientes * processos / tempo_processos}
+
+
+def sintese_sintetica(classes):
+    """
+    Síntese de um modelo sintético com ~`classes` classes e outras tantas
+    relações externas, em grupos que exercitam todos os padrões ODP: kind com
+    gensets de subkinds, roles e phases, relator mediando roles ligados por
+    relação material, mode e roleMixin.
+    """
+    from ast_tonto import Classe, Genset, RelacaoInterna, RelacaoExterna
+
+    sintese = {"imports": [], "pacotes": ["Sintetico"], "classes": {}, "tipos": {}, "enums": {},
+               "generalizacoes": [], "relacoes_externas": []}
+    todas = sintese["classes"]
+
+    def classe(nome, estereotipo, relacoes=()):
+        todas[nome] = Classe(nome, estereotipo,
+                             relacoes_internas=[RelacaoInterna([est], alvo) for est, alvo in relacoes])
+
+    def genset(nome, geral, especificos, modificadores):
+        sintese["generalizacoes"].append(Genset(nome, geral, especificos, modificadores))
+
+    for g in range(max(1, classes // 12)):
+        k, r1, r2, p1, p2, s1, s2 = (f"{nome}{g}" for nome in ("Kind", "RoleA", "RoleB", "FaseA", "FaseB",
+                                                               "SubA", "SubB"))
+        classe(k, "kind")
+        for nome, est in ((s1, "subkind"), (s2, "subkind"), (r1, "role"), (r2, "role"),
+                          (p1, "phase"), (p2, "phase")):
+            classe(nome, est)
+        classe(f"Relator{g}", "relator", [("mediation", r1), ("mediation", r2)])
+        classe(f"Modo{g}", "mode", [("characterization", k), ("externalDependence", k)])
+        classe(f"Mixin{g}", "roleMixin")
+        classe(f"Categoria{g}", "category")
+        classe(f"Qualidade{g}", "quality")
+        genset(f"GS{g}", k, [s1, s2], ["disjoint"])
+        genset(f"GR{g}", k, [r1, r2], [])
+        genset(f"GP{g}", k, [p1, p2], [] if g % 2 else ["disjoint"])
+        genset(f"GM{g}", f"Mixin{g}", [r1, r2], ["disjoint", "complete"])
+        # Relações externas: a material entre os roles e outras que só ocupam espaço no índice
+        externas = [("material", r1, r2), ("componentOf", s1, k), ("memberOf", s2, k),
+                    ("characterization", f"Qualidade{g}", k), ("derivation", r2, r1)]
+        externas += [("material", f"RoleA{(g + i) % max(1, classes // 12)}", r2) for i in range(1, 8)]
+        for est, origem, destino in externas:
+            sintese["relacoes_externas"].append(RelacaoExterna([est], origem, destino))
+    return sintese
+
+
+def benchmark_semantico(tamanhos, repeticoes=3):
+    """
+    Tempo de verificar_semantica em modelos sintéticos de tamanhos crescentes.
+    Retorna [(classes, relações externas, segundos)], melhor de `repeticoes`.
+    """
+    from semantico_tonto import verificar_semantica
+    resultados = []
+    for tamanho in tamanhos:
+        sintese = sintese_sintetica(tamanho)
+        melhor = float("inf")
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            verificar_semantica(sintese)
+            melhor = min(melhor, time.perf_counter() - inicio)
+        resultados.append((len(sintese["classes"]), len(sintese["relacoes_externas"]), melhor))
+    return resultados
+
+
+def benchmark_memoria(caminho, tokens_alvo=1_000_000):
+    """
+    Memória (tracemalloc) da tabela de símbolos em um modelo escalado até
+    `tokens_alvo` tokens: a lista antiga de dicts x TabelaSimbolos. Cada variante
+    tokeniza o código e monta a tabela; "retida" é o que sobra depois de
+    descartar os LexToken, como acontece no fim da análise léxica.
+    Retorna (tokens, {variante: (retida, pico)}) em bytes.
+    """
+    import gc
+    import tracemalloc
+    from lexico_tonto import ler_codigo, tokenizar, montar_tabela
+    from contexto_tonto import ContextoAnalise
+
+    def dicts(tokens_lidos):
+        return [{"tipo": tok.type, "valor": tok.value, "linha": tok.lineno, "posicao": tok.lexpos}
+                for tok in tokens_lidos]
+
+    original = ler_codigo(caminho)
+    uma = len(tokenizar(escalar_modelo(original, 1), ContextoAnalise()))
+    por_copia = len(tokenizar(escalar_modelo(original, 2), ContextoAnalise())) - uma
+    codigo = escalar_modelo(original, 1 + max(0, -(-(tokens_alvo - uma) // por_copia)))
+
+    resultados = {}
+    total = 0
+    for variante, montar in (("dicts", dicts), ("compacta", montar_tabela)):
+        gc.collect()
+        tracemalloc.start()
+        tokens_lidos = tokenizar(codigo, ContextoAnalise())
+        tabela = montar(tokens_lidos)
+        total = len(tokens_lidos)
+        del tokens_lidos
+        gc.collect()
+        retida, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del tabela
+        resultados[variante] = (retida, pico)
+    return total, resultados
+
+
+def benchmark_memoria_ast(classes=20000):
+    """
+    Memória (tracemalloc) da síntese de um modelo gerado com ~`classes`
+    classes: os nós de ast_tonto x dicts com as mesmas informações (um dict
+    por nó com os campos e a posição), como a síntese guardava antes.
+    Retorna (declarações, {variante: bytes retidos}).
+    """
+    import gc
+    import pickle
+    import tracemalloc
+    from gerador_tonto import gerar_modelo
+    from lexico_tonto import analisar_codigo
+    from parser_tonto import analisar_sintaxe
+    from contexto_tonto import ContextoAnalise
+    from ast_tonto import No, nos_da_sintese
+
+    def como_dicts(valor):
+        if isinstance(valor, No):
+            dados = {campo: como_dicts(getattr(valor, campo)) for campo in valor.CAMPOS}
+            dados.update(linha=valor.linha, inicio=valor.inicio, fim=valor.fim)
+            return dados
+        if isinstance(valor, list):
+            return [como_dicts(v) for v in valor]
+        return valor
+
+    codigo = gerar_modelo(classes)
+    contexto = ContextoAnalise()
+    _, _, tokens = analisar_codigo(codigo, contexto)
+    analisar_sintaxe(codigo, tokens, contexto)
+    sintese = contexto.sintese
+    declaracoes = sum(1 for _ in nos_da_sintese(sintese))
+    variantes = {
+        "dicts": {chave: como_dicts(list(valor.values()) if isinstance(valor, dict) else valor)
+                  for chave, valor in sintese.items()},
+        "nós": sintese,
+    }
+
+    resultados = {}
+    for variante, dados in variantes.items():
+        serializado = pickle.dumps(dados, pickle.HIGHEST_PROTOCOL)
+        gc.collect()
+        tracemalloc.start()
+        copia = pickle.loads(serializado)
+        retida, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del copia
+        resultados[variante] = retida
+    return declaracoes, resultados
+
+
+def _tokens_do_backend(codigo, backend):
+    from lexico_tonto import tokenizar
+    from contexto_tonto import ContextoAnalise
+    contexto = ContextoAnalise(backend)
+    tokens_lidos = tokenizar(codigo, contexto)
+    return tokens_lidos, contexto
+
+
+def verificar_lexers(arquivos):
+    """
+    Teste diferencial dos backends léxicos: tokeniza cada arquivo com o lexer
+    PLY e com o rápido e compara tipo, valor, linha e posição de cada token,
+    as mensagens de erro e os diagnósticos.
+    Retorna a lista de arquivos com resultado divergente.
+    """
+    from lexico_tonto import ler_codigo
+
+    def _resumo(codigo, backend):
+        tokens_lidos, contexto = _tokens_do_backend(codigo, backend)
+        return ([(tok.type, type(tok.value), tok.value, tok.lineno, tok.lexpos) for tok in tokens_lidos],
+                contexto.erros_lexicos, contexto.diagnosticos)
+
+    divergentes = []
+    for arquivo in arquivos:
+        codigo = ler_codigo(arquivo)
+        if _resumo(codigo, "ply") != _resumo(codigo, "fast"):
+            divergentes.append(arquivo)
+    return divergentes
+
+
+def benchmark_lexer(caminho, copias=200, repeticoes=3):
+    """
+    Vazão de cada backend léxico (tokenizar) sobre o modelo escalado `copias` vezes.
+    Retorna (tokens, {backend: segundos}), melhor de `repeticoes`.
+    """
+    from lexico_tonto import ler_codigo, BACKENDS
+
+    codigo = escalar_modelo(ler_codigo(caminho), copias)
+    tempos = {}
+    total = 0
+    for backend in BACKENDS:
+        _tokens_do_backend("", backend)
+        melhor = float("inf")
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            tokens_lidos, _ = _tokens_do_backend(codigo, backend)
+            melhor = min(melhor, time.perf_counter() - inicio)
+            total = len(tokens_lidos)
+            del tokens_lidos
+        tempos[backend] = melhor
+    return total, tempos
+
+
+ETAPAS_ESCALA = ("lexico", "sintatico", "semantico", "escrita")
+
+
+def _analise_serial(codigo, backend="ply"):
+    from contexto_tonto import ContextoAnalise
+    from lexico_tonto import analisar_codigo
+    from parser_tonto import analisar_sintaxe
+
+    contexto = ContextoAnalise(backend)
+    _, _, tokens_lidos = analisar_codigo(codigo, contexto)
+    analisar_sintaxe(codigo, tokens_lidos, contexto)
+    return contexto
+
+
+def verificar_paralelo(arquivos, processos=2):
+    """
+    Compara, para cada arquivo e backend léxico, a análise serial com a de
+    paralelo_tonto (trechos pequenos, para que até arquivos curtos sejam
+    divididos): tabela de símbolos, índice de linhas, erros, diagnósticos e
+    a síntese com as posições de cada nó, na ordem.
+    Retorna a lista de (arquivo, backend) com resultado divergente.
+    """
+    from lexico_tonto import ler_codigo, BACKENDS
+    from ast_tonto import nos_da_sintese
+    from paralelo_tonto import analisar_em_paralelo
+    from contexto_tonto import ContextoAnalise
+
+    def _resumo(contexto):
+        sintese = contexto.sintese
+        return (list(contexto.tabela.linhas()), list(contexto.linhas.inicios), contexto.erros_lexicos, contexto.erros_sintaticos,
+                contexto.diagnosticos, sintese["pacotes"], sintese["imports"],
+                [list(sintese[chave]) for chave in ("classes", "tipos", "enums")],
+                [no.como_dict() for no in nos_da_sintese(sintese)])
+
+    divergentes = []
+    for arquivo in arquivos:
+        codigo = ler_codigo(arquivo)
+        for backend in BACKENDS:
+            paralelo, _ = analisar_em_paralelo(codigo, ContextoAnalise(backend), processos, tamanho_minimo=0)
+            if _resumo(_analise_serial(codigo, backend)) != _resumo(paralelo):
+                divergentes.append((arquivo, backend))
+    return divergentes
+
+
+def benchmark_paralelo(classes=50000, processos=None, repeticoes=3):
+    """
+    Léxico + sintático de um modelo de gerador_tonto com ~`classes` classes:
+    serial e com paralelo_tonto para cada quantidade de `processos` (padrão:
+    1, 2, 4... até o número de CPUs). Melhor de `repeticoes`.
+    Retorna (caracteres, tempo serial, {processos: (tempo, trechos)}).
+    """
+    from gerador_tonto import gerar_modelo
+    from parser_tonto import construir_parser
+    from paralelo_tonto import analisar_em_paralelo
+
+    if not processos:
+        cpus = os.cpu_count() or 1
+        processos = sorted({1, 2, cpus} | {2 ** i for i in range(cpus.bit_length()) if 2 ** i <= cpus})
+    codigo = gerar_modelo(classes)
+    construir_parser()
+
+    def _melhor(analisar):
+        melhor = float("inf")
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            resultado = analisar()
+            melhor = min(melhor, time.perf_counter() - inicio)
+        return melhor, resultado
+
+    serial, _ = _melhor(lambda: _analise_serial(codigo))
+    tempos = {}
+    for n in processos:
+        tempo, (_, trechos) = _melhor(lambda: analisar_em_paralelo(codigo, processos=n))
+        tempos[n] = (tempo, trechos)
+    return len(codigo), serial, tempos
+
+
+def benchmark_escala(tamanhos, repeticoes=3, **forma):
+    """
+    Curvas de escala por etapa em modelos de gerador_tonto com ~`tamanhos`
+    classes (`forma` repassa os demais parâmetros de gerar_modelo): léxico
+    (leitura do arquivo + analisar_codigo, o que analisar_arquivo faz),
+    sintático (analisar_sintaxe sobre os tokens), semântico
+    (verificar_semantica) e escrita dos relatórios; melhor de `repeticoes`.
+    "expoentes" traz, para cada etapa, log(t2/t1) / log(n2/n1) entre tamanhos
+    consecutivos (n em tokens): perto de 1 é linear, bem acima de 1 indica
+    crescimento superlinear.
+    Retorna um dict serializável em JSON.
+    """
+    import math
+    import platform
+    from gerador_tonto import gerar_modelo
+    from lexico_tonto import ler_codigo, analisar_codigo
+    from parser_tonto import analisar_sintaxe, construir_parser
+    from semantico_tonto import verificar_semantica
+    from contexto_tonto import ContextoAnalise
+    from main import salvar_lexico, salvar_sintatico, salvar_semantico
+
+    construir_parser()
+    medidas = []
+    with tempfile.TemporaryDirectory() as pasta:
+        for tamanho in tamanhos:
+            caminho = os.path.join(pasta, f"modelo_{tamanho}.tonto")
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write(gerar_modelo(tamanho, **forma))
+
+            melhores = dict.fromkeys(ETAPAS_ESCALA, float("inf"))
+            for _ in range(repeticoes):
+                contexto = ContextoAnalise()
+                tempos = {}
+                inicio = time.perf_counter()
+                codigo = ler_codigo(caminho)
+                _, _, tokens_lidos = analisar_codigo(codigo, contexto)
+                tempos["lexico"] = time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                analisar_sintaxe(codigo, tokens_lidos, contexto)
+                tempos["sintatico"] = time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                contexto.padroes, contexto.erros_semanticos = verificar_semantica(contexto.sintese)
+                tempos["semantico"] = time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                pasta_saida = os.path.join(pasta, "saida")
+                salvar_lexico(contexto.tabela, contexto.erros_lexicos, pasta_saida, linhas=contexto.linhas)
+                salvar_sintatico(contexto.sintese, contexto.erros_sintaticos, pasta_saida)
+                salvar_semantico(contexto.padroes, contexto.erros_semanticos, pasta_saida)
+                tempos["escrita"] = time.perf_counter() - inicio
+
+                for etapa, tempo in tempos.items():
+                    melhores[etapa] = min(melhores[etapa], tempo)
+                del tokens_lidos
+
+            medidas.append({
+                "tamanho": tamanho,
+                "bytes": os.path.getsize(caminho),
+                "linhas": codigo.count("\n"),
+                "tokens": len(contexto.tabela),
+                "classes": len(contexto.sintese["classes"]),
+                "gensets": len(contexto.sintese["generalizacoes"]),
+                "relacoes_externas": len(contexto.sintese["relacoes_externas"]),
+                "erros": len(contexto.erros_lexicos) + len(contexto.erros_sintaticos),
+                "segundos": melhores,
+            })
+
+    expoentes = {etapa: [] for etapa in ETAPAS_ESCALA}
+    for antes, depois in zip(medidas, medidas[1:]):
+        razao_n = math.log(depois["tokens"] / antes["tokens"])
+        for etapa in ETAPAS_ESCALA:
+            t1, t2 = antes["segundos"][etapa], depois["segundos"][etapa]
+            expoentes[etapa].append(round(math.log(t2 / t1) / razao_n, 3) if razao_n and t1 > 0 and t2 > 0
+                                    else None)
+
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticoes": repeticoes,
+        "forma": forma,
+        "medidas": medidas,
+        "expoentes": expoentes,
+    }
+
+
+def _imprimir_inicializacao(resultados):
+    print(f"{'Modo':<10} {'Processo (ms)':>15} {'Import (ms)':>13} {'Construção (ms)':>17}")
+    print('-' * 58)
+    for modo, medidas in resultados.items():
+        processo, importacao, construcao = (min(m[i] for m in medidas) * 1000 for i in range(3))
+        print(f"{modo:<10} {processo:>15.1f} {importacao:>13.1f} {construcao:>17.1f}")
+
+
+def _arquivos_de_teste():
+    return sorted(glob.glob(os.path.join(DIR_TESTES, "**", "*.tonto"), recursive=True))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do analisador TONTO")
+    comandos = parser.add_subparsers(dest="comando")
+
+    p_inic = comandos.add_parser("inicializacao", help="Inicialização a frio x a quente (padrão)")
+    p_inic.add_argument("--repeticoes", type=int, default=5, help="Execuções por medida (usa o melhor tempo)")
+    p_inic.add_argument("--arquivo", default=os.path.join(DIR_TESTES, "exemplo1.tonto"),
+                        help="Arquivo .tonto usado na medida por chamada")
+
+    p_etp = comandos.add_parser("etapas", help="Inicialização de main.py por --stages (processo e imports)")
+    p_etp.add_argument("--repeticoes", type=int, default=5, help="Execuções por medida (usa o melhor tempo)")
+    p_etp.add_argument("--arquivo", default=os.path.join(DIR_TESTES, "exemplo1.tonto"))
+
+    p_conc = comandos.add_parser("concorrencia", help="Estresse da análise reentrante em threads")
+    p_conc.add_argument("--threads", type=int, default=8)
+    p_conc.add_argument("--rodadas", type=int, default=20, help="Repetições de cada arquivo de tests/")
+
+    p_lsp = comandos.add_parser("lsp", help="Latência por tecla do servidor LSP")
+    p_lsp.add_argument("--arquivo", default=os.path.join(DIR_TESTES, "Pizzaria_Model", "monobloco",
+                                                          "Pizzaria_MONO.tonto"))
+    p_lsp.add_argument("--copias", type=int, default=20, help="Cópias do modelo no documento aberto")
+    p_lsp.add_argument("--teclas", type=int, default=50)
+
+    p_srv = comandos.add_parser("servidor", help="Vazão e latência do servidor local x um processo por análise")
+    p_srv.add_argument("--arquivo", default=os.path.join(DIR_TESTES, "exemplo1.tonto"))
+    p_srv.add_argument("--clientes", type=int, default=8, help="Threads cliente simultâneas")
+    p_srv.add_argument("--pedidos", type=int, default=100, help="Análises por cliente")
+    p_srv.add_argument("--workers", type=int, default=None, help="Processos do servidor (padrão: CPUs)")
+
+    p_sem = comandos.add_parser("semantico", help="Escalabilidade da verificação semântica")
+    p_sem.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000],
+                       help="Número aproximado de classes de cada modelo sintético")
+
+    p_mem = comandos.add_parser("memoria", help="Memória da tabela de símbolos (dicts x compacta)")
+    p_mem.add_argument("--arquivo", default=os.path.join(DIR_TESTES, "Pizzaria_Model", "monobloco",
+                                                          "Pizzaria_MONO.tonto"))
+    p_mem.add_argument("--tokens", type=int, default=1_000_000, help="Tamanho aproximado do modelo escalado")
+
+    p_ast = comandos.add_parser("ast", help="Memória da síntese (dicts x nós com __slots__)")
+    p_ast.add_argument("--classes", type=int, default=20000, help="Tamanho do modelo gerado")
+
+    p_lex = comandos.add_parser("lexer", help="Backends léxicos: teste diferencial em tests/ e vazão")
+    p_lex.add_argument("--arquivo", default=os.path.join(DIR_TESTES, "Pizzaria_Model", "monobloco",
+                                                          "Pizzaria_MONO.tonto"))
+    p_lex.add_argument("--copias", type=int, default=200, help="Cópias do modelo no texto medido")
+
+    p_par = comandos.add_parser("paralelo", help="Léxico+sintático de um arquivo dividido em processos: "
+                                                 "igualdade com o serial em tests/ e escala por processos")
+    p_par.add_argument("--classes", type=int, default=50000, help="Tamanho do modelo gerado")
+    p_par.add_argument("--processos", type=int, nargs="+", help="Quantidades de processos (padrão: 1, 2, 4... CPUs)")
+    p_par.add_argument("--repeticoes", type=int, default=3, help="Execuções por medida (usa o melhor tempo)")
+
+    p_esc = comandos.add_parser("escala", help="Tempo de cada etapa em modelos gerados de tamanhos crescentes")
+    p_esc.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 3000, 10000, 30000],
+                       help="Classes de cada modelo gerado (gerador_tonto)")
+    p_esc.add_argument("--repeticoes", type=int, default=3, help="Execuções por tamanho (usa o melhor tempo)")
+    p_esc.add_argument("--imports", type=int, default=0, help="Linhas de import de cada modelo")
+    p_esc.add_argument("--json", default="benchmark_escala.json", help="Arquivo com os resultados em JSON")
+
+    args = parser.parse_args()
+
+    if args.comando == "escala":
+        import json
+        resultado = benchmark_escala(args.tamanhos, args.repeticoes, imports=args.imports)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"{'Classes':>8} {'Tokens':>9}" + "".join(f" {etapa + ' (ms)':>16}" for etapa in ETAPAS_ESCALA))
+        print('-' * (18 + 17 * len(ETAPAS_ESCALA)))
+        for medida in resultado["medidas"]:
+            print(f"{medida['classes']:>8} {medida['tokens']:>9}" +
+                  "".join(f" {medida['segundos'][etapa] * 1000:>16.1f}" for etapa in ETAPAS_ESCALA))
+        print("\nExpoente entre tamanhos consecutivos (1 = linear):")
+        for etapa, valores in resultado["expoentes"].items():
+            print(f"  {etapa:<10} " + "  ".join("-" if v is None else f"{v:.2f}" for v in valores))
+        print(f"\nResultados salvos em: {args.json}")
+    elif args.comando == "etapas":
+        print(f"{'--stages':<15} {'Processo (ms)':>14} {'Import (ms)':>12}  Imports mais pesados (ms)")
+        print('-' * 90)
+        for etapas, (processo, importacao, modulos) in benchmark_etapas(args.arquivo, args.repeticoes).items():
+            pesados = ", ".join(f"{nome} {us / 1000:.1f}" for us, nome in modulos)
+            print(f"{etapas:<15} {processo * 1000:>14.1f} {importacao * 1000:>12.1f}  {pesados}")
+    elif args.comando == "paralelo":
+        arquivos = _arquivos_de_teste()
+        divergentes = verificar_paralelo(arquivos)
+        print(f"Arquivos comparados (serial x paralelo, ply e fast): {len(arquivos)}, "
+              f"divergentes: {len(divergentes)}")
+        for arquivo, backend in divergentes:
+            print(f"  - {arquivo} ({backend})")
+        caracteres, serial, tempos = benchmark_paralelo(args.classes, args.processos, args.repeticoes)
+        print(f"\nModelo: {caracteres / 2**20:.1f} MB, {os.cpu_count()} CPU(s); serial: {serial * 1000:.0f} ms")
+        print(f"{'Processos':>9} {'Trechos':>8} {'Tempo (ms)':>11} {'Aceleração':>11}")
+        print('-' * 42)
+        for n, (tempo, trechos) in tempos.items():
+            print(f"{n:>9} {trechos:>8} {tempo * 1000:>11.0f} {serial / tempo:>10.2f}x")
+        sys.exit(1 if divergentes else 0)
+    elif args.comando == "lexer":
+        arquivos = _arquivos_de_teste()
+        divergentes = verificar_lexers(arquivos)
+        print(f"Arquivos comparados (ply x fast): {len(arquivos)}, divergentes: {len(divergentes)}")
+        for arquivo in divergentes:
+            print(f"  - {arquivo}")
+        total, tempos = benchmark_lexer(args.arquivo, args.copias)
+        print(f"\nTokens: {total}")
+        print(f"{'Backend':<8} {'Tempo (ms)':>11} {'Tokens/s':>12}")
+        print('-' * 33)
+        for backend, tempo in tempos.items():
+            print(f"{backend:<8} {tempo * 1000:>11.1f} {total / tempo:>12,.0f}")
+        sys.exit(1 if divergentes else 0)
+    elif args.comando == "memoria":
+        total, resultados = benchmark_memoria(args.arquivo, args.tokens)
+        print(f"Tokens: {total}")
+        print(f"{'Tabela':<10} {'Retida (MB)':>12} {'Pico (MB)':>10} {'Bytes/token':>12}")
+        print('-' * 47)
+        for variante, (retida, pico) in resultados.items():
+            print(f"{variante:<10} {retida / 2**20:>12.1f} {pico / 2**20:>10.1f} {retida / total:>12.1f}")
+    elif args.comando == "ast":
+        declaracoes, resultados = benchmark_memoria_ast(args.classes)
+        print(f"Declarações: {declaracoes}")
+        print(f"{'Síntese':<8} {'Retida (MB)':>12} {'Bytes/declaração':>17}")
+        print('-' * 39)
+        for variante, retida in resultados.items():
+            print(f"{variante:<8} {retida / 2**20:>12.1f} {retida / declaracoes:>17.1f}")
+    elif args.comando == "semantico":
+        print(f"{'Classes':>9} {'Relações':>9} {'Tempo (ms)':>11} {'µs/elemento':>12}")
+        print('-' * 44)
+        for classes, relacoes, tempo in benchmark_semantico(args.tamanhos):
+            print(f"{classes:>9} {relacoes:>9} {tempo * 1000:>11.1f} {tempo * 1e6 / (classes + relacoes):>12.2f}")
+    elif args.comando == "servidor":
+        resultado = benchmark_servidor(args.arquivo, args.clientes, args.pedidos, args.workers)
+        vazao, latencias, lotes = resultado["servidor"]
+        print(f"Servidor: {vazao:.0f} análises/s em {lotes} lote(s) para {len(latencias)} pedidos; "
+              f"latência mediana {latencias[len(latencias) // 2] * 1000:.1f} ms, "
+              f"p95 {latencias[int(len(latencias) * 0.95) - 1] * 1000:.1f} ms")
+        print(f"Processo por análise (main.py --format json): {resultado['processo']:.1f} análises/s")
+    elif args.comando == "lsp":
+        linhas, abertura, latencias = benchmark_lsp(args.arquivo, args.copias, args.teclas)
+        latencias.sort()
+        print(f"Documento: {linhas} linhas; abertura: {abertura * 1000:.1f} ms")
+        print(f"Por tecla: mediana {latencias[len(latencias) // 2] * 1000:.1f} ms, "
+              f"p95 {latencias[int(len(latencias) * 0.95) - 1] * 1000:.1f} ms, "
+              f"máx {latencias[-1] * 1000:.1f} ms")
+    elif args.comando == "concorrencia":
+        total, divergentes = verificar_concorrencia(_arquivos_de_teste(), args.threads, args.rodadas)
+        print(f"Análises concorrentes: {total}, divergentes: {len(divergentes)}")
+        for arquivo in sorted(set(divergentes)):
+            print(f"  - {arquivo}")
+        sys.exit(1 if divergentes else 0)
+    else:
+        repeticoes = getattr(args, "repeticoes", 5)
+        arquivo = getattr(args, "arquivo", os.path.join(DIR_TESTES, "exemplo1.tonto"))
+        _imprimir_inicializacao(benchmark_inicializacao(repeticoes))
+
+        print()
+        for modo, tempo in benchmark_chamadas(arquivo).items():
+            print(f"Por chamada ({modo}): {tempo * 1000:.2f} ms")
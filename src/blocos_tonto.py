@@ -0,0 +1,85 @@
+import re
+
+from contexto_tonto import ContextoAnalise
+from lexico_tonto import reserved, analisar_codigo
+from parser_tonto import analisar_sintaxe
+
+# Palavras que só podem iniciar um novo elemento de topo (classe, datatype,
+# enum, genset ou relação externa) quando aparecem fora de chaves
+INICIO_DECLARACAO = {
+    palavra for palavra, tipo in reserved.items()
+    if tipo in ('CLASS_STEREOTYPE', 'RELATION_STEREOTYPE')
+} | {'genset', 'disjoint', 'complete', 'datatype', 'enum', 'relation'}
+
+# Sem recuo, estas palavras nunca começam um membro de corpo: uma linha assim
+# inicia um novo trecho mesmo com chaves abertas (ex.: '}' ainda não digitado)
+INICIO_FORCADO = {
+    palavra for palavra, tipo in reserved.items() if tipo == 'CLASS_STEREOTYPE'
+} | {'genset', 'disjoint', 'complete', 'datatype', 'enum'}
+
+# Eventos da pré-varredura: primeira palavra de cada linha, comentários
+# (descartados, para não contar chaves dentro deles) e chaves
+_RE_EVENTOS = re.compile(
+    r'^(?P<recuo>[ \t]*)(?P<arroba>@)?(?P<palavra>[A-Za-z][A-Za-z0-9_\-]*)'
+    r'|(?P<comentario>---|#|//)[^\n]*'
+    r'|(?P<chave>[{}])',
+    re.M
+)
+
+
+def pontos_de_divisao(codigo, inicio=0, linha=1):
+    """
+    Pré-varredura barata (uma expressão regular, sem tokenizar) que acha onde
+    o código pode ser dividido em trechos sintaticamente independentes: cada
+    trecho começa em uma declaração de topo, fora de chaves. Cabeçalho
+    (imports/package) fica no primeiro trecho.
+    Gera (deslocamento, linha) do início de cada trecho, a começar por
+    (inicio, linha). Com `inicio` no começo de um trecho já conhecido, a
+    varredura retoma dali com o mesmo resultado que teria desde o início do
+    código (fora de chaves, a declaração do trecho não gera um novo ponto).
+    """
+    yield inicio, linha
+    inicio_bloco, linha_bloco = inicio, linha
+    profundidade = 0
+    viu_declaracao = False
+
+    for m in _RE_EVENTOS.finditer(codigo, inicio):
+        chave = m.group('chave')
+        if chave:
+            profundidade = profundidade + 1 if chave == '{' else max(0, profundidade - 1)
+            continue
+        palavra = m.group('palavra')
+        if not palavra:
+            continue
+
+        if profundidade > 0 and not m.group('recuo') and palavra in INICIO_FORCADO:
+            profundidade = 0
+        if profundidade == 0 and (palavra in INICIO_DECLARACAO or m.group('arroba')):
+            inicio = m.start()
+            if viu_declaracao:
+                linha_bloco += codigo.count('\n', inicio_bloco, inicio)
+                inicio_bloco = inicio
+                yield inicio_bloco, linha_bloco
+            viu_declaracao = True
+
+
+def dividir_em_blocos(codigo):
+    """
+    Divide o código nos trechos de pontos_de_divisao.
+    Retorna [(deslocamento, linha_inicial, texto)], cobrindo o código inteiro.
+    """
+    pontos = list(pontos_de_divisao(codigo))
+    fins = [deslocamento for deslocamento, _ in pontos[1:]] + [len(codigo)]
+    return [(deslocamento, linha, codigo[deslocamento:fim]) for (deslocamento, linha), fim in zip(pontos, fins)]
+
+
+def analisar_bloco(texto):
+    """
+    Léxico + sintático de um trecho isolado, com linhas contadas a partir de 1
+    e posições relativas ao início do trecho.
+    Retorna (contexto, tokens).
+    """
+    contexto = ContextoAnalise()
+    _, _, tokens_lidos = analisar_codigo(texto, contexto)
+    analisar_sintaxe(texto, tokens_lidos, contexto)
+    return contexto, tokens_lidos
@@ -0,0 +1,127 @@
+import os
+import pickle
+import hashlib
+import tempfile
+
+from contexto_tonto import ContextoAnalise
+
+DIR_SRC = os.path.dirname(os.path.abspath(__file__))
+# Qualquer mudança nestes módulos (regras, gramática, semântico) invalida o cache
+MODULOS_VERSIONADOS = ["contexto_tonto.py", "lexico_tonto.py", "lexico_rapido_tonto.py", "parser_tonto.py",
+                       "ast_tonto.py", "estereotipos_tonto.py", "semantico_tonto.py"]
+
+PASTA_PADRAO = ".tonto_cache"
+LIMITE_PADRAO_MB = 256
+
+_versao = None
+
+
+def versao_analisador():
+    """Hash do código-fonte do analisador, calculado uma vez por processo."""
+    global _versao
+    if _versao is None:
+        h = hashlib.sha256()
+        for modulo in MODULOS_VERSIONADOS:
+            with open(os.path.join(DIR_SRC, modulo), 'rb') as f:
+                h.update(f.read())
+        _versao = h.hexdigest()
+    return _versao
+
+
+class CacheAnalise:
+    """
+    Cache em disco do resultado completo de um arquivo (tabela de símbolos,
+    síntese e erros léxicos/sintáticos/semânticos), indexado pelo hash do
+    conteúdo + versão do analisador. Arquivos sem mudança não são reanalisados.
+    """
+
+    def __init__(self, pasta=None, limite_mb=None):
+        self.pasta = PASTA_PADRAO if pasta is None else pasta
+        self.limite_bytes = int((LIMITE_PADRAO_MB if limite_mb is None else limite_mb) * 1024 * 1024)
+
+    def chave(self, codigo):
+        h = hashlib.sha256(versao_analisador().encode('ascii'))
+        h.update(codigo.encode('utf-8'))
+        return h.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, chave[:2], chave + ".pkl")
+
+    def obter(self, codigo):
+        """
+        Retorna o ContextoAnalise guardado para este código, ou None. Uma
+        entrada corrompida (ou que não é um ContextoAnalise) é apagada e
+        tratada como ausente.
+        """
+        caminho = self._caminho(self.chave(codigo))
+        try:
+            with open(caminho, 'rb') as f:
+                contexto = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Arquivo truncado ou alterado: o pickle pode falhar com quase qualquer exceção
+            contexto = None
+        if not isinstance(contexto, ContextoAnalise):
+            self._descartar(caminho)
+            return None
+        # Marca o uso recente para a política de remoção (LRU por mtime)
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        return contexto
+
+    @staticmethod
+    def _descartar(caminho):
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+    def guardar(self, codigo, contexto):
+        caminho = self._caminho(self.chave(codigo))
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        # Grava em arquivo temporário e renomeia: leitores concorrentes (modo
+        # lote) nunca veem uma entrada pela metade
+        fd, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(contexto, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, caminho)
+        except OSError:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    def podar(self):
+        """
+        Remove as entradas usadas há mais tempo até o cache caber no limite.
+        Só conta e remove entradas (.pkl): os temporários de um guardar() em
+        andamento em outro processo ficam de fora.
+        """
+        entradas = []
+        total = 0
+        for raiz, _, arquivos in os.walk(self.pasta):
+            for nome in arquivos:
+                if not nome.endswith(".pkl"):
+                    continue
+                caminho = os.path.join(raiz, nome)
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                entradas.append((info.st_mtime, info.st_size, caminho))
+                total += info.st_size
+
+        removidas = 0
+        entradas.sort()
+        for _, tamanho, caminho in entradas:
+            if total <= self.limite_bytes:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue
+            total -= tamanho
+            removidas += 1
+        return removidas
@@ -0,0 +1,284 @@
+from array import array
+from bisect import bisect_right
+
+
+def nova_sintese():
+    """Estrutura vazia da síntese sintática usada pelo relatório e pelo semântico."""
+    return {
+        "imports": [],
+        "pacotes": [],
+        "classes": {},
+        "tipos": {},
+        "enums": {},
+        "generalizacoes": [],
+        "relacoes_externas": []
+    }
+
+
+def mesclar_sinteses(destino, parcial):
+    """Acrescenta a síntese parcial (de um módulo ou trecho) à síntese destino."""
+    destino["imports"].extend(parcial["imports"])
+    destino["pacotes"].extend(parcial["pacotes"])
+    destino["classes"].update(parcial["classes"])
+    destino["tipos"].update(parcial["tipos"])
+    destino["enums"].update(parcial["enums"])
+    destino["generalizacoes"].extend(parcial["generalizacoes"])
+    destino["relacoes_externas"].extend(parcial["relacoes_externas"])
+    return destino
+
+
+# Códigos estáveis dos diagnósticos (saída --format json/ndjson): um código
+# nunca muda de significado nem é reaproveitado para outro problema
+CODIGOS_DIAGNOSTICO = {
+    "LEX001": "caractere inesperado (uma sequência deles é um único diagnóstico, com o tamanho dela)",
+    "SIN001": "token inesperado",
+    "SIN002": "final inesperado do arquivo",
+    "SEM001": "ciclo de especialização",
+    "SEM002": "genset de subkinds sem 'disjoint'",
+    "SEM003": "genset de phases sem 'disjoint'",
+    "SEM004": "mediação de relator para uma classe que não é role",
+    "SEM005": "mode sem @externalDependence",
+    "SEM006": "genset de roleMixin sem 'disjoint' e 'complete'",
+    "SEM007": "relator sem relação material entre os roles mediados",
+    "LIM001": "limite de erros (--max-errors) atingido; análise do arquivo interrompida",
+}
+
+# Prefixo das mensagens de texto de cada etapa nos relatórios de erros
+PREFIXOS_ERRO = {"lexico": "Erro Léxico: ", "sintatico": "[ERRO SINTÁTICO] "}
+
+
+class LimiteDeErros(Exception):
+    """Levantada por ContextoAnalise.contar_erro quando a análise atinge limite_erros."""
+
+
+def novo_diagnostico(etapa, mensagem, linha=None, posicao=None, tamanho=1, codigo=None, severidade="erro",
+                     linhas=None):
+    """
+    Diagnóstico estruturado (complementa as mensagens de texto dos relatórios):
+    posicao é o deslocamento absoluto no código (lexpos) e tamanho o número de
+    caracteres afetados; ambos ficam None quando a posição é desconhecida.
+    Com o IndiceLinhas do código em `linhas`, coluna, linha_fim e coluna_fim
+    (fim exclusivo, contando a partir de 1) completam a posição; sem ele
+    também ficam None.
+    codigo é uma chave de CODIGOS_DIAGNOSTICO; severidade é "erro" (léxico e
+    sintático) ou "aviso" (semântico, que aplica coerções e segue adiante).
+    """
+    coluna = linha_fim = coluna_fim = None
+    if linhas is not None and posicao is not None:
+        _, coluna = linhas.posicao(posicao)
+        linha_fim, coluna_fim = linhas.posicao(posicao + tamanho)
+    return {"codigo": codigo, "severidade": severidade, "etapa": etapa, "mensagem": mensagem, "linha": linha,
+            "coluna": coluna, "linha_fim": linha_fim, "coluna_fim": coluna_fim, "posicao": posicao,
+            "tamanho": tamanho}
+
+
+class IndiceLinhas:
+    """
+    Deslocamento do início de cada linha, registrado pelo lexer a cada quebra
+    de linha: converte um deslocamento (lexpos) em (linha, coluna) por busca
+    binária, sem percorrer o código de novo. Linhas e colunas contam a partir
+    de 1. O índice de um trecho (paralelo_tonto) começa na linha e no
+    deslocamento do trecho, e estender() o junta ao do trecho anterior.
+    """
+
+    __slots__ = ('primeira_linha', 'inicios')
+
+    def __init__(self, primeira_linha=1, inicio=0):
+        self.primeira_linha = primeira_linha
+        self.inicios = array('Q', (inicio,))
+
+    def quebras(self, deslocamento, quantidade=1):
+        """Registra `quantidade` quebras de linha seguidas, a primeira em `deslocamento`."""
+        self.inicios.extend(range(deslocamento + 1, deslocamento + quantidade + 1))
+
+    def coluna(self, linha, deslocamento):
+        """Coluna de `deslocamento`, já sabendo que ele está em `linha` (sem busca)."""
+        return deslocamento - self.inicios[linha - self.primeira_linha] + 1
+
+    def posicao(self, deslocamento):
+        """(linha, coluna) de `deslocamento`."""
+        i = bisect_right(self.inicios, deslocamento) - 1
+        if i < 0:
+            i = 0
+        return self.primeira_linha + i, deslocamento - self.inicios[i] + 1
+
+    def substituir(self, inicio, fim, texto):
+        """
+        Atualiza o índice para a troca de codigo[inicio:fim] por `texto`: só
+        as linhas do intervalo são refeitas; as seguintes são deslocadas.
+        """
+        primeira = bisect_right(self.inicios, inicio)
+        depois = bisect_right(self.inicios, fim)
+        delta = len(texto) - (fim - inicio)
+        novos = array('Q')
+        quebra = texto.find('\n')
+        while quebra != -1:
+            novos.append(inicio + quebra + 1)
+            quebra = texto.find('\n', quebra + 1)
+        novos.extend(map(delta.__add__, self.inicios[depois:]))
+        self.inicios[primeira:] = novos
+
+    def estender(self, outro):
+        """Acrescenta o índice do trecho seguinte, que começa no início da última linha deste."""
+        self.inicios.extend(outro.inicios[1:])
+
+    def __len__(self):
+        return len(self.inicios)
+
+
+class TabelaSimbolos:
+    """
+    Tabela de símbolos compacta: em vez de um dict por token, guarda o tipo
+    como código inteiro pequeno e linha/posição em arrays de inteiros; os
+    lexemas são internados (cada valor distinto é guardado uma vez e as
+    linhas da tabela apontam para ele).
+    Iterar ou indexar a tabela ainda produz dicts {"tipo", "valor", "linha",
+    "posicao"}, como a lista antiga; linhas() produz tuplas, sem montar dicts.
+    """
+
+    CAMPOS = ('tipo', 'valor', 'linha', 'posicao')
+
+    def __init__(self):
+        self.nomes_tipos = []
+        self._codigos_tipos = {}
+        self.lexemas = []
+        self._codigos_lexemas = {}
+        self.tipos = array('H')
+        self.valores = array('I')
+        self.linhas_token = array('I')
+        self.posicoes = array('Q')
+
+    def adicionar(self, tipo, valor, linha, posicao):
+        codigo_tipo = self._codigos_tipos.get(tipo)
+        if codigo_tipo is None:
+            codigo_tipo = self._codigos_tipos[tipo] = len(self.nomes_tipos)
+            self.nomes_tipos.append(tipo)
+        # A chave inclui o tipo do valor: o NUMBER 1 e o lexema '1' não se confundem
+        chave = (valor.__class__, valor)
+        codigo_valor = self._codigos_lexemas.get(chave)
+        if codigo_valor is None:
+            codigo_valor = self._codigos_lexemas[chave] = len(self.lexemas)
+            self.lexemas.append(valor)
+        self.tipos.append(codigo_tipo)
+        self.valores.append(codigo_valor)
+        self.linhas_token.append(linha)
+        self.posicoes.append(posicao)
+
+    def estender(self, outra):
+        """Acrescenta, em ordem, os tokens de outra tabela (ex.: a de um trecho analisado em outro processo)."""
+        tipos = []
+        for tipo in outra.nomes_tipos:
+            codigo_tipo = self._codigos_tipos.get(tipo)
+            if codigo_tipo is None:
+                codigo_tipo = self._codigos_tipos[tipo] = len(self.nomes_tipos)
+                self.nomes_tipos.append(tipo)
+            tipos.append(codigo_tipo)
+        valores = []
+        for valor in outra.lexemas:
+            chave = (valor.__class__, valor)
+            codigo_valor = self._codigos_lexemas.get(chave)
+            if codigo_valor is None:
+                codigo_valor = self._codigos_lexemas[chave] = len(self.lexemas)
+                self.lexemas.append(valor)
+            valores.append(codigo_valor)
+        self.tipos.extend(map(tipos.__getitem__, outra.tipos))
+        self.valores.extend(map(valores.__getitem__, outra.valores))
+        self.linhas_token.extend(outra.linhas_token)
+        self.posicoes.extend(outra.posicoes)
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def linha(self, i):
+        """(tipo, valor, linha, posicao) do i-ésimo token."""
+        return (self.nomes_tipos[self.tipos[i]], self.lexemas[self.valores[i]],
+                self.linhas_token[i], self.posicoes[i])
+
+    def linhas(self):
+        """Itera (tipo, valor, linha, posicao) na ordem dos tokens."""
+        return zip(map(self.nomes_tipos.__getitem__, self.tipos), map(self.lexemas.__getitem__, self.valores),
+                   self.linhas_token, self.posicoes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [dict(zip(self.CAMPOS, self.linha(j))) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice fora da tabela de símbolos")
+        return dict(zip(self.CAMPOS, self.linha(i)))
+
+    def __iter__(self):
+        campos = self.CAMPOS
+        for linha in self.linhas():
+            yield dict(zip(campos, linha))
+
+    def __eq__(self, outra):
+        if isinstance(outra, TabelaSimbolos):
+            return len(self) == len(outra) and all(a == b for a, b in zip(self.linhas(), outra.linhas()))
+        if isinstance(outra, list):
+            return len(self) == len(outra) and all(a == b for a, b in zip(self, outra))
+        return NotImplemented
+
+    __hash__ = None
+
+
+class ContextoAnalise:
+    """
+    Estado de uma única análise: síntese sintática e erros de cada etapa.
+    As regras do lexer (t_*) e da gramática (p_*) escrevem apenas no contexto
+    da análise em curso, o que permite várias análises simultâneas no mesmo
+    processo (threads) compartilhando as mesmas tabelas do lexer e do parser.
+    backend_lexico escolhe o lexer usado por build_lexer ("ply" ou "fast");
+    linhas é o IndiceLinhas montado pelo lexer durante a leitura.
+    Com limite_erros, a análise do arquivo é interrompida (interrompida=True)
+    quando os erros léxicos e sintáticos somam esse limite (ver contar_erro).
+    """
+
+    def __init__(self, backend_lexico="ply", limite_erros=None):
+        self.backend_lexico = backend_lexico
+        self.limite_erros = limite_erros
+        self.interrompida = False
+        self.tabela = TabelaSimbolos()
+        self.sintese = nova_sintese()
+        self.erros_lexicos = []
+        self.erros_sintaticos = []
+        self.padroes = []
+        self.erros_semanticos = []
+        self.diagnosticos = []
+        self.linhas = IndiceLinhas()
+
+    def contar_erro(self, etapa):
+        """
+        Chamado a cada erro léxico ou sintático registrado. Ao atingir
+        limite_erros, registra a interrupção (mensagem e diagnóstico LIM001
+        da etapa) e levanta LimiteDeErros; tokenizar, iterar_tokens e
+        analisar_sintaxe a tratam encerrando a análise do arquivo ali.
+        """
+        if self.limite_erros is None or len(self.erros_lexicos) + len(self.erros_sintaticos) < self.limite_erros:
+            return
+        self.interrompida = True
+        mensagem = f"Limite de {self.limite_erros} erros atingido; análise interrompida."
+        (self.erros_lexicos if etapa == "lexico" else self.erros_sintaticos).append(PREFIXOS_ERRO[etapa] + mensagem)
+        self.diagnosticos.append(novo_diagnostico(etapa, mensagem, codigo="LIM001"))
+        raise LimiteDeErros(mensagem)
+
+
+def analisar_documento(codigo, contexto=None):
+    """
+    Executa léxico, sintático e semântico sobre um código já lido.
+    Pode ser chamada de várias threads ao mesmo tempo; retorna o ContextoAnalise
+    preenchido por todas as etapas (sem o semântico, se o limite de erros
+    do contexto interrompeu a análise).
+    """
+    from lexico_tonto import analisar_codigo
+    from parser_tonto import analisar_sintaxe
+    from semantico_tonto import verificar_semantica
+
+    contexto = contexto or ContextoAnalise()
+    contexto.tabela, _, tokens_lidos = analisar_codigo(codigo, contexto)
+    analisar_sintaxe(codigo, tokens_lidos, contexto)
+    if not contexto.interrompida:
+        contexto.padroes, contexto.erros_semanticos = verificar_semantica(
+            contexto.sintese, contexto.diagnosticos, contexto.linhas)
+    return contexto
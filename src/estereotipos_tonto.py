@@ -0,0 +1,60 @@
+from lexico_tonto import reserved
+
+# Códigos inteiros dos estereótipos. O parser troca o nome do estereótipo
+# (um token CLASS_STEREOTYPE ou RELATION_STEREOTYPE) pelo código uma única
+# vez, e o semântico compara códigos e consulta conjuntos de códigos por
+# categoria em vez de comparar cadeias. O código é a posição em NOMES.
+
+ESTEREOTIPOS_CLASSE = tuple(nome for nome, tipo in reserved.items() if tipo == 'CLASS_STEREOTYPE')
+# externalDependence não é palavra reservada, mas é o que o Mode Pattern procura
+ESTEREOTIPOS_RELACAO = tuple(nome for nome, tipo in reserved.items()
+                             if tipo == 'RELATION_STEREOTYPE') + ('externalDependence',)
+
+NOMES = ESTEREOTIPOS_CLASSE + ESTEREOTIPOS_RELACAO
+CODIGOS = {nome: codigo for codigo, nome in enumerate(NOMES)}
+
+
+def codigo_estereotipo(nome):
+    """Código do estereótipo `nome`; ValueError se não for um estereótipo conhecido."""
+    try:
+        return CODIGOS[nome]
+    except KeyError:
+        raise ValueError(f"estereótipo desconhecido: {nome!r}") from None
+
+
+def nome_estereotipo(codigo):
+    """Nome do estereótipo de código `codigo` (None para None)."""
+    return None if codigo is None else NOMES[codigo]
+
+
+# Códigos nomeados (os usados nas categorias e no semântico)
+KIND = CODIGOS['kind']
+SUBKIND = CODIGOS['subkind']
+ROLE = CODIGOS['role']
+PHASE = CODIGOS['phase']
+CATEGORY = CODIGOS['category']
+MIXIN = CODIGOS['mixin']
+ROLE_MIXIN = CODIGOS['roleMixin']
+PHASE_MIXIN = CODIGOS['phaseMixin']
+RELATOR = CODIGOS['relator']
+MODE = CODIGOS['mode']
+QUALITY = CODIGOS['quality']
+QUANTITY = CODIGOS['quantity']
+COLLECTIVE = CODIGOS['collective']
+HISTORICAL_ROLE = CODIGOS['historicalRole']
+HISTORICAL_ROLE_MIXIN = CODIGOS['historicalRoleMixin']
+MATERIAL = CODIGOS['material']
+MEDIATION = CODIGOS['mediation']
+CHARACTERIZATION = CODIGOS['characterization']
+EXTERNAL_DEPENDENCE = CODIGOS['externalDependence']
+
+# Categorias (UFO/OntoUML)
+# Fornecem identidade: todo sortal especializa exatamente um deles
+SORTAIS_ULTIMOS = frozenset({KIND, COLLECTIVE, QUANTITY, RELATOR, MODE, QUALITY})
+# Herdam a identidade de um sortal último, em qualquer nível abaixo dele
+SORTAIS_DERIVADOS = frozenset({SUBKIND, ROLE, PHASE})
+SORTAIS = SORTAIS_ULTIMOS | SORTAIS_DERIVADOS | {HISTORICAL_ROLE}
+NAO_SORTAIS = frozenset({CATEGORY, MIXIN, ROLE_MIXIN, PHASE_MIXIN, HISTORICAL_ROLE_MIXIN})
+RIGIDOS = SORTAIS_ULTIMOS | {SUBKIND, CATEGORY}
+ANTI_RIGIDOS = frozenset({ROLE, PHASE, ROLE_MIXIN, PHASE_MIXIN, HISTORICAL_ROLE, HISTORICAL_ROLE_MIXIN})
+SEMI_RIGIDOS = frozenset({MIXIN})
@@ -0,0 +1,142 @@
+import sys
+import random
+import argparse
+
+# Gerador de modelos TONTO sintéticos, válidos para o léxico e o sintático,
+# usados pelos benchmarks de escala (benchmark_tonto.py escala).
+
+# Estereótipos das relações externas avulsas, com o símbolo usado em cada uma
+ESTEREOTIPOS_RELACAO = (("material", "--"), ("componentOf", "<>--"), ("memberOf", "<>--"),
+                        ("characterization", "--"), ("derivation", "--"), ("mediation", "--"))
+
+# Filhos de cada Kind: (estereótipo, prefixo do nome, letra)
+FILHOS = (("subkind", "Tipo", "A"), ("subkind", "Tipo", "B"), ("role", "Papel", "A"),
+          ("role", "Papel", "B"), ("phase", "Fase", "A"), ("phase", "Fase", "B"))
+
+# Modificadores do genset de cada grupo de filhos (o que os padrões ODP esperam)
+MODIFICADORES = {"subkind": "disjoint complete ", "role": "", "phase": "disjoint complete "}
+
+
+def _sufixo(i):
+    """0 -> 'A', 25 -> 'Z', 26 -> 'BA'...: nomes sem dígitos, que seriam INSTANCE_NAME."""
+    letras = ""
+    while True:
+        letras = chr(ord('A') + i % 26) + letras
+        i //= 26
+        if i == 0:
+            return letras
+
+
+def gerar_modelo(classes=1000, gensets=None, relators=None, modos=None, role_mixins=None, relacoes=None,
+                 imports=0, pacote="Sintetico", semente=0):
+    """
+    Texto de um modelo TONTO sintético com o formato pedido:
+    - classes: Kinds (com dois atributos) e seus filhos, até 2 subkinds, 2 roles
+      e 2 phases por Kind, em famílias de 7 classes;
+    - gensets: gensets sobre os filhos de cada Kind (padrão: um por grupo de filhos);
+    - relators: relators mediando dois roles, com a relação material entre eles;
+    - modos: modes caracterizando um Kind;
+    - role_mixins: roleMixins com genset disjoint complete sobre dois roles;
+    - relacoes: relações externas avulsas entre classes quaisquer;
+    - imports: linhas de import no cabeçalho.
+    Os valores None são proporcionais a `classes`. O mesmo formato e a mesma
+    semente geram sempre o mesmo texto.
+    """
+    aleatorio = random.Random(semente)
+    relators = classes // 20 if relators is None else relators
+    modos = classes // 20 if modos is None else modos
+    role_mixins = classes // 50 if role_mixins is None else role_mixins
+    relacoes = classes if relacoes is None else relacoes
+
+    partes = [f"import Modulo{_sufixo(i)}\n" for i in range(imports)]
+    partes.append(f"package {pacote}\n")
+
+    kinds, roles, todas = [], [], []
+    grupos = []
+    restantes = classes
+    while restantes > 0:
+        s = _sufixo(len(kinds))
+        kind = f"Pessoa{s}"
+        partes.append(f"\nkind {kind} {{\n    nome : string [1]\n    codigo : number\n}}\n")
+        kinds.append(kind)
+        todas.append(kind)
+        restantes -= 1
+
+        filhos = {}
+        for estereotipo, prefixo, letra in FILHOS[:restantes]:
+            nome = f"{prefixo}{s}{letra}"
+            partes.append(f"{estereotipo} {nome} specializes {kind}\n")
+            filhos.setdefault(estereotipo, []).append(nome)
+            todas.append(nome)
+        restantes -= min(restantes, len(FILHOS))
+        roles.extend(filhos.get("role", []))
+        grupos.extend((kind, estereotipo, nomes) for estereotipo, nomes in filhos.items())
+
+    # Gensets alternam entre a forma em bloco e a forma em linha
+    for i, (kind, estereotipo, nomes) in enumerate(grupos[:len(grupos) if gensets is None else gensets]):
+        modificadores = MODIFICADORES[estereotipo]
+        nome = f"Grupo{_sufixo(i)}"
+        if i % 2:
+            partes.append(f"\n{modificadores}genset {nome} where {', '.join(nomes)} specializes {kind}\n")
+        else:
+            partes.append(f"\n{modificadores}genset {nome} {{\n    general {kind}\n"
+                          f"    specifics {', '.join(nomes)}\n}}\n")
+
+    if len(roles) >= 2:
+        for i in range(relators):
+            s = _sufixo(i)
+            a, b = aleatorio.sample(roles, 2)
+            partes.append(f"\nrelator Contrato{s} {{\n    @mediation [1..*] -- [1] {a}\n"
+                          f"    @mediation [1..*] -- [1] {b}\n}}\n")
+            partes.append(f"@material relation {a} [1..*] -- contrata{s} -- [1..*] {b}\n")
+            todas.append(f"Contrato{s}")
+
+        for i in range(role_mixins):
+            s = _sufixo(i)
+            a, b = aleatorio.sample(roles, 2)
+            partes.append(f"\nroleMixin Cliente{s}\n")
+            partes.append(f"disjoint complete genset Clientes{s} {{\n    general Cliente{s}\n"
+                          f"    specifics {a}, {b}\n}}\n")
+            todas.append(f"Cliente{s}")
+
+    for i in range(modos):
+        s = _sufixo(i)
+        partes.append(f"\nmode Estado{s} {{\n    @characterization [1..*] -- [1] {aleatorio.choice(kinds)}\n}}\n")
+        todas.append(f"Estado{s}")
+
+    if todas:
+        partes.append("\n")
+        for i in range(relacoes):
+            estereotipo, simbolo = ESTEREOTIPOS_RELACAO[i % len(ESTEREOTIPOS_RELACAO)]
+            origem, destino = aleatorio.choice(todas), aleatorio.choice(todas)
+            if simbolo == "--":
+                partes.append(f"@{estereotipo} relation {origem} [1..*] -- liga{_sufixo(i)} -- [0..*] {destino}\n")
+            else:
+                partes.append(f"@{estereotipo} relation {origem} [1] {simbolo} [1..*] {destino}\n")
+    return "".join(partes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um modelo TONTO sintético")
+    parser.add_argument("saida", nargs="?", help="Arquivo .tonto gerado (padrão: saída padrão)")
+    parser.add_argument("--classes", type=int, default=1000)
+    parser.add_argument("--gensets", type=int, help="Padrão: um por grupo de filhos de cada Kind")
+    parser.add_argument("--relators", type=int, help="Padrão: classes / 20")
+    parser.add_argument("--modos", type=int, help="Padrão: classes / 20")
+    parser.add_argument("--role-mixins", type=int, help="Padrão: classes / 50")
+    parser.add_argument("--relacoes", type=int, help="Relações externas avulsas (padrão: classes)")
+    parser.add_argument("--imports", type=int, default=0)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    texto = gerar_modelo(args.classes, args.gensets, args.relators, args.modos, args.role_mixins,
+                         args.relacoes, args.imports, semente=args.semente)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto)
+    else:
+        sys.stdout.write(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import re
+import sys
+
+import lexico_tonto
+from lexico_tonto import reserved, registrar_erro_lexico, REFLAGS
+
+# Backend léxico alternativo (--lexer fast): em vez do despacho do PLY (uma
+# chamada de função Python por regra casada), uma única expressão regular
+# mestre com grupos nomeados percorre o texto com finditer e a classificação
+# dos identificadores sai de uma tabela. Os tokens (tipo, valor, linha e
+# posição) e os erros são os mesmos do lexer PLY.
+
+
+class Token:
+    """Token com os mesmos atributos do LexToken do PLY (o yacc grava lexer no token de erro)."""
+
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, tipo, valor, linha, posicao):
+        self.type = tipo
+        self.value = valor
+        self.lineno = linha
+        self.lexpos = posicao
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+def _montar_padrao():
+    """
+    Expressão mestre na mesma ordem de tentativa do PLY: regras-função na
+    ordem em que foram definidas, depois as regras-cadeia da maior para a
+    menor expressão; no fim, qualquer outro caractere, que é o erro. Os
+    caracteres de t_ignore (que o PLY pula antes de tentar as regras) viram
+    um prefixo opcional de cada casamento, em vez de um casamento próprio.
+    Retorna (padrão compilado, nome de cada grupo pelo índice).
+    """
+    regras = vars(lexico_tonto)
+    funcoes = sorted((f for nome, f in regras.items()
+                      if nome.startswith('t_') and callable(f) and nome != 't_error'),
+                     key=lambda f: f.__code__.co_firstlineno)
+    cadeias = sorted(((nome, regex) for nome, regex in regras.items()
+                      if nome.startswith('t_') and isinstance(regex, str) and nome != 't_ignore'),
+                     key=lambda regra: len(regra[1]), reverse=True)
+
+    alternativas = [f"(?P<{f.__name__[2:]}>{f.__doc__})" for f in funcoes]
+    alternativas += [f"(?P<{nome[2:]}>{regex})" for nome, regex in cadeias]
+    ignorados = re.escape(lexico_tonto.t_ignore)
+    alternativas.append(f"(?P<erro>[^{ignorados}])")
+    # re.VERBOSE, como no mestre do PLY
+    padrao = re.compile(f"[{ignorados}]*(?:{'|'.join(alternativas)})",
+                        REFLAGS | re.VERBOSE)
+    nomes = [None] * (padrao.groups + 1)
+    for nome, indice in padrao.groupindex.items():
+        nomes[indice] = nome
+    return padrao, tuple(nomes)
+
+
+_PADRAO, _NOMES_GRUPOS = _montar_padrao()
+
+
+def _fim_invalidos(data, fim):
+    """Fim da sequência de caracteres inválidos que continua em `fim` (sem caracteres ignorados no meio)."""
+    while True:
+        m = _PADRAO.match(data, fim)
+        if m is None or _NOMES_GRUPOS[m.lastindex] != 'erro' or m.start(m.lastindex) != fim:
+            return fim
+        fim += 1
+
+
+def classificar_identificador(valor):
+    """Tipo de um IDENTIFIER, pelas mesmas regras de t_IDENTIFIER."""
+    tipo = reserved.get(valor)
+    if tipo:
+        return tipo
+    if valor[-1].isdigit():
+        return 'INSTANCE_NAME'
+    if valor[0].isupper():
+        return 'CLASS_NAME'
+    return 'RELATION_NAME'
+
+
+class LexerRapido:
+    """
+    Lexer com a interface usada do lexer PLY (input/token/iteração, lineno,
+    deslocamento e contexto). A tabela de classificação começa com as
+    palavras reservadas e guarda cada identificador já visto com seu tipo e
+    o nome internado (sys.intern, como no lexer PLY), de modo que um nome
+    repetido é classificado com uma única consulta e guardado uma única vez.
+    """
+
+    def __init__(self, contexto):
+        self.contexto = contexto
+        self.lineno = 1
+        self.deslocamento = 0
+        self.classificacao = {nome: (tipo, sys.intern(nome)) for nome, tipo in reserved.items()}
+        self._fluxo = iter(())
+
+    def input(self, data):
+        self._fluxo = self._gerar(data)
+
+    def token(self):
+        return next(self._fluxo, None)
+
+    def __iter__(self):
+        return self._fluxo
+
+    def _gerar(self, data):
+        classificacao = self.classificacao
+        contexto = self.contexto
+        linha = self.lineno
+        fim_erro = 0
+
+        # Só um espaço final sem token depois fica sem casamento, e o PLY também o ignora
+        for m in _PADRAO.finditer(data):
+            # Grupo externo da regra casada (o de comment contém subgrupos, mas fecha por último)
+            i = m.lastindex
+            tipo = _NOMES_GRUPOS[i]
+            if tipo == 'IDENTIFIER':
+                valor = m.group(i)
+                classe = classificacao.get(valor)
+                if classe is None:
+                    classe = classificacao[valor] = (classificar_identificador(valor), sys.intern(valor))
+                yield Token(classe[0], classe[1], linha, m.start(i))
+            elif tipo == 'newline':
+                contexto.linhas.quebras(self.deslocamento + m.start(i), m.end() - m.start(i))
+                linha += m.end() - m.start(i)
+                self.lineno = linha
+            elif tipo == 'comment':
+                continue
+            elif tipo == 'NUMBER':
+                yield Token(tipo, int(m.group(i)), linha, m.start(i))
+            elif tipo == 'erro':
+                # Como no t_error do PLY, caracteres inválidos seguidos são um único erro:
+                # a sequência inteira é registrada no primeiro e os demais casamentos são pulados
+                inicio = m.start(i)
+                if inicio < fim_erro:
+                    continue
+                fim_erro = _fim_invalidos(data, m.end(i))
+                registrar_erro_lexico(contexto, data[inicio:fim_erro], linha, self.deslocamento + inicio)
+            else:
+                yield Token(tipo, m.group(i), linha, m.start(i))
+        self.lineno = linha
@@ -1,6 +1,14 @@
 # src/lexico_tonto.py
 import ply.lex as lex
+import codecs
+import hashlib
+import mmap
+import os
 import re
+import sys
+import threading
+
+from contexto_tonto import ContextoAnalise, TabelaSimbolos, LimiteDeErros, novo_diagnostico
 
 # ================================================================
 # 1. PALAVRAS RESERVADAS
@@ -106,6 +114,8 @@ def t_NEW_TYPE(t):
 
 def t_IDENTIFIER(t):
     r'[a-zA-Z_][a-zA-Z0-9_\-]*'
+    # Cada nome fica guardado uma única vez, por mais que se repita no modelo
+    t.value = sys.intern(t.value)
 
     if t.value in reserved:
         t.type = reserved[t.value]
@@ -132,34 +142,299 @@ def t_comment(t):
 
 def t_newline(t):
     r'\n+'
+    t.lexer.contexto.linhas.quebras(t.lexer.deslocamento + t.lexpos, len(t.value))
     t.lexer.lineno += len(t.value)
 
 
-erros_lexicos = []
+def t_error(t):
+    # Caracteres inválidos seguidos são um único erro: um trecho binário não vira um erro por byte
+    tamanho = _fim_invalidos(t.lexer, t.lexpos) - t.lexpos
+    # Lendo em trechos (iterar_tokens), lexpos é relativo ao trecho atual
+    registrar_erro_lexico(t.lexer.contexto, t.value[:tamanho], t.lexer.lineno, t.lexer.deslocamento + t.lexpos)
+    t.lexer.skip(tamanho)
+
 
+def _fim_invalidos(lexer, inicio):
+    """Fim da sequência de caracteres a partir de `inicio` em que nenhuma regra do lexer casa."""
+    dados, ignorados, regras = lexer.lexdata, lexer.lexignore, lexer.lexre
+    fim = inicio + 1
+    while fim < len(dados) and dados[fim] not in ignorados and not any(r.match(dados, fim) for r, _ in regras):
+        fim += 1
+    return fim
 
-def t_error(t):
-    erros_lexicos.append(f"Erro Léxico: caractere inesperado '{t.value[0]}' na linha {t.lexer.lineno}.")
-    t.lexer.skip(1)
+
+# Caracteres de uma sequência inválida mostrados na mensagem de erro
+AMOSTRA_ERRO = 20
+
+
+def registrar_erro_lexico(contexto, trecho, linha, posicao):
+    """
+    Mensagem do relatório e diagnóstico de uma sequência de caracteres
+    inválidos (comum aos dois backends); conta o erro para o limite do contexto.
+    """
+    if len(trecho) == 1:
+        descricao = f"caractere inesperado '{trecho}'"
+    else:
+        amostra = trecho if len(trecho) <= AMOSTRA_ERRO else trecho[:AMOSTRA_ERRO] + "..."
+        descricao = f"{len(trecho)} caracteres inesperados '{amostra}'"
+    contexto.erros_lexicos.append(
+        f"Erro Léxico: {descricao} na linha {linha}, coluna {contexto.linhas.coluna(linha, posicao)}.")
+    contexto.diagnosticos.append(novo_diagnostico(
+        "lexico", descricao, linha, posicao, len(trecho), codigo="LEX001", linhas=contexto.linhas))
+    contexto.contar_erro("lexico")
 
 
-def build_lexer():
+# ================================================================
+# 4. CONSTRUÇÃO E CACHE DO LEXER
+# ================================================================
+# A tabela do lexer (lextab.py) é gerada uma única vez e gravada junto
+# com a assinatura das regras; ela só é regenerada quando os tokens,
+# as palavras reservadas ou as expressões regulares mudam.
+DIR_TABELAS = os.path.dirname(os.path.abspath(__file__))
+LEXTAB = 'lextab'
+REFLAGS = re.UNICODE
+
+# Backends de build_lexer (--lexer): o lexer do PLY ou o de expressão mestre
+# (lexico_rapido_tonto), que produz os mesmos tokens e erros
+BACKENDS = ("ply", "fast")
+
+_lexer_base = None
+_trava_lexer = threading.Lock()
+
+
+def assinatura_lexer():
+    """Hash das regras léxicas (tokens, reservadas e regex de cada t_*)."""
     import lexico_tonto
-    return lex.lex(module=lexico_tonto, reflags=re.UNICODE)
+    partes = [str(REFLAGS), ' '.join(sorted(tokens))]
+    partes += [f"{k}={v}" for k, v in sorted(reserved.items())]
+    for nome in sorted(n for n in vars(lexico_tonto) if n.startswith('t_')):
+        regra = getattr(lexico_tonto, nome)
+        regex = regra.__doc__ if callable(regra) else regra
+        partes.append(f"{nome}={regex}")
+    return hashlib.md5('\n'.join(partes).encode('utf-8')).hexdigest()
+
+
+def _construir_lexer_base():
+    import lexico_tonto
+    assinatura = assinatura_lexer()
+    caminho_tab = os.path.join(DIR_TABELAS, LEXTAB + '.py')
+    marca = f"_assinatura = '{assinatura}'\n"
+
+    # Tabela de uma versão anterior das regras: descarta para regenerar
+    if os.path.exists(caminho_tab):
+        with open(caminho_tab, 'r', encoding='utf-8') as f:
+            if marca not in f.read():
+                try:
+                    os.remove(caminho_tab)
+                except OSError:
+                    pass
+
+    lexer = lex.lex(module=lexico_tonto, reflags=REFLAGS, optimize=True,
+                    lextab=LEXTAB, outputdir=DIR_TABELAS)
+
+    if os.path.exists(caminho_tab):
+        with open(caminho_tab, 'r+', encoding='utf-8') as f:
+            if marca not in f.read():
+                f.write(marca)
+    return lexer
+
+
+def build_lexer(contexto=None):
+    """
+    Retorna um lexer novo, clonado do lexer base construído uma vez por processo.
+    Os erros léxicos vão para contexto.erros_lexicos. O backend é o do
+    contexto (contexto.backend_lexico); com "fast" o lexer é um LexerRapido.
+    """
+    global _lexer_base
+    contexto = contexto or ContextoAnalise()
+    if contexto.backend_lexico == "fast":
+        from lexico_rapido_tonto import LexerRapido
+        return LexerRapido(contexto)
+    if _lexer_base is None:
+        with _trava_lexer:
+            if _lexer_base is None:
+                _lexer_base = _construir_lexer_base()
+    lexer = _lexer_base.clone()
+    lexer.lineno = 1
+    lexer.deslocamento = 0
+    lexer.contexto = contexto
+    return lexer
+
+
+class LexerDeTokens:
+    """
+    Adaptador com a interface de lexer do PLY (input/token) que reproduz uma
+    lista (ou outro iterável) de tokens já produzida, evitando tokenizar o
+    código uma segunda vez. devolver() põe tokens de volta na frente do
+    fluxo, para a recuperação de erros do parser.
+    """
+
+    def __init__(self, tokens_lidos, contexto):
+        self._tokens = iter(tokens_lidos)
+        self._devolvidos = []
+        self.contexto = contexto
+
+    def input(self, data):
+        pass
+
+    def token(self):
+        if self._devolvidos:
+            return self._devolvidos.pop()
+        return next(self._tokens, None)
+
+    def devolver(self, *tokens_lidos):
+        """Faz os tokens voltarem a ser lidos, na ordem dada, antes do restante do fluxo."""
+        self._devolvidos.extend(reversed(tokens_lidos))
 
 
-def analisar_arquivo(caminho):
-    erros_lexicos.clear()
-    tabela = []
-    lexer = build_lexer()
+# Bytes do início do arquivo examinados por verificar_texto
+AMOSTRA_TEXTO = 8192
+
+
+class ArquivoNaoTexto(ValueError):
+    """O arquivo não é texto UTF-8 (binário ou em outra codificação)."""
+
+
+def verificar_texto(caminho, tamanho=AMOSTRA_TEXTO):
+    """
+    Recusa, antes do léxico, um arquivo que não é texto: com um byte nulo no
+    início (o mesmo critério do git) ou cujo início não é UTF-8 válido.
+    Levanta ArquivoNaoTexto.
+    """
+    with open(caminho, 'rb') as f:
+        amostra = f.read(tamanho)
+    nulo = amostra.find(b'\0')
+    if nulo >= 0:
+        raise ArquivoNaoTexto(f"{caminho}: arquivo binário (byte nulo na posição {nulo})")
     try:
-        with open(caminho, 'r', encoding='utf-8') as f:
-            data = f.read()
-        lexer.input(data)
+        # final=False: a amostra pode cortar um caractere de vários bytes ao meio
+        codecs.getincrementaldecoder('utf-8')().decode(amostra, final=False)
+    except UnicodeDecodeError as e:
+        raise ArquivoNaoTexto(f"{caminho}: não é texto UTF-8 (byte inválido na posição {e.start})") from None
+
+
+def ler_codigo(caminho):
+    verificar_texto(caminho)
+    with open(caminho, 'r', encoding='utf-8') as f:
+        try:
+            return f.read()
+        except UnicodeDecodeError as e:
+            raise ArquivoNaoTexto(f"{caminho}: não é texto UTF-8 ({e.reason})") from None
+
+
+# Tamanho aproximado dos trechos lidos por iterar_tokens
+TAMANHO_TRECHO = 1 << 20
+
+
+def _decodificar(dados):
+    # Mesma conversão de quebras de linha que open(..., 'r') faz em ler_codigo
+    return dados.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def ler_trechos(caminho, usar_mmap=True, tamanho=TAMANHO_TRECHO):
+    """
+    Lê o arquivo em trechos de ~`tamanho` bytes que terminam em quebra de
+    linha (nenhum token atravessa linhas), já decodificados. Com usar_mmap o
+    arquivo é mapeado em memória e só o trecho atual vira str. Um arquivo
+    que não é texto é recusado antes do primeiro trecho (verificar_texto).
+    """
+    verificar_texto(caminho)
+    with open(caminho, 'rb') as f:
+        if usar_mmap and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+                inicio, total = 0, len(dados)
+                while inicio < total:
+                    fim = min(inicio + tamanho, total)
+                    if fim < total:
+                        quebra = dados.rfind(b'\n', inicio, fim)
+                        fim = quebra + 1 if quebra >= 0 else (dados.find(b'\n', fim) + 1 or total)
+                    yield _decodificar(dados[inicio:fim])
+                    inicio = fim
+            return
+
+        resto = b''
         while True:
-            tok = lexer.token()
-            if not tok: break
-            tabela.append({"tipo": tok.type, "valor": tok.value, "linha": tok.lineno, "posicao": tok.lexpos})
+            bloco = f.read(tamanho)
+            if not bloco:
+                break
+            bloco = resto + bloco
+            quebra = bloco.rfind(b'\n')
+            if quebra < 0:
+                resto = bloco
+                continue
+            resto = bloco[quebra + 1:]
+            yield _decodificar(bloco[:quebra + 1])
+        if resto:
+            yield _decodificar(resto)
+
+
+def iterar_tokens(caminho, contexto=None, usar_mmap=True):
+    """
+    Versão em fluxo da análise léxica: gera os LexToken do arquivo à medida
+    que os trechos são lidos, sem carregar o arquivo nem a lista de tokens
+    inteiros na memória. Linhas e posições (lexpos) são as do arquivo todo,
+    iguais às de tokenizar(ler_codigo(caminho)); os erros léxicos vão para o contexto.
+    Se o limite de erros do contexto for atingido, o fluxo termina ali.
+    """
+    lexer = build_lexer(contexto)
+    try:
+        for trecho in ler_trechos(caminho, usar_mmap):
+            lexer.input(trecho)
+            for tok in lexer:
+                tok.lexpos += lexer.deslocamento
+                yield tok
+            lexer.deslocamento += len(trecho)
+    except LimiteDeErros:
+        return
+
+
+def tokenizar(data, contexto, linha=1, deslocamento=0):
+    """
+    Tokeniza o código uma única vez e retorna a lista de LexToken. Para um
+    trecho de um arquivo maior, linha e deslocamento são a linha e a posição
+    em que o trecho começa: linhas e posições saem como as do arquivo todo.
+    Se o limite de erros do contexto for atingido, retorna os tokens lidos até ali.
+    """
+    lexer = build_lexer(contexto)
+    lexer.lineno = linha
+    lexer.deslocamento = deslocamento
+    lexer.input(data)
+    tokens_lidos = []
+    try:
+        tokens_lidos.extend(lexer)
+    except LimiteDeErros:
+        pass
+    if deslocamento:
+        for tok in tokens_lidos:
+            tok.lexpos += deslocamento
+    return tokens_lidos
+
+
+def montar_tabela(tokens_lidos):
+    tabela = TabelaSimbolos()
+    for tok in tokens_lidos:
+        tabela.adicionar(tok.type, tok.value, tok.lineno, tok.lexpos)
+    return tabela
+
+
+def analisar_codigo(data, contexto=None):
+    """
+    Análise léxica de um código já lido.
+    Retorna (tabela_de_simbolos, erros_lexicos, tokens); os tokens podem ser
+    repassados a analisar_sintaxe para que o parser não tokenize de novo.
+    Cada chamada usa seu próprio contexto (um novo, se não for informado).
+    """
+    contexto = contexto or ContextoAnalise()
+    tokens_lidos = tokenizar(data, contexto)
+    contexto.tabela = montar_tabela(tokens_lidos)
+    return contexto.tabela, contexto.erros_lexicos, tokens_lidos
+
+
+def analisar_arquivo(caminho, contexto=None):
+    contexto = contexto or ContextoAnalise()
+    tabela = contexto.tabela
+    try:
+        tabela, _, _ = analisar_codigo(ler_codigo(caminho), contexto)
     except Exception as e:
         print(f"Erro: {e}")
-    return tabela, erros_lexicos
\ No newline at end of file
+    return tabela, contexto.erros_lexicos
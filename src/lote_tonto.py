@@ -0,0 +1,123 @@
+import os
+import glob
+import time
+import signal
+import multiprocessing
+
+RESUMO_LOTE = "resumo_lote.txt"
+
+
+class TempoEsgotado(Exception):
+    pass
+
+
+def _alarme(signum, frame):
+    raise TempoEsgotado()
+
+
+def listar_arquivos(padrao):
+    """
+    Resolve um diretório (busca recursiva por *.tonto) ou um padrão glob.
+    Retorna (arquivos ordenados, diretório base comum usado nas subpastas de saída).
+    """
+    if os.path.isdir(padrao):
+        arquivos = glob.glob(os.path.join(padrao, "**", "*.tonto"), recursive=True)
+        base = padrao
+    else:
+        arquivos = [a for a in glob.glob(padrao, recursive=True) if os.path.isfile(a)]
+        base = os.path.commonpath([os.path.dirname(os.path.abspath(a)) for a in arquivos]) if arquivos else ""
+    return sorted(arquivos), base
+
+
+def pasta_do_arquivo(caminho, base, pasta_saida):
+    """Subpasta de saída de um arquivo: caminho relativo à base, sem a extensão."""
+    relativo = os.path.relpath(os.path.abspath(caminho), os.path.abspath(base))
+    return os.path.join(pasta_saida, os.path.splitext(relativo)[0])
+
+
+def _executar(tarefa):
+    processar, caminho, pasta, tempo_limite = tarefa
+    # O limite é aplicado com SIGALRM dentro do próprio processo, o que
+    # interrompe o parser mesmo em laços puramente Python. Em plataformas
+    # sem setitimer (Windows) o arquivo roda sem limite.
+    usa_alarme = bool(tempo_limite) and hasattr(signal, "setitimer")
+    inicio = time.perf_counter()
+    if usa_alarme:
+        signal.signal(signal.SIGALRM, _alarme)
+        signal.setitimer(signal.ITIMER_REAL, tempo_limite)
+    try:
+        resultado = processar(caminho, pasta)
+        # Atingir o limite de erros (--max-errors) interrompe só este arquivo
+        resultado["status"] = "interrompido" if resultado.pop("interrompido", False) else "ok"
+    except TempoEsgotado:
+        resultado = {"status": "tempo_esgotado"}
+    except Exception as e:
+        resultado = {"status": "erro", "mensagem": str(e)}
+    finally:
+        if usa_alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    resultado["arquivo"] = caminho
+    resultado["pasta_saida"] = pasta
+    resultado["tempo"] = time.perf_counter() - inicio
+    return resultado
+
+
+def executar_lote(arquivos, base, pasta_saida, processar, jobs=1, tempo_limite=None, log=None):
+    """
+    Processa vários arquivos com processar(caminho, pasta) em um pool de processos.
+    Cada arquivo grava seus relatórios em uma subpasta própria de pasta_saida e o
+    resumo agregado vai para pasta_saida/resumo_lote.txt.
+    Retorna (resultados ordenados por arquivo, caminho do resumo).
+    """
+    tarefas = [(processar, a, pasta_do_arquivo(a, base, pasta_saida), tempo_limite) for a in arquivos]
+    resultados = []
+
+    def _registrar(resultado):
+        resultados.append(resultado)
+        if log:
+            status = "OK" if resultado["status"] == "ok" else resultado["status"].upper()
+            log(f"[{status}] {resultado['arquivo']} ({resultado['tempo']:.2f}s)")
+
+    if jobs <= 1 or len(tarefas) <= 1:
+        for tarefa in tarefas:
+            _registrar(_executar(tarefa))
+    else:
+        # Lotes maiores por worker reduzem o custo de comunicação entre processos
+        chunksize = max(1, len(tarefas) // (jobs * 4))
+        with multiprocessing.Pool(processes=jobs) as pool:
+            for resultado in pool.imap_unordered(_executar, tarefas, chunksize=chunksize):
+                _registrar(resultado)
+
+    resultados.sort(key=lambda r: r["arquivo"])
+    return resultados, salvar_resumo(resultados, pasta_saida)
+
+
+def salvar_resumo(resultados, pasta_saida):
+    os.makedirs(pasta_saida, exist_ok=True)
+    path = os.path.join(pasta_saida, RESUMO_LOTE)
+    colunas = ["tokens", "erros_lexicos", "erros_sintaticos", "padroes", "erros_semanticos"]
+    totais = {c: 0 for c in colunas}
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("=== RESUMO DA ANÁLISE EM LOTE ===\n\n")
+        f.write(f"{'Arquivo':<60} {'Status':<15} {'Tokens':>8} {'Léx':>5} {'Sint':>5} "
+                f"{'Padrões':>8} {'Sem':>5} {'Tempo(s)':>9}\n")
+        f.write('-' * 121 + '\n')
+        for r in resultados:
+            valores = [r.get(c, '-') for c in colunas]
+            for c in colunas:
+                totais[c] += r.get(c, 0)
+            f.write(f"{r['arquivo']:<60} {r['status']:<15} {valores[0]:>8} {valores[1]:>5} {valores[2]:>5} "
+                    f"{valores[3]:>8} {valores[4]:>5} {r['tempo']:>9.2f}\n")
+            if r.get("mensagem"):
+                f.write(f"    -> {r['mensagem']}\n")
+
+        falhas = sum(1 for r in resultados if r["status"] != "ok")
+        f.write(f"\nArquivos: {len(resultados)} (ok={len(resultados) - falhas}, falhas={falhas})\n")
+        f.write(f"Tokens: {totais['tokens']}\n")
+        f.write(f"Erros léxicos: {totais['erros_lexicos']}\n")
+        f.write(f"Erros sintáticos: {totais['erros_sintaticos']}\n")
+        f.write(f"Padrões identificados: {totais['padroes']}\n")
+        f.write(f"Erros semânticos: {totais['erros_semanticos']}\n")
+        f.write(f"Tempo total de processamento: {sum(r['tempo'] for r in resultados):.2f}s\n")
+    return path
@@ -0,0 +1,396 @@
+import os
+import sys
+import json
+import queue
+import bisect
+import threading
+from array import array
+
+from ast_tonto import nos_da_sintese
+from contexto_tonto import IndiceLinhas, nova_sintese, mesclar_sinteses
+from blocos_tonto import pontos_de_divisao, analisar_bloco
+from lexico_tonto import build_lexer
+from parser_tonto import construir_parser
+from semantico_tonto import verificar_semantica
+
+# Severidades do LSP
+ERRO, AVISO = 1, 2
+SINCRONIA_INCREMENTAL = 2
+# Códigos de erro do JSON-RPC 2.0
+ERRO_JSON, METODO_INEXISTENTE, ERRO_INTERNO = -32700, -32601, -32603
+
+
+def _unidades_utf16(trecho):
+    """Tamanho de `trecho` em unidades UTF-16, a medida de "character" no LSP."""
+    return len(trecho) if trecho.isascii() else len(trecho.encode('utf-16-le')) // 2
+
+
+# ================================================================
+# 1. TRANSPORTE (JSON-RPC sobre stdio)
+# ================================================================
+
+def ler_mensagem(entrada):
+    """
+    Lê uma mensagem com cabeçalho Content-Length; retorna None no fim da
+    entrada. ValueError se o cabeçalho ou o JSON forem inválidos.
+    """
+    tamanho = None
+    while True:
+        linha = entrada.readline()
+        if not linha:
+            return None
+        linha = linha.strip()
+        if not linha:
+            break
+        nome, _, valor = linha.decode('ascii').partition(':')
+        if nome.lower() == 'content-length':
+            tamanho = int(valor)
+    if tamanho is None:
+        return None
+    return json.loads(entrada.read(tamanho).decode('utf-8'))
+
+
+def escrever_mensagem(saida, mensagem):
+    corpo = json.dumps(mensagem, ensure_ascii=False).encode('utf-8')
+    saida.write(f"Content-Length: {len(corpo)}\r\n\r\n".encode('ascii') + corpo)
+    saida.flush()
+
+
+# ================================================================
+# 2. DOCUMENTOS E ANÁLISE INCREMENTAL
+# ================================================================
+
+def _posicao_relativa(texto, deslocamento):
+    """(linha, caractere UTF-16), a partir de 0, de `deslocamento` dentro de `texto`."""
+    inicio_linha = texto.rfind('\n', 0, deslocamento) + 1
+    return texto.count('\n', 0, inicio_linha), _unidades_utf16(texto[inicio_linha:deslocamento])
+
+
+def _diagnostico(intervalo, linha, severidade, origem, mensagem):
+    """Diagnóstico do LSP para um intervalo relativo a um trecho que começa em `linha`."""
+    linha_inicio, caractere_inicio, linha_fim, caractere_fim = intervalo
+    return {
+        "range": {"start": {"line": linha + linha_inicio, "character": caractere_inicio},
+                  "end": {"line": linha + linha_fim, "character": caractere_fim}},
+        "severity": severidade,
+        "source": origem,
+        "message": mensagem,
+    }
+
+
+class ResultadoBloco:
+    """
+    Análise de um trecho de topo. Um trecho sempre começa no início de uma
+    linha, então os diagnósticos e avisos ficam com linha e caractere relativos
+    a ele e só recebem a linha do trecho ao serem publicados: continuam valendo
+    quando o trecho (reaproveitado) muda de lugar. posicionar() leva os nós da
+    síntese para onde o trecho está, antes de rodar o semântico.
+    """
+
+    def __init__(self, texto):
+        contexto, _ = analisar_bloco(texto)
+        self.texto = texto
+        self.sintese = contexto.sintese
+        self.diagnosticos = []
+        for d in contexto.diagnosticos:
+            if d["posicao"] is None:
+                intervalo = self.intervalo(len(texto), 0)
+            else:
+                intervalo = self.intervalo(d["posicao"], d["tamanho"])
+            self.diagnosticos.append((intervalo, f"tonto-{d['etapa']}", d["mensagem"]))
+        # Avisos do último semântico que caíram neste trecho
+        self.avisos = []
+        self.nos = []
+        pendentes = list(nos_da_sintese(self.sintese))
+        while pendentes:
+            no = pendentes.pop()
+            if no.linha is not None:
+                self.nos.append((no, no.linha, no.inicio, no.fim))
+            pendentes.extend(no.filhos())
+        self._nos_em = (0, 1)
+
+    def intervalo(self, posicao, tamanho):
+        return _posicao_relativa(self.texto, posicao) + _posicao_relativa(self.texto, posicao + tamanho)
+
+    def posicionar(self, deslocamento, linha):
+        if (deslocamento, linha) == self._nos_em:
+            return
+        for no, linha_no, inicio, fim in self.nos:
+            no.linha, no.inicio, no.fim = linha_no + linha - 1, inicio + deslocamento, fim + deslocamento
+        self._nos_em = (deslocamento, linha)
+
+
+class Documento:
+    """
+    Texto aberto no editor, com o índice das linhas e a divisão em trechos de
+    topo mantidos a cada mudança: uma edição refaz só as linhas e os trechos
+    em volta do intervalo editado, e os seguintes são apenas deslocados.
+    """
+
+    def __init__(self, uri, texto, versao):
+        self.uri = uri
+        self.versao = versao
+        self.texto = ""
+        self.linhas = IndiceLinhas()
+        # Início, texto e análise (None até a próxima diagnosticar()) de cada trecho
+        self.inicios_trechos = array('Q', (0,))
+        self.trechos = [""]
+        self.blocos = [None]
+        # Sínteses dos trechos usadas no último semântico; os avisos ficam nos
+        # trechos e só precisam ser refeitos se o modelo mudou ou se um trecho
+        # com avisos foi trocado
+        self.sinteses_semantico = None
+        self.avisos_sem_posicao = []
+        self.avisos_perdidos = False
+        self._substituir(0, 0, texto)
+
+    def _deslocamento(self, posicao):
+        """(linha, caractere UTF-16) do LSP, ambos a partir de 0, para deslocamento no texto."""
+        inicios = self.linhas.inicios
+        if posicao['line'] >= len(inicios):
+            return len(self.texto)
+        inicio = inicios[posicao['line']]
+        fim_linha = inicios[posicao['line'] + 1] - 1 if posicao['line'] + 1 < len(inicios) else len(self.texto)
+        linha = self.texto[inicio:fim_linha]
+        if linha.isascii():
+            return min(inicio + posicao['character'], fim_linha)
+        unidades = 0
+        for i, caractere in enumerate(linha):
+            if unidades >= posicao['character']:
+                return inicio + i
+            unidades += 2 if ord(caractere) > 0xFFFF else 1
+        return fim_linha
+
+    def aplicar(self, mudanca):
+        if 'range' not in mudanca:
+            self._substituir(0, len(self.texto), mudanca['text'])
+            return
+        inicio = self._deslocamento(mudanca['range']['start'])
+        fim = max(inicio, self._deslocamento(mudanca['range']['end']))
+        self._substituir(inicio, fim, mudanca['text'])
+
+    def _substituir(self, inicio, fim, texto):
+        """
+        Troca texto[inicio:fim] e refaz a divisão em trechos em volta da troca.
+        A varredura retoma no trecho anterior ao editado (a edição pode ter
+        apagado a declaração que abria o trecho) e para no primeiro ponto,
+        depois da edição, que já era um ponto antes dela: dali em diante o
+        texto e o estado da varredura são os mesmos, e os trechos seguintes só
+        são deslocados.
+        """
+        self.texto = self.texto[:inicio] + texto + self.texto[fim:]
+        self.linhas.substituir(inicio, fim, texto)
+
+        pontos = self.inicios_trechos
+        delta = len(texto) - (fim - inicio)
+        fim_editado = inicio + len(texto)
+        primeiro = max(bisect.bisect_right(pontos, inicio) - 2, 0)
+        retomada, fim_regiao = len(pontos), len(self.texto)
+        novos = []
+        linha = self.linhas.posicao(pontos[primeiro])[0]
+        for ponto, _ in pontos_de_divisao(self.texto, pontos[primeiro], linha):
+            if ponto >= fim_editado:
+                i = bisect.bisect_left(pontos, ponto - delta)
+                if i < len(pontos) and pontos[i] == ponto - delta:
+                    retomada, fim_regiao = i, ponto
+                    break
+            novos.append(ponto)
+
+        # Trechos refeitos com o mesmo texto (ex.: a edição só moveu um ponto
+        # de divisão) reaproveitam a análise
+        anteriores = {bloco.texto: bloco for bloco in self.blocos[primeiro:retomada] if bloco is not None}
+        trechos = [self.texto[a:b] for a, b in zip(novos, novos[1:] + [fim_regiao])]
+        self.trechos[primeiro:retomada] = trechos
+        self.blocos[primeiro:retomada] = [anteriores.pop(trecho, None) for trecho in trechos]
+        if any(bloco.avisos for bloco in anteriores.values()):
+            self.avisos_perdidos = True
+        novos = array('Q', novos)
+        novos.extend(map(delta.__add__, pontos[retomada:]))
+        pontos[primeiro:] = novos
+
+    def diagnosticar(self):
+        """
+        Analisa os trechos novos ou editados (os demais já estão analisados)
+        e, se o modelo mudou, mescla as sínteses e roda o semântico no modelo
+        inteiro. Retorna a lista de diagnósticos no formato do LSP.
+        """
+        for i, bloco in enumerate(self.blocos):
+            if bloco is None:
+                self.blocos[i] = ResultadoBloco(self.trechos[i])
+
+        # Edição só em comentários/espaços ou ainda sem efeito na síntese: o
+        # modelo não mudou e os avisos do semântico continuam valendo. A
+        # comparação das listas para nos trechos não trocados (mesmo objeto)
+        sinteses = [bloco.sintese for bloco in self.blocos]
+        if self.avisos_perdidos or sinteses != self.sinteses_semantico:
+            self._analisar_semantica()
+            self.sinteses_semantico = sinteses
+            self.avisos_perdidos = False
+
+        diagnosticos = []
+        avisos = [_diagnostico((0, 0, 0, 0), 0, AVISO, "tonto-semantico", mensagem)
+                  for mensagem in self.avisos_sem_posicao]
+        for deslocamento, bloco in zip(self.inicios_trechos, self.blocos):
+            if bloco.diagnosticos or bloco.avisos:
+                linha = self.linhas.posicao(deslocamento)[0] - 1
+                for intervalo, origem, mensagem in bloco.diagnosticos:
+                    diagnosticos.append(_diagnostico(intervalo, linha, ERRO, origem, mensagem))
+                for intervalo, mensagem in bloco.avisos:
+                    avisos.append(_diagnostico(intervalo, linha, AVISO, "tonto-semantico", mensagem))
+        return diagnosticos + avisos
+
+    def _analisar_semantica(self):
+        """
+        Roda o semântico na síntese do documento, com os nós posicionados
+        onde os trechos estão, e guarda cada aviso no trecho em que caiu.
+        """
+        sintese = nova_sintese()
+        for deslocamento, bloco in zip(self.inicios_trechos, self.blocos):
+            mesclar_sinteses(sintese, bloco.sintese)
+            bloco.posicionar(deslocamento, self.linhas.posicao(deslocamento)[0])
+            bloco.avisos = []
+        self.avisos_sem_posicao = []
+
+        diagnosticos_semanticos = []
+        verificar_semantica(sintese, diagnosticos_semanticos)
+        for d in diagnosticos_semanticos:
+            if d["posicao"] is None:
+                self.avisos_sem_posicao.append(d["mensagem"])
+                continue
+            i = bisect.bisect_right(self.inicios_trechos, d["posicao"]) - 1
+            bloco = self.blocos[i]
+            bloco.avisos.append((bloco.intervalo(d["posicao"] - self.inicios_trechos[i], d["tamanho"]), d["mensagem"]))
+
+
+# ================================================================
+# 3. SERVIDOR
+# ================================================================
+
+class ServidorTonto:
+    def __init__(self, entrada, saida):
+        self.entrada = entrada
+        self.saida = saida
+        self.documentos = {}
+        self.sujos = set()
+        self.encerrando = False
+
+    def _responder(self, id_mensagem, resultado=None, erro=None):
+        resposta = {"jsonrpc": "2.0", "id": id_mensagem}
+        if erro:
+            resposta["error"] = erro
+        else:
+            resposta["result"] = resultado
+        escrever_mensagem(self.saida, resposta)
+
+    def _publicar(self, uri):
+        documento = self.documentos.get(uri)
+        if documento is None:
+            return
+        escrever_mensagem(self.saida, {
+            "jsonrpc": "2.0",
+            "method": "textDocument/publishDiagnostics",
+            "params": {"uri": uri, "version": documento.versao, "diagnostics": documento.diagnosticar()},
+        })
+
+    def tratar(self, mensagem):
+        """Trata uma mensagem; retorna False quando o servidor deve sair."""
+        metodo = mensagem.get("method")
+        params = mensagem.get("params") or {}
+
+        if metodo == "initialize":
+            self._responder(mensagem["id"], {
+                "capabilities": {"textDocumentSync": {"openClose": True, "change": SINCRONIA_INCREMENTAL}},
+                "serverInfo": {"name": "tonto-lsp"},
+            })
+        elif metodo == "shutdown":
+            self.encerrando = True
+            self._responder(mensagem["id"], None)
+        elif metodo == "exit":
+            return False
+        elif metodo == "textDocument/didOpen":
+            doc = params["textDocument"]
+            self.documentos[doc["uri"]] = Documento(doc["uri"], doc["text"], doc.get("version"))
+            self.sujos.add(doc["uri"])
+        elif metodo == "textDocument/didChange":
+            documento = self.documentos.get(params["textDocument"]["uri"])
+            if documento is not None:
+                for mudanca in params["contentChanges"]:
+                    documento.aplicar(mudanca)
+                documento.versao = params["textDocument"].get("version")
+                self.sujos.add(documento.uri)
+        elif metodo == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.documentos.pop(uri, None)
+            self.sujos.discard(uri)
+            escrever_mensagem(self.saida, {
+                "jsonrpc": "2.0", "method": "textDocument/publishDiagnostics",
+                "params": {"uri": uri, "diagnostics": []},
+            })
+        elif "id" in mensagem:
+            self._responder(mensagem["id"], erro={"code": METODO_INEXISTENTE,
+                                                  "message": f"Método não suportado: {metodo}"})
+        return True
+
+    def _falhou(self, mensagem, erro):
+        """Uma mensagem que quebrou o tratamento: erro interno para pedidos, registro em stderr para notificações."""
+        metodo = mensagem.get("method") if isinstance(mensagem, dict) else None
+        print(f"tonto-lsp: erro ao tratar {metodo or 'mensagem'}: {type(erro).__name__}: {erro}", file=sys.stderr)
+        if isinstance(mensagem, dict) and mensagem.get("id") is not None and metodo is not None:
+            self._responder(mensagem["id"], erro={"code": ERRO_INTERNO, "message": f"{type(erro).__name__}: {erro}"})
+
+    def executar(self):
+        # Tabelas do lexer/parser prontas antes da primeira tecla
+        construir_parser()
+        build_lexer()
+
+        fila = queue.Queue()
+
+        def _ler():
+            while True:
+                try:
+                    mensagem = ler_mensagem(self.entrada)
+                except ValueError as erro:
+                    # Mensagem ilegível: vai para a fila como o próprio erro
+                    fila.put(erro)
+                    continue
+                fila.put(mensagem)
+                if mensagem is None:
+                    return
+
+        threading.Thread(target=_ler, daemon=True).start()
+
+        while True:
+            # Só analisa quando não há mensagens pendentes: uma rajada de teclas
+            # que chegou durante a análise anterior vira uma única reanálise
+            if self.sujos and fila.empty():
+                for uri in sorted(self.sujos):
+                    try:
+                        self._publicar(uri)
+                    except Exception as erro:
+                        print(f"tonto-lsp: erro ao analisar {uri}: {type(erro).__name__}: {erro}", file=sys.stderr)
+                self.sujos.clear()
+                continue
+            mensagem = fila.get()
+            if mensagem is None:
+                break
+            if isinstance(mensagem, ValueError):
+                self._responder(None, erro={"code": ERRO_JSON, "message": f"Mensagem inválida: {mensagem}"})
+                continue
+            try:
+                if not self.tratar(mensagem):
+                    break
+            except Exception as erro:
+                self._falhou(mensagem, erro)
+        return 0 if self.encerrando else 1
+
+
+def main():
+    codigo = ServidorTonto(sys.stdin.buffer, sys.stdout.buffer).executar()
+    # A thread de leitura ainda está bloqueada em stdin: um encerramento normal
+    # do interpretador abortaria ao tentar fechar esse buffer
+    sys.stdout.flush()
+    os._exit(codigo)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,64 +1,244 @@
+import io
 import os
-import csv
+import sys
 import argparse
-from lexico_tonto import analisar_arquivo
-from parser_tonto import analisar_sintaxe
-# Importa a nova função (o arquivo semantico_tonto.py deve existir na mesma pasta)
-from semantico_tonto import verificar_semantica 
-
-def salvar_lexico(tabela, erros, pasta_raiz):
-    pasta_lexico = os.path.join(pasta_raiz, "lexico")
-    os.makedirs(pasta_lexico, exist_ok=True)
-
-    txt_path = os.path.join(pasta_lexico, "tabela_de_simbolos.txt")
-    with open(txt_path, 'w', encoding='utf-8') as f:
-        f.write(f"{'Tipo':<25} {'Valor':<30} {'Linha':<10} {'Posição':<10}\n")
-        f.write('-' * 80 + '\n')
-        for s in tabela:
-            f.write(f"{s['tipo']:<25} {repr(s['valor']):<30} {s['linha']:<10} {s['posicao']:<10}\n")
-
-    csv_path = os.path.join(pasta_lexico, "tabela_de_simbolos.csv")
-    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['tipo', 'valor', 'linha', 'posicao'])
-        writer.writeheader()
-        writer.writerows(tabela)
-
-    html_path = os.path.join(pasta_lexico, "tabela_de_simbolos.html")
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write("<html><head><meta charset='utf-8'><title>Tabela de Símbolos</title></head><body>")
-        f.write("<h2>Tabela de Símbolos</h2><table border='1' cellspacing='0' cellpadding='5'>")
-        f.write("<tr><th>Tipo</th><th>Valor</th><th>Linha</th><th>Posição</th></tr>")
-        for s in tabela:
-            f.write(f"<tr><td>{s['tipo']}</td><td>{s['valor']}</td><td>{s['linha']}</td><td>{s['posicao']}</td></tr>")
-        f.write("</table></body></html>")
-
-    erro_path = os.path.join(pasta_lexico, "erros_lexicos.txt")
-    with open(erro_path, 'w', encoding='utf-8') as f:
+import functools
+import itertools
+from lexico_tonto import ler_codigo, analisar_codigo, build_lexer, iterar_tokens, ArquivoNaoTexto, BACKENDS
+from contexto_tonto import ContextoAnalise, TabelaSimbolos
+from saida_tonto import Saida, FORMATOS, ler_formatos
+from perfil_tonto import SEM_PERFIL, ARQUIVO_PERFIL
+# parser_tonto (ply.yacc), semantico_tonto, csv e json são importados só nas
+# funções que os usam: uma análise só léxica (--stages lex) não os carrega.
+# Também cache_tonto (pickle, hashlib) só vem quando o cache é usado (ver
+# _criar_cache) e Perfil (tracemalloc, cProfile) só com --profile; gzip e
+# tempfile, só quando saida_tonto grava um relatório.
+
+# Etapas da análise (--stages), na ordem em que são executadas, e a etapa dos diagnósticos de cada uma
+ETAPAS = ("lex", "parse", "sem")
+ETAPA_DIAGNOSTICO = {"lex": "lexico", "parse": "sintatico", "sem": "semantico"}
+
+
+def ler_etapas(texto):
+    """'lex,parse' -> ('lex', 'parse'), na ordem de ETAPAS; ValueError se houver etapa desconhecida."""
+    pedidas = {e.strip().lower() for e in texto.split(",") if e.strip()}
+    desconhecidas = pedidas - set(ETAPAS)
+    if desconhecidas or not pedidas:
+        raise ValueError(f"etapas inválidas: {', '.join(sorted(desconhecidas)) or texto!r} "
+                         f"(use {', '.join(ETAPAS)})")
+    return tuple(e for e in ETAPAS if e in pedidas)
+
+
+class EscritorLexico:
+    """
+    Grava a tabela de símbolos nos formatos pedidos (txt, csv e/ou html) numa
+    única passada: as linhas são agrupadas em lotes e cada lote é formatado e
+    repassado de uma vez a todos os formatos, o que serve tanto para uma
+    tabela pronta quanto para um fluxo de tokens que não cabe na memória. Os
+    arquivos só aparecem (atomicamente) em fechar(), junto com os erros
+    léxicos, acumulados até o fim do fluxo.
+    """
+
+    LOTE = 8192
+
+    def __init__(self, pasta_raiz, formatos=FORMATOS, comprimir=False, linhas=None):
+        self.pasta = os.path.join(pasta_raiz, "lexico")
+        self.comprimir = comprimir
+        self.linhas = linhas
+        self._saidas = []
+        self._gravadores = []
+        self._pendentes = []
+        self._html = None
+
+        if "txt" in formatos:
+            self._txt = self._abrir("tabela_de_simbolos.txt")
+            self._txt.write(f"{'Tipo':<25} {'Valor':<30} {'Linha':<10} {'Coluna':<10} {'Posição':<10} {'Fim':<10}\n")
+            self._txt.write('-' * 102 + '\n')
+            self._gravadores.append(self._lote_txt)
+        if "csv" in formatos:
+            self._csv = self._abrir("tabela_de_simbolos.csv", newline='')
+            self._csv.write("tipo,valor,linha,coluna,posicao,fim\r\n")
+            self._gravadores.append(self._lote_csv)
+        if "html" in formatos:
+            self._html = self._abrir("tabela_de_simbolos.html")
+            self._html.write("<html><head><meta charset='utf-8'><title>Tabela de Símbolos</title></head><body>")
+            self._html.write("<h2>Tabela de Símbolos</h2><table border='1' cellspacing='0' cellpadding='5'>")
+            self._html.write("<tr><th>Tipo</th><th>Valor</th><th>Linha</th><th>Coluna</th><th>Posição</th><th>Fim</th></tr>")
+            self._gravadores.append(self._lote_html)
+
+    def _abrir(self, nome, newline=None):
+        saida = Saida(os.path.join(self.pasta, nome), self.comprimir, newline)
+        self._saidas.append(saida)
+        return saida
+
+    def _lote_txt(self, lote):
+        self._txt.write("".join([f"{tipo:<25} {repr(valor):<30} {linha:<10} {coluna:<10} {posicao:<10} {fim:<10}\n"
+                                 for tipo, valor, linha, coluna, posicao, fim in lote]))
+
+    def _lote_csv(self, lote):
+        import csv
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(lote)
+        self._csv.write(buffer.getvalue())
+
+    def _lote_html(self, lote):
+        self._html.write("".join([f"<tr><td>{tipo}</td><td>{valor}</td><td>{linha}</td><td>{coluna}</td>"
+                                  f"<td>{posicao}</td><td>{fim}</td></tr>"
+                                  for tipo, valor, linha, coluna, posicao, fim in lote]))
+
+    def _com_colunas(self, lote):
+        """
+        (tipo, valor, linha, coluna, posicao, fim) de cada token do lote: a
+        coluna vem do índice de linhas (sem ele, fica em branco) e fim é a
+        posição logo após o lexema.
+        """
+        if self.linhas is None:
+            return [(tipo, valor, linha, '', posicao, posicao + len(str(valor)))
+                    for tipo, valor, linha, posicao in lote]
+        inicios, primeira = self.linhas.inicios, self.linhas.primeira_linha
+        return [(tipo, valor, linha, posicao - inicios[linha - primeira] + 1, posicao, posicao + len(str(valor)))
+                for tipo, valor, linha, posicao in lote]
+
+    def _gravar(self, lote):
+        lote = self._com_colunas(lote)
+        for gravar in self._gravadores:
+            gravar(lote)
+
+    def escrever(self, tipo, valor, linha, posicao):
+        self._pendentes.append((tipo, valor, linha, posicao))
+        if len(self._pendentes) >= self.LOTE:
+            self._gravar(self._pendentes)
+            self._pendentes = []
+
+    def escrever_linhas(self, linhas):
+        """Grava um iterável de (tipo, valor, linha, posicao), lote a lote."""
+        linhas = iter(linhas)
+        while True:
+            lote = list(itertools.islice(linhas, self.LOTE))
+            if not lote:
+                break
+            self._gravar(lote)
+
+    def fechar(self, erros):
+        if self._pendentes:
+            self._gravar(self._pendentes)
+            self._pendentes = []
+        if self._html is not None:
+            self._html.write("</table></body></html>")
+
+        erro = self._abrir("erros_lexicos.txt")
         if erros:
-            f.write("--- Erros Léxicos Encontrados ---\n")
+            erro.write("--- Erros Léxicos Encontrados ---\n")
             for e in erros:
-                f.write(e + "\n")
+                erro.write(e + "\n")
+        else:
+            erro.write("Nenhum erro léxico encontrado.\n")
+        return [saida.confirmar() for saida in self._saidas]
+
+    def descartar(self):
+        for saida in self._saidas:
+            saida.descartar()
+
+
+def salvar_lexico(tabela, erros, pasta_raiz, formatos=FORMATOS, comprimir=False, linhas=None):
+    """
+    tabela: TabelaSimbolos ou qualquer iterável de (tipo, valor, linha, posicao);
+    linhas: o IndiceLinhas do código, de onde saem as colunas dos tokens.
+    """
+    escritor = EscritorLexico(pasta_raiz, formatos, comprimir, linhas)
+    try:
+        escritor.escrever_linhas(tabela.linhas() if isinstance(tabela, TabelaSimbolos) else tabela)
+    except BaseException:
+        escritor.descartar()
+        raise
+    return escritor.fechar(erros)
+
+
+# Saídas para ferramentas (--format), em vez dos relatórios de texto
+FORMATOS_MAQUINA = ("json", "ndjson")
+
+
+class EscritorJson:
+    """
+    Saída para ferramentas (--format json|ndjson): registros JSON com campo
+    "registro", gravados à medida que a análise os produz:
+    - "declaracao": cada declaração de topo assim que o parser a reduz (o nó
+      da AST em como_dict(), com o tipo do nó em "no" e a posição em "span");
+    - "diagnostico": código estável (CODIGOS_DIAGNOSTICO), severidade, etapa,
+      arquivo, linha e coluna de início e de fim (a partir de 1, fim
+      exclusivo), posição, tamanho e mensagem;
+    - "resumo", por último: pacotes, imports, padrões e contagens.
+    Com ndjson, um registro por linha; com json, os mesmos registros em um
+    único documento {"registros": [...]}. A saída é descarregada ao fim de
+    cada etapa. Só são gravados os diagnósticos das `etapas` pedidas (--stages).
+    """
+
+    def __init__(self, formato, arquivo, contexto, saida=None, etapas=ETAPAS):
+        from json import dumps
+        self._dumps = dumps
+        self.ndjson = formato == "ndjson"
+        self.arquivo = arquivo
+        self.etapas = {ETAPA_DIAGNOSTICO[e] for e in etapas}
+        self.contexto = contexto
+        self.saida = saida or sys.stdout
+        self._gravados = 0
+        self._vazio = True
+        if not self.ndjson:
+            self.saida.write('{"registros": [\n')
+
+    def _gravar(self, registro):
+        texto = self._dumps(registro, ensure_ascii=False)
+        if self.ndjson:
+            self.saida.write(texto + "\n")
         else:
-            f.write("Nenhum erro léxico encontrado.\n")
+            self.saida.write(texto if self._vazio else ",\n" + texto)
+        self._vazio = False
+
+    def diagnosticos(self):
+        """Grava os diagnósticos registrados no contexto desde a última chamada e descarrega a saída."""
+        diagnosticos = self.contexto.diagnosticos
+        for d in itertools.islice(diagnosticos, self._gravados, None):
+            if d["etapa"] not in self.etapas:
+                continue
+            self._gravar({"registro": "diagnostico", "codigo": d["codigo"], "severidade": d["severidade"],
+                          "etapa": d["etapa"], "arquivo": self.arquivo, "linha": d["linha"],
+                          "coluna": d["coluna"], "linha_fim": d["linha_fim"], "coluna_fim": d["coluna_fim"],
+                          "posicao": d["posicao"], "tamanho": d["tamanho"], "mensagem": d["mensagem"]})
+        self._gravados = len(diagnosticos)
+        self.saida.flush()
 
-    return txt_path, csv_path, html_path, erro_path
+    def declaracao(self, no):
+        """Ouvinte de analisar_sintaxe: grava os diagnósticos anteriores à declaração e a declaração."""
+        if len(self.contexto.diagnosticos) > self._gravados:
+            self.diagnosticos()
+        self._gravar({"registro": "declaracao", **no.como_dict()})
 
+    def fechar(self, tokens):
+        self.diagnosticos()
+        contexto = self.contexto
+        self._gravar({"registro": "resumo", "arquivo": self.arquivo, "pacotes": contexto.sintese["pacotes"],
+                      "imports": contexto.sintese["imports"], "padroes": contexto.padroes, "tokens": tokens,
+                      "erros_lexicos": len(contexto.erros_lexicos),
+                      "erros_sintaticos": len(contexto.erros_sintaticos),
+                      "erros_semanticos": len(contexto.erros_semanticos), **_contar_sintese(contexto.sintese)})
+        if not self.ndjson:
+            self.saida.write("\n]}\n")
+        self.saida.flush()
 
-def salvar_sintatico(sintese, erros, pasta_raiz):
+
+def salvar_sintatico(sintese, erros, pasta_raiz, comprimir=False):
     pasta_sintatico = os.path.join(pasta_raiz, "sintatico")
-    os.makedirs(pasta_sintatico, exist_ok=True)
 
-    erro_path = os.path.join(pasta_sintatico, "erros_sintaticos.txt")
-    with open(erro_path, 'w', encoding='utf-8') as f:
+    with Saida(os.path.join(pasta_sintatico, "erros_sintaticos.txt"), comprimir) as f:
         if erros:
             f.write("--- Erros Sintáticos Encontrados ---\n")
             for e in erros:
                 f.write(e + "\n")
         else:
             f.write("Nenhum erro sintático encontrado.\n")
+    erro_path = f.caminho
 
-    sintese_path = os.path.join(pasta_sintatico, "sintese_sintatica.txt")
-    with open(sintese_path, 'w', encoding='utf-8') as f:
+    with Saida(os.path.join(pasta_sintatico, "sintese_sintatica.txt"), comprimir) as f:
         f.write("--- Tabela de Síntese Sintática ---\n\n")
 
         f.write(f"Pacotes: {len(sintese['pacotes'])}\n")
@@ -66,50 +246,43 @@ def salvar_sintatico(sintese, erros, pasta_raiz):
             f.write(f"  - {p}\n")
 
         f.write(f"\nClasses encontradas: {len(sintese['classes'])}\n")
-        for name, meta in sintese['classes'].items():
-            num_attrs = len(meta.get('atributos', []))
-            # Ajuste para lidar com a nova estrutura de relacoes_internas (tupla com dict)
-            rels_int = meta.get('relacoes_internas', [])
-            num_rels_int = len(rels_int)
+        for name, classe in sintese['classes'].items():
+            num_attrs = len(classe.atributos)
+            num_rels_int = len(classe.relacoes_internas)
 
             f.write(
-                f"  - {name} (estereótipo={meta.get('estereotipo')}), atributos={num_attrs}, relacoes_internas={num_rels_int}\n")
+                f"  - {name} (estereótipo={classe.estereotipo}), atributos={num_attrs}, relacoes_internas={num_rels_int}\n")
 
-            if num_rels_int > 0:
-                 for item in rels_int:
-                     dados = item[1]
-                     f.write(f"    -> Relação Interna: {dados.get('raw')}\n")
+            for relacao in classe.relacoes_internas:
+                f.write(f"    -> Relação Interna: {relacao.descricao}\n")
 
         f.write(f"\nTipos (DataTypes): {len(sintese['tipos'])}\n")
-        for tname, attrs in sintese['tipos'].items():
-            if isinstance(attrs, dict) and "especializa" in attrs:
-                f.write(f"  - {tname} (especializa={attrs['especializa']})\n")
+        for tname, tipo in sintese['tipos'].items():
+            if tipo.especializa is not None:
+                f.write(f"  - {tname} (especializa={tipo.especializa})\n")
             else:
-                num_attrs = len(attrs) if isinstance(attrs, list) else 0
-                f.write(f"  - {tname} (atributos={num_attrs})\n")
+                f.write(f"  - {tname} (atributos={len(tipo.atributos)})\n")
 
         f.write(f"\nEnums: {len(sintese['enums'])}\n")
-        for en, items in sintese['enums'].items():
-            f.write(f"  - {en}: {', '.join(items)}\n")
+        for en, enum in sintese['enums'].items():
+            f.write(f"  - {en}: {', '.join(enum.itens)}\n")
 
         f.write(f"\nGeneralizações: {len(sintese['generalizacoes'])}\n")
         for g in sintese['generalizacoes']:
-            mod_str = f" [{', '.join(g.get('modifiers', []))}]" if g.get('modifiers') else ""
-            f.write(f"  - {g['nome']} ({g.get('general')} -> {g.get('specifics')}){mod_str}\n")
+            mod_str = f" [{', '.join(g.modificadores)}]" if g.modificadores else ""
+            f.write(f"  - {g.nome} ({g.geral} -> {g.especificos}){mod_str}\n")
 
         f.write(f"\nRelações externas: {len(sintese['relacoes_externas'])}\n")
         for r in sintese['relacoes_externas']:
-            desc = r.get('raw', 'relação externa detalhe indisponível')
-            f.write(f"  - {desc}\n")
+            f.write(f"  - {r.descricao}\n")
+    sintese_path = f.caminho
 
     return sintese_path, erro_path
 
-def salvar_semantico(padroes, erros, pasta_raiz):
+def salvar_semantico(padroes, erros, pasta_raiz, comprimir=False):
     pasta_sem = os.path.join(pasta_raiz, "semantico")
-    os.makedirs(pasta_sem, exist_ok=True)
-    
-    path = os.path.join(pasta_sem, "relatorio_semantico.txt")
-    with open(path, 'w', encoding='utf-8') as f:
+
+    with Saida(os.path.join(pasta_sem, "relatorio_semantico.txt"), comprimir) as f:
         f.write("=== RELATÓRIO DE ANÁLISE SEMÂNTICA (ODPs) ===\n\n")
         
         f.write("1. PADRÕES IDENTIFICADOS:\n")
@@ -125,39 +298,514 @@ def salvar_semantico(padroes, erros, pasta_raiz):
                 f.write(f"   [!] {e}\n")
         else:
             f.write("   Nenhum erro semântico de padrão encontrado.\n")
-    return path
+    return f.caminho
+
+
+def salvar_projeto(resultado, pasta_raiz, comprimir=False):
+    pasta_proj = os.path.join(pasta_raiz, "projeto")
+
+    with Saida(os.path.join(pasta_proj, "relatorio_projeto.txt"), comprimir) as f:
+        f.write("=== RELATÓRIO DO PROJETO (IMPORTS) ===\n\n")
+
+        def escrever_modulos(nomes):
+            for nome in nomes:
+                modulo = resultado.modulos[nome]
+                imports = f" (importa: {', '.join(modulo.imports)})" if modulo.imports else ""
+                f.write(f"   - {nome} [{modulo.caminho}]{imports}\n")
+
+        f.write(f"1. MÓDULOS EM ORDEM TOPOLÓGICA: {len(resultado.ordem)}\n")
+        escrever_modulos(resultado.ordem)
+
+        f.write(f"\n2. MÓDULOS EM CICLO / DEPENDENTES DE CICLO (sem ordem topológica): {len(resultado.em_ciclo)}\n")
+        if resultado.em_ciclo:
+            escrever_modulos(resultado.em_ciclo)
+        else:
+            f.write("   Nenhum.\n")
+
+        f.write("\n3. CICLOS DE IMPORT:\n")
+        if resultado.ciclos:
+            for ciclo in resultado.ciclos:
+                f.write(f"   [!] {' <-> '.join(ciclo)}\n")
+        else:
+            f.write("   Nenhum ciclo encontrado.\n")
+
+        f.write("\n4. MÓDULOS AUSENTES:\n")
+        if resultado.ausentes:
+            for origem, nome in resultado.ausentes:
+                f.write(f"   [!] '{nome}' importado por '{origem}' não foi encontrado.\n")
+        else:
+            f.write("   Todos os imports foram resolvidos.\n")
+
+        f.write("\n5. OUTROS PROBLEMAS:\n")
+        if resultado.erros_projeto:
+            for e in resultado.erros_projeto:
+                f.write(f"   [!] {e}\n")
+        else:
+            f.write("   Nenhum.\n")
+    return f.caminho
+
+
+# Arquivos a partir deste tamanho são analisados em fluxo
+LIMITE_FLUXO_MB = 64
 
 
-def main(caminho_arquivo, pasta_saida):
+def _silencioso(*args, **kwargs):
+    pass
+
+
+LOG_INTERROMPIDA = "[SEMÂNTICO] Não executado: a análise foi interrompida pelo limite de erros (--max-errors)."
+
+
+def _contar_sintese(sintese):
+    contagens = {chave: len(sintese[chave]) for chave in ("classes", "tipos", "enums", "generalizacoes",
+                                                          "relacoes_externas")}
+    contagens["declaracoes"] = sum(contagens.values())
+    return contagens
+
+
+def processar_arquivo_fluxo(caminho_arquivo, pasta_saida, log=_silencioso, formatos=FORMATOS, comprimir=False,
+                            lexer="ply", perfil=SEM_PERFIL, etapas=ETAPAS, limite_erros=None):
+    """
+    Como processar_arquivo, mas sem carregar o arquivo nem a lista de tokens:
+    cada token lido (via mmap, em trechos) é gravado na tabela de símbolos e
+    repassado ao parser na mesma passada. A memória fica limitada à síntese.
+    Léxico, sintático e a tabela de símbolos formam uma única etapa no perfil.
+    """
+    contexto = ContextoAnalise(lexer, limite_erros)
+    sintatica = "parse" in etapas or "sem" in etapas
+    if sintatica:
+        from parser_tonto import analisar_sintaxe, construir_parser
+        with perfil.etapa("tabelas_parser"):
+            construir_parser()
+    escritor = EscritorLexico(pasta_saida, formatos, comprimir, contexto.linhas) if "lex" in etapas else None
+    total = 0
+
+    def tokens_gravados():
+        nonlocal total
+        for tok in iterar_tokens(caminho_arquivo, contexto):
+            if escritor is not None:
+                escritor.escrever(tok.type, tok.value, tok.lineno, tok.lexpos)
+            total += 1
+            yield tok
+
+    fluxo = tokens_gravados()
+    with perfil.etapa("fluxo_lexico_sintatico" if sintatica else "fluxo_lexico") as contagens:
+        try:
+            if sintatica:
+                analisar_sintaxe(None, fluxo, contexto)
+            # O parser pode parar antes do fim (erro sem recuperação): a tabela ainda leva todos os tokens
+            for _ in fluxo:
+                pass
+        except BaseException:
+            if escritor is not None:
+                escritor.descartar()
+            raise
+        if escritor is not None:
+            escritor.fechar(contexto.erros_lexicos)
+        contagens.update(tokens=total, erros_lexicos=len(contexto.erros_lexicos),
+                         erros_sintaticos=len(contexto.erros_sintaticos), **_contar_sintese(contexto.sintese))
+    if escritor is not None:
+        log(f"[LÉXICO] Saídas salvas em: {os.path.join(pasta_saida, 'lexico')} ({total} tokens, em fluxo)")
+
+    if "parse" in etapas:
+        with perfil.etapa("escrita_sintatico"):
+            salvar_sintatico(contexto.sintese, contexto.erros_sintaticos, pasta_saida, comprimir)
+        log(f"[SINTÁTICO] Relatórios salvos em: {os.path.join(pasta_saida, 'sintatico')}")
+
+    if "sem" in etapas and contexto.interrompida:
+        log(LOG_INTERROMPIDA)
+    elif "sem" in etapas:
+        from semantico_tonto import verificar_semantica
+        log("[SEMÂNTICO] Iniciando validação de padrões ODP...")
+        with perfil.etapa("semantico") as contagens:
+            contexto.padroes, contexto.erros_semanticos = verificar_semantica(
+                contexto.sintese, contexto.diagnosticos, contexto.linhas)
+            contagens.update(padroes=len(contexto.padroes), erros=len(contexto.erros_semanticos))
+        with perfil.etapa("escrita_semantico"):
+            salvar_semantico(contexto.padroes, contexto.erros_semanticos, pasta_saida, comprimir)
+        log(f"[SEMÂNTICO] Relatório salvo em: {os.path.join(pasta_saida, 'semantico')}")
+
+    return {
+        "tokens": total,
+        "erros_lexicos": len(contexto.erros_lexicos),
+        "erros_sintaticos": len(contexto.erros_sintaticos),
+        "padroes": len(contexto.padroes),
+        "erros_semanticos": len(contexto.erros_semanticos),
+        "em_cache": False,
+        "interrompido": contexto.interrompida,
+    }
+
+
+def processar_arquivo(caminho_arquivo, pasta_saida, log=_silencioso, cache=None, fluxo=False,
+                      formatos=FORMATOS, comprimir=False, lexer="ply", perfil=False, cprofile=False,
+                      etapas=ETAPAS, paralelo=0, limite_erros=None):
+    """
+    Executa as três análises sobre um arquivo e grava os relatórios em pasta_saida.
+    Com um CacheAnalise, arquivos cujo conteúdo já foi analisado (pela mesma
+    versão do analisador) reaproveitam o resultado guardado.
+    Arquivos a partir de LIMITE_FLUXO_MB (ou todos, com fluxo=True) são
+    analisados em fluxo, sem cache (ver processar_arquivo_fluxo).
+    formatos escolhe os arquivos da tabela de símbolos; comprimir grava os relatórios em gzip.
+    lexer escolhe o backend léxico ("ply" ou "fast"; ver lexico_tonto.BACKENDS).
+    Com perfil=True, grava em pasta_saida/perfil.json as medidas de cada etapa
+    (ver perfil_tonto.Perfil); com cprofile=True, também um .prof por etapa.
+    etapas (ver ETAPAS) escolhe os relatórios gravados: as etapas anteriores
+    de que uma etapa pedida depende são executadas sem gravar os seus, e o
+    que nenhuma etapa pedida usa nem é executado (nem importado).
+    Com paralelo > 1, léxico e sintático de um arquivo grande (fora do modo
+    em fluxo) são divididos entre esse número de processos (ver paralelo_tonto).
+    Com limite_erros, a análise do arquivo para quando os erros léxicos e
+    sintáticos somam esse limite, e o semântico não roda; o cache não é
+    usado, porque o resultado guardado não respeita o limite.
+    Retorna um resumo com a contagem de tokens, padrões e erros de cada etapa
+    ("interrompido" indica se o limite de erros foi atingido).
+    """
+    if limite_erros is not None:
+        cache = None
+    if perfil:
+        from perfil_tonto import Perfil
+        registro = Perfil(caminho_arquivo, os.path.join(pasta_saida, "perfil") if cprofile else None)
+    else:
+        registro = SEM_PERFIL
+    if fluxo or os.path.getsize(caminho_arquivo) >= LIMITE_FLUXO_MB * 1024 * 1024:
+        resumo = processar_arquivo_fluxo(caminho_arquivo, pasta_saida, log, formatos, comprimir, lexer, registro,
+                                         etapas, limite_erros)
+    else:
+        resumo = _processar_em_memoria(caminho_arquivo, pasta_saida, log, cache, formatos, comprimir, lexer,
+                                       registro, etapas, paralelo, limite_erros)
+    if perfil:
+        log(f"[PERFIL] Medidas salvas em: {registro.salvar(os.path.join(pasta_saida, ARQUIVO_PERFIL))}")
+    return resumo
+
+
+def _processar_em_memoria(caminho_arquivo, pasta_saida, log, cache, formatos, comprimir, lexer, perfil, etapas,
+                          paralelo=0, limite_erros=None):
+    with perfil.etapa("leitura") as contagens:
+        codigo = ler_codigo(caminho_arquivo)
+        contexto = cache.obter(codigo) if cache else None
+        contagens.update(caracteres=len(codigo), linhas=codigo.count("\n") + 1, em_cache=contexto is not None)
+    em_cache = contexto is not None
+    if em_cache:
+        log("[CACHE] Resultado reaproveitado (arquivo sem alterações).")
+    else:
+        contexto = ContextoAnalise(lexer, limite_erros)
+
+    sintatica = "parse" in etapas or "sem" in etapas
+    em_paralelo = not em_cache and sintatica and paralelo > 1
+    if em_paralelo:
+        # 1+2) Léxico e sintático juntos, trecho a trecho, em um pool de processos
+        from paralelo_tonto import analisar_em_paralelo
+        with perfil.etapa("lexico_sintatico_paralelo") as contagens:
+            _, trechos = analisar_em_paralelo(codigo, contexto, paralelo)
+            contagens.update(tokens=len(contexto.tabela), trechos=trechos, erros_lexicos=len(contexto.erros_lexicos),
+                             erros_sintaticos=len(contexto.erros_sintaticos), **_contar_sintese(contexto.sintese))
+
+    # 1) Análise Léxica (o arquivo é lido e tokenizado uma única vez)
+    elif not em_cache:
+        with perfil.etapa("lexico") as contagens:
+            _, _, tokens_lidos = analisar_codigo(codigo, contexto)
+            contagens.update(tokens=len(tokens_lidos), erros=len(contexto.erros_lexicos))
+    if "lex" in etapas:
+        with perfil.etapa("escrita_lexico") as contagens:
+            salvar_lexico(contexto.tabela, contexto.erros_lexicos, pasta_saida, formatos, comprimir, contexto.linhas)
+            contagens.update(linhas=len(contexto.tabela), formatos=list(formatos))
+        log(f"[LÉXICO] Saídas salvas em: {os.path.join(pasta_saida, 'lexico')}")
+
+    # 2) Análise Sintática (reaproveita os tokens do léxico)
+    if not em_cache and sintatica and not em_paralelo:
+        from parser_tonto import analisar_sintaxe, construir_parser
+        # Tabelas LALR: geradas/carregadas só na primeira análise do processo
+        with perfil.etapa("tabelas_parser"):
+            construir_parser()
+        with perfil.etapa("sintatico") as contagens:
+            analisar_sintaxe(codigo, tokens_lidos, contexto)
+            contagens.update(erros=len(contexto.erros_sintaticos), **_contar_sintese(contexto.sintese))
+    if "parse" in etapas:
+        with perfil.etapa("escrita_sintatico"):
+            salvar_sintatico(contexto.sintese, contexto.erros_sintaticos, pasta_saida, comprimir)
+        log(f"[SINTÁTICO] Relatórios salvos em: {os.path.join(pasta_saida, 'sintatico')}")
+
+    # 3) Análise Semântica (só um resultado completo, com as três etapas, vai para o cache)
+    if "sem" in etapas and contexto.interrompida:
+        log(LOG_INTERROMPIDA)
+    elif "sem" in etapas:
+        if not em_cache:
+            from semantico_tonto import verificar_semantica
+            log("[SEMÂNTICO] Iniciando validação de padrões ODP...")
+            with perfil.etapa("semantico") as contagens:
+                contexto.padroes, contexto.erros_semanticos = verificar_semantica(
+                    contexto.sintese, contexto.diagnosticos, contexto.linhas)
+                contagens.update(padroes=len(contexto.padroes), erros=len(contexto.erros_semanticos))
+            if cache:
+                cache.guardar(codigo, contexto)
+        with perfil.etapa("escrita_semantico"):
+            salvar_semantico(contexto.padroes, contexto.erros_semanticos, pasta_saida, comprimir)
+        log(f"[SEMÂNTICO] Relatório salvo em: {os.path.join(pasta_saida, 'semantico')}")
+
+    return {
+        "tokens": len(contexto.tabela),
+        "erros_lexicos": len(contexto.erros_lexicos),
+        "erros_sintaticos": len(contexto.erros_sintaticos),
+        "padroes": len(contexto.padroes),
+        "erros_semanticos": len(contexto.erros_semanticos),
+        "em_cache": em_cache,
+        "interrompido": contexto.interrompida,
+    }
+
+
+def processar_arquivo_json(caminho_arquivo, formato, cache=None, fluxo=False, lexer="ply", saida=None,
+                           etapas=ETAPAS, limite_erros=None):
+    """
+    --format json|ndjson: executa as análises e grava os registros de
+    EscritorJson em `saida` (padrão: a saída padrão), sem os relatórios de
+    texto. O cache, o modo em fluxo e as etapas funcionam como em
+    processar_arquivo (as declarações saem com "parse"); um resultado do
+    cache é gravado de uma vez (declarações na ordem do código, depois os
+    diagnósticos). limite_erros também funciona como em processar_arquivo.
+    """
+    if limite_erros is not None:
+        cache = None
+    sintatica = "parse" in etapas or "sem" in etapas
+    if sintatica:
+        from parser_tonto import analisar_sintaxe, construir_parser
+    em_fluxo = fluxo or os.path.getsize(caminho_arquivo) >= LIMITE_FLUXO_MB * 1024 * 1024
+    if em_fluxo:
+        contexto = ContextoAnalise(lexer, limite_erros)
+        escritor = EscritorJson(formato, caminho_arquivo, contexto, saida, etapas=etapas)
+        total = 0
+
+        def tokens_contados():
+            nonlocal total
+            for tok in iterar_tokens(caminho_arquivo, contexto):
+                total += 1
+                yield tok
+
+        tokens = tokens_contados()
+        if sintatica:
+            construir_parser()
+            analisar_sintaxe(None, tokens, contexto, escritor.declaracao if "parse" in etapas else None)
+        # Como em processar_arquivo_fluxo: o parser pode parar antes do fim do arquivo
+        for _ in tokens:
+            pass
+    else:
+        codigo = ler_codigo(caminho_arquivo)
+        contexto = cache.obter(codigo) if cache else None
+        if contexto is not None:
+            escritor = EscritorJson(formato, caminho_arquivo, contexto, saida, etapas=etapas)
+            if "parse" in etapas:
+                from ast_tonto import nos_da_sintese
+                for no in sorted(nos_da_sintese(contexto.sintese), key=lambda no: no.inicio):
+                    escritor.declaracao(no)
+            escritor.fechar(len(contexto.tabela))
+            return contexto
+        contexto = ContextoAnalise(lexer, limite_erros)
+        escritor = EscritorJson(formato, caminho_arquivo, contexto, saida, etapas=etapas)
+        _, _, tokens_lidos = analisar_codigo(codigo, contexto)
+        escritor.diagnosticos()
+        if sintatica:
+            construir_parser()
+            analisar_sintaxe(codigo, tokens_lidos, contexto, escritor.declaracao if "parse" in etapas else None)
+        total = len(tokens_lidos)
+    escritor.diagnosticos()
+
+    if "sem" in etapas and not contexto.interrompida:
+        from semantico_tonto import verificar_semantica
+        contexto.padroes, contexto.erros_semanticos = verificar_semantica(
+            contexto.sintese, contexto.diagnosticos, contexto.linhas)
+        if cache and not em_fluxo:
+            cache.guardar(codigo, contexto)
+    escritor.fechar(total)
+    return contexto
+
+
+def main(caminho_arquivo, pasta_saida, cache=None, fluxo=False, formatos=FORMATOS, comprimir=False, lexer="ply",
+         perfil=False, cprofile=False, etapas=ETAPAS, paralelo=0, limite_erros=None):
     print(f"\nProcessando: {caminho_arquivo}")
     print("-" * 40)
 
-    # 1) Análise Léxica
-    tabela, erros_lex = analisar_arquivo(caminho_arquivo)
-    salvar_lexico(tabela, erros_lex, pasta_saida)
-    print(f"[LÉXICO] Saídas salvas em: {os.path.join(pasta_saida, 'lexico')}")
+    try:
+        resumo = processar_arquivo(caminho_arquivo, pasta_saida, log=print, cache=cache, fluxo=fluxo,
+                                   formatos=formatos, comprimir=comprimir, lexer=lexer, perfil=perfil,
+                                   cprofile=cprofile, etapas=etapas, paralelo=paralelo, limite_erros=limite_erros)
+    except ArquivoNaoTexto as e:
+        print(f"[ERRO] Arquivo recusado antes da análise: {e}")
+        sys.exit(1)
+    if cache:
+        cache.podar()
+
+    print("-" * 40)
+    if resumo["interrompido"]:
+        print(f"Processamento interrompido: limite de {limite_erros} erros atingido.\n")
+        sys.exit(1)
+    print("Processamento concluído com sucesso! 🚀\n")
+
+
+def _criar_cache(args):
+    """
+    CacheAnalise de --cache-dir, ou None quando nada nesta execução lê ou grava
+    o cache: --no-cache, --max-errors, --fluxo, --watch e --projeto.
+    """
+    if args.no_cache or args.max_errors is not None or args.fluxo or args.watch or args.projeto:
+        return None
+    from cache_tonto import CacheAnalise
+    return CacheAnalise(args.cache_dir, args.cache_max_mb)
+
 
-    # 2) Análise Sintática
-    with open(caminho_arquivo, 'r', encoding='utf-8') as f:
-        codigo = f.read()
+def main_lote(padrao, pasta_saida, jobs, tempo_limite, cache=None, fluxo=False, formatos=FORMATOS,
+              comprimir=False, lexer="ply", perfil=False, cprofile=False, etapas=ETAPAS, limite_erros=None):
+    from lote_tonto import listar_arquivos, executar_lote
 
-    sintese, erros_sint, _ = analisar_sintaxe(codigo)
-    salvar_sintatico(sintese, erros_sint, pasta_saida)
-    print(f"[SINTÁTICO] Relatórios salvos em: {os.path.join(pasta_saida, 'sintatico')}")
+    arquivos, base = listar_arquivos(padrao)
+    if not arquivos:
+        print(f"Nenhum arquivo .tonto encontrado em: {padrao}")
+        return
 
-    # 3) Análise Semântica
-    print("[SEMÂNTICO] Iniciando validação de padrões ODP...")
-    padroes, erros_sem = verificar_semantica(sintese)
-    salvar_semantico(padroes, erros_sem, pasta_saida)
-    print(f"[SEMÂNTICO] Relatório salvo em: {os.path.join(pasta_saida, 'semantico')}")
+    # Gera/carrega as tabelas do lexer e do parser antes de abrir o pool, para que
+    # os workers herdem o parser pronto e não gravem parsetab.py ao mesmo tempo
+    if "parse" in etapas or "sem" in etapas:
+        from parser_tonto import construir_parser
+        construir_parser()
+    build_lexer()
 
+    print(f"\nProcessando {len(arquivos)} arquivo(s) de: {padrao} (jobs={jobs})")
+    print("-" * 40)
+    processar = functools.partial(processar_arquivo, cache=cache, fluxo=fluxo, formatos=formatos,
+                                  comprimir=comprimir, lexer=lexer, perfil=perfil, cprofile=cprofile, etapas=etapas,
+                                  limite_erros=limite_erros)
+    resultados, resumo_path = executar_lote(arquivos, base, pasta_saida, processar,
+                                            jobs=jobs, tempo_limite=tempo_limite, log=print)
+    if cache:
+        cache.podar()
+    print("-" * 40)
+    falhas = sum(1 for r in resultados if r["status"] != "ok")
+    reaproveitados = sum(1 for r in resultados if r.get("em_cache"))
+    print(f"Lote concluído: {len(resultados) - falhas} ok, {falhas} com falha, {reaproveitados} do cache.")
+    print(f"Resumo salvo em: {resumo_path}\n")
+
+
+def main_projeto(caminho, pasta_saida, formatos=FORMATOS, comprimir=False):
+    from projeto_tonto import analisar_projeto
+
+    print(f"\nProcessando projeto: {caminho}")
+    print("-" * 40)
+    resultado = analisar_projeto(caminho)
+
+    # Relatórios léxico/sintático de cada módulo, analisado uma única vez
+    erros_sint = []
+    modulos = resultado.ordem + resultado.em_ciclo
+    for nome in modulos:
+        contexto = resultado.modulos[nome].contexto
+        pasta_modulo = os.path.join(pasta_saida, "modulos", nome)
+        salvar_lexico(contexto.tabela, contexto.erros_lexicos, pasta_modulo, formatos, comprimir, contexto.linhas)
+        salvar_sintatico(contexto.sintese, contexto.erros_sintaticos, pasta_modulo, comprimir)
+        erros_sint.extend(f"[{nome}] {e}" for e in contexto.erros_sintaticos)
+    print(f"[MÓDULOS] {len(modulos)} módulo(s) salvos em: {os.path.join(pasta_saida, 'modulos')}")
+
+    # Modelo mesclado: síntese e semântico enxergam as classes de todos os módulos
+    salvar_sintatico(resultado.sintese, erros_sint, pasta_saida, comprimir)
+    salvar_semantico(resultado.padroes, resultado.erros_semanticos, pasta_saida, comprimir)
+    print(f"[SEMÂNTICO] Relatório do modelo mesclado salvo em: {os.path.join(pasta_saida, 'semantico')}")
+
+    path = salvar_projeto(resultado, pasta_saida, comprimir)
+    print(f"[PROJETO] Ciclos: {len(resultado.ciclos)}, módulos ausentes: {len(resultado.ausentes)}")
+    print(f"[PROJETO] Relatório salvo em: {path}")
     print("-" * 40)
     print("Processamento concluído com sucesso! 🚀\n")
 
 
+def main_watch(caminho, pasta_saida, intervalo, debounce, formatos=FORMATOS, comprimir=False):
+    from observador_tonto import observar
+
+    print(f"\nObservando: {caminho} (Ctrl+C para sair)")
+    print("-" * 40)
+    escritores = (functools.partial(salvar_lexico, formatos=formatos, comprimir=comprimir),
+                  functools.partial(salvar_sintatico, comprimir=comprimir),
+                  functools.partial(salvar_semantico, comprimir=comprimir))
+    observar(caminho, pasta_saida, escritores, intervalo=intervalo, debounce=debounce)
+    print("\nObservação encerrada.")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Analisador Léxico + Sintático + Semântico para TONTO")
-    parser.add_argument("arquivo", help="Caminho para o arquivo .tonto")
+    parser.add_argument("arquivo", nargs="?", help="Caminho para o arquivo .tonto")
     parser.add_argument("--saida", default="outputs", help="Diretório de saída")
+    parser.add_argument("--dir", help="Diretório ou padrão glob (ex.: 'tests/**/*.tonto') para análise em lote")
+    parser.add_argument("--projeto", help="Diretório ou arquivo de entrada de um modelo dividido em vários "
+                                          ".tonto; resolve os imports e valida o modelo mesclado")
+    parser.add_argument("--watch", metavar="CAMINHO",
+                        help="Observa um arquivo ou diretório e reanalisa a cada alteração")
+    parser.add_argument("--intervalo", type=float, default=0.25, help="Intervalo de verificação do --watch (s)")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="Espera sem novas alterações antes de reanalisar no --watch (s)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Processos do modo lote")
+    parser.add_argument("--tempo-limite", type=float, default=60.0,
+                        help="Tempo máximo (s) por arquivo no modo lote; 0 desativa")
+    parser.add_argument("--cache-dir", help="Diretório do cache de resultados por arquivo (padrão: .tonto_cache)")
+    parser.add_argument("--cache-max-mb", type=float,
+                        help="Tamanho máximo do cache (padrão: 256 MB); as entradas menos usadas são removidas")
+    parser.add_argument("--no-cache", action="store_true", help="Não lê nem grava o cache de resultados")
+    parser.add_argument("--fluxo", action="store_true",
+                        help=f"Analisa em fluxo, sem carregar o arquivo inteiro (automático a partir de "
+                             f"{LIMITE_FLUXO_MB} MB)")
+    parser.add_argument("--formats", default=",".join(FORMATOS),
+                        help="Formatos da tabela de símbolos, separados por vírgula (txt,csv,html)")
+    parser.add_argument("--gzip", action="store_true", help="Grava os relatórios comprimidos (.gz)")
+    parser.add_argument("--lexer", choices=BACKENDS, default="ply",
+                        help="Backend léxico de um arquivo ou do --dir: o do PLY ou 'fast' (expressão "
+                             "mestre única, mesmos tokens)")
+    parser.add_argument("--format", choices=("texto",) + FORMATOS_MAQUINA, default="texto",
+                        help="texto: os relatórios em --saida; json/ndjson: modelo e diagnósticos (código, "
+                             "severidade, arquivo, linha, coluna) na saída padrão, à medida que são produzidos")
+    parser.add_argument("--stages", default=",".join(ETAPAS),
+                        help="Etapas cujos relatórios são gravados, separadas por vírgula (lex,parse,sem); as "
+                             "anteriores necessárias rodam sem gravar, e o que não é usado nem é carregado")
+    parser.add_argument("--paralelo", type=int, default=0, metavar="N",
+                        help="Divide um arquivo grande nas declarações de topo e faz léxico e sintático em N "
+                             "processos (mesmo resultado da análise serial)")
+    parser.add_argument("--max-errors", type=int, default=None, metavar="N",
+                        help="Interrompe a análise de um arquivo ao somar N erros léxicos e sintáticos (o "
+                             "semântico não roda e o cache não é usado); sem limite por padrão")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Mede cada etapa (tempo de parede e CPU, contagens, pico de memória) e grava "
+                             f"{ARQUIVO_PERFIL} na pasta de saída de cada arquivo")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="Com --profile, grava também um .prof do cProfile por etapa (pasta perfil/)")
     args = parser.parse_args()
-    main(args.arquivo, args.saida)
\ No newline at end of file
+    args.profile = args.profile or args.cprofile
+    cache = _criar_cache(args)
+    try:
+        formatos = ler_formatos(args.formats)
+        etapas = ler_etapas(args.stages)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.paralelo > 1 and (args.watch or args.projeto or args.dir or args.format in FORMATOS_MAQUINA):
+        parser.error("--paralelo divide um único arquivo; use --jobs para paralelizar um --dir")
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors deve ser pelo menos 1")
+    if args.max_errors is not None and (args.watch or args.projeto):
+        parser.error("--max-errors vale para um arquivo ou --dir")
+    if etapas != ETAPAS and (args.watch or args.projeto):
+        parser.error("--stages vale para um arquivo ou --dir; --projeto e --watch executam todas as etapas")
+
+    if args.format in FORMATOS_MAQUINA:
+        if not args.arquivo or args.watch or args.projeto or args.dir or args.profile:
+            parser.error("--format json/ndjson analisa um único arquivo, sem --dir, --projeto, --watch ou --profile")
+        try:
+            processar_arquivo_json(args.arquivo, args.format, cache, args.fluxo, args.lexer, etapas=etapas,
+                                   limite_erros=args.max_errors)
+        except ArquivoNaoTexto as e:
+            parser.exit(1, f"Erro: {e}\n")
+        if cache:
+            cache.podar()
+    elif args.watch:
+        main_watch(args.watch, args.saida, args.intervalo, args.debounce, formatos, args.gzip)
+    elif args.projeto:
+        main_projeto(args.projeto, args.saida, formatos, args.gzip)
+    elif args.dir:
+        main_lote(args.dir, args.saida, max(1, args.jobs), args.tempo_limite, cache, args.fluxo,
+                  formatos, args.gzip, args.lexer, args.profile, args.cprofile, etapas, args.max_errors)
+    elif args.arquivo:
+        main(args.arquivo, args.saida, cache, args.fluxo, formatos, args.gzip, args.lexer, args.profile,
+             args.cprofile, etapas, args.paralelo, args.max_errors)
+    else:
+        parser.error("informe um arquivo .tonto, --dir, --projeto ou --watch")
@@ -0,0 +1,148 @@
+import os
+import glob
+import time
+import hashlib
+
+from contexto_tonto import ContextoAnalise
+from lexico_tonto import ler_codigo, analisar_codigo, build_lexer
+from parser_tonto import analisar_sintaxe, construir_parser
+from semantico_tonto import verificar_semantica
+from lote_tonto import pasta_do_arquivo
+
+
+class EstadoArquivo:
+    """Última análise de um arquivo observado e as entradas de cada etapa."""
+
+    def __init__(self):
+        self.hash_codigo = None
+        self.chave_tokens = None
+        self.contexto = None
+
+
+def _listar(caminho):
+    if os.path.isdir(caminho):
+        return sorted(glob.glob(os.path.join(caminho, "**", "*.tonto"), recursive=True))
+    return [caminho] if os.path.isfile(caminho) else []
+
+
+def _assinatura_disco(arquivos):
+    assinatura = {}
+    for arquivo in arquivos:
+        try:
+            info = os.stat(arquivo)
+        except OSError:
+            continue
+        assinatura[arquivo] = (info.st_mtime_ns, info.st_size)
+    return assinatura
+
+
+def reanalisar(caminho, estado, pasta_saida, escritores):
+    """
+    Reexecuta apenas as etapas cujas entradas mudaram e regrava apenas os
+    relatórios cujo conteúdo mudou:
+    - léxico: quando o conteúdo do arquivo muda;
+    - sintático: quando a sequência de tokens (tipo, valor, linha) muda;
+    - semântico: quando a síntese sintática muda.
+    Retorna [(etapa, segundos, situação)] ou None se o conteúdo não mudou.
+    """
+    salvar_lexico, salvar_sintatico, salvar_semantico = escritores
+    codigo = ler_codigo(caminho)
+    hash_codigo = hashlib.sha256(codigo.encode('utf-8')).hexdigest()
+    if hash_codigo == estado.hash_codigo:
+        return None
+
+    antigo = estado.contexto
+    novo = ContextoAnalise()
+    etapas = []
+
+    inicio = time.perf_counter()
+    _, _, tokens_lidos = analisar_codigo(codigo, novo)
+    duracao = time.perf_counter() - inicio
+    if antigo is None or (novo.tabela, novo.erros_lexicos) != (antigo.tabela, antigo.erros_lexicos):
+        salvar_lexico(novo.tabela, novo.erros_lexicos, pasta_saida, linhas=novo.linhas)
+        etapas.append(("léxico", duracao, "regravado"))
+    else:
+        etapas.append(("léxico", duracao, "inalterado"))
+
+    chave_tokens = tuple((t.type, t.value, t.lineno) for t in tokens_lidos)
+    if antigo is not None and chave_tokens == estado.chave_tokens:
+        # Só mudaram espaços/comentários sem deslocar linhas: síntese e semântico valem
+        novo.sintese, novo.erros_sintaticos = antigo.sintese, antigo.erros_sintaticos
+        novo.padroes, novo.erros_semanticos = antigo.padroes, antigo.erros_semanticos
+        etapas.append(("sintático", 0.0, "pulado"))
+        etapas.append(("semântico", 0.0, "pulado"))
+    else:
+        inicio = time.perf_counter()
+        analisar_sintaxe(codigo, tokens_lidos, novo)
+        duracao = time.perf_counter() - inicio
+        if antigo is None or (novo.sintese, novo.erros_sintaticos) != (antigo.sintese, antigo.erros_sintaticos):
+            salvar_sintatico(novo.sintese, novo.erros_sintaticos, pasta_saida)
+            etapas.append(("sintático", duracao, "regravado"))
+        else:
+            etapas.append(("sintático", duracao, "inalterado"))
+
+        if antigo is not None and novo.sintese == antigo.sintese:
+            novo.padroes, novo.erros_semanticos = antigo.padroes, antigo.erros_semanticos
+            etapas.append(("semântico", 0.0, "pulado"))
+        else:
+            inicio = time.perf_counter()
+            novo.padroes, novo.erros_semanticos = verificar_semantica(novo.sintese)
+            duracao = time.perf_counter() - inicio
+            if antigo is None or (novo.padroes, novo.erros_semanticos) != (antigo.padroes, antigo.erros_semanticos):
+                salvar_semantico(novo.padroes, novo.erros_semanticos, pasta_saida)
+                etapas.append(("semântico", duracao, "regravado"))
+            else:
+                etapas.append(("semântico", duracao, "inalterado"))
+
+    estado.hash_codigo = hash_codigo
+    estado.chave_tokens = chave_tokens
+    estado.contexto = novo
+    return etapas
+
+
+def observar(caminho, pasta_saida, escritores, intervalo=0.25, debounce=0.3, log=print, parar=None):
+    """
+    Mantém o processo aquecido (tabelas do lexer/parser construídas uma vez) e
+    observa um arquivo ou diretório por polling. Rajadas de gravações são
+    agrupadas: a reanálise só acontece depois de `debounce` segundos sem novas
+    mudanças. parar() -> True encerra o laço (Ctrl+C também).
+    """
+    construir_parser()
+    build_lexer()
+
+    estados = {}
+    pendentes = set()
+    ultimo_evento = 0.0
+    anterior = {}
+
+    try:
+        while not (parar and parar()):
+            atual = _assinatura_disco(_listar(caminho))
+            for arquivo in set(anterior) - set(atual):
+                estados.pop(arquivo, None)
+                pendentes.discard(arquivo)
+                log(f"[WATCH] Removido: {arquivo}")
+            mudados = {a for a, assinatura in atual.items() if anterior.get(a) != assinatura}
+            if mudados:
+                pendentes |= mudados
+                ultimo_evento = time.monotonic()
+            anterior = atual
+
+            if pendentes and time.monotonic() - ultimo_evento >= debounce:
+                for arquivo in sorted(pendentes):
+                    pasta = pasta_saida if not os.path.isdir(caminho) else pasta_do_arquivo(arquivo, caminho, pasta_saida)
+                    try:
+                        etapas = reanalisar(arquivo, estados.setdefault(arquivo, EstadoArquivo()), pasta, escritores)
+                    except Exception as e:
+                        log(f"[WATCH] {arquivo}: erro na análise: {e}")
+                        continue
+                    if etapas is None:
+                        continue
+                    detalhes = ", ".join(f"{etapa} {duracao * 1000:.1f}ms ({situacao})"
+                                         for etapa, duracao, situacao in etapas)
+                    log(f"[WATCH] {arquivo}: {detalhes}")
+                pendentes.clear()
+
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        pass
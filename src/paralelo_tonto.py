@@ -0,0 +1,86 @@
+import os
+import multiprocessing
+
+from contexto_tonto import ContextoAnalise, IndiceLinhas, mesclar_sinteses
+from lexico_tonto import tokenizar, montar_tabela, analisar_codigo, build_lexer
+from parser_tonto import analisar_sintaxe, construir_parser
+from blocos_tonto import pontos_de_divisao
+
+# Análise léxica + sintática de um único arquivo grande em vários processos.
+# O arquivo é dividido nos pontos de blocos_tonto (declarações de topo, fora
+# de chaves), os trechos são analisados em um pool com as linhas e posições
+# do arquivo todo, e as tabelas, sínteses e diagnósticos são juntados na
+# ordem do arquivo: o resultado é o mesmo da análise serial.
+
+# Mais trechos que processos equilibra a carga quando os trechos custam diferente
+TRECHOS_POR_PROCESSO = 4
+# Trechos menores que isto não compensam o custo de ir e voltar do pool
+TAMANHO_MINIMO_TRECHO = 256 * 1024
+
+
+def dividir_em_trechos(codigo, partes, tamanho_minimo=TAMANHO_MINIMO_TRECHO):
+    """
+    Junta os blocos de pontos_de_divisao em até ~`partes` trechos de tamanho
+    parecido, nenhum (exceto o último) menor que tamanho_minimo.
+    Retorna [(deslocamento, linha, fim)], cobrindo o código inteiro.
+    """
+    alvo = max(len(codigo) // max(partes, 1), tamanho_minimo, 1)
+    trechos = []
+    inicio, linha = 0, 1
+    for deslocamento, linha_ponto in pontos_de_divisao(codigo):
+        if deslocamento - inicio >= alvo:
+            trechos.append((inicio, linha, deslocamento))
+            inicio, linha = deslocamento, linha_ponto
+    trechos.append((inicio, linha, len(codigo)))
+    return trechos
+
+
+def _analisar_trecho(tarefa):
+    texto, deslocamento, linha, backend_lexico, limite_erros = tarefa
+    contexto = ContextoAnalise(backend_lexico, limite_erros)
+    contexto.linhas = IndiceLinhas(linha, deslocamento)
+    tokens_lidos = tokenizar(texto, contexto, linha, deslocamento)
+    contexto.tabela = montar_tabela(tokens_lidos)
+    analisar_sintaxe(texto, tokens_lidos, contexto)
+    return contexto
+
+
+def analisar_em_paralelo(codigo, contexto=None, processos=None, tamanho_minimo=TAMANHO_MINIMO_TRECHO):
+    """
+    Léxico + sintático de `codigo` em até `processos` processos (padrão: um
+    por CPU), preenchendo o contexto (um novo, se não for informado) como
+    analisar_codigo seguido de analisar_sintaxe. Se algum trecho tiver erro
+    sintático, o arquivo é analisado de novo de forma serial: a recuperação
+    de erros do parser depende do que veio antes, e só a análise do arquivo
+    inteiro reproduz as mesmas mensagens. O mesmo vale quando os trechos
+    somam o limite de erros do contexto, que só a análise serial interrompe
+    no ponto certo. Código pequeno demais para ser dividido também é
+    analisado de forma serial.
+    Retorna (contexto, quantidade de trechos analisados em paralelo; 0 se serial).
+    """
+    contexto = contexto or ContextoAnalise()
+    processos = processos or os.cpu_count() or 1
+    trechos = dividir_em_trechos(codigo, processos * TRECHOS_POR_PROCESSO, tamanho_minimo) if processos > 1 else []
+
+    if len(trechos) > 1:
+        # Tabelas prontas antes do pool: os processos as herdam (fork) em vez de carregá-las
+        construir_parser()
+        build_lexer(contexto)
+        tarefas = [(codigo[inicio:fim], inicio, linha, contexto.backend_lexico, contexto.limite_erros)
+                   for inicio, linha, fim in trechos]
+        with multiprocessing.Pool(min(processos, len(trechos))) as pool:
+            parciais = pool.map(_analisar_trecho, tarefas, chunksize=1)
+        limite = contexto.limite_erros
+        if not any(parcial.erros_sintaticos for parcial in parciais) and (
+                limite is None or sum(len(parcial.erros_lexicos) for parcial in parciais) < limite):
+            for parcial in parciais:
+                contexto.tabela.estender(parcial.tabela)
+                contexto.linhas.estender(parcial.linhas)
+                mesclar_sinteses(contexto.sintese, parcial.sintese)
+                contexto.erros_lexicos.extend(parcial.erros_lexicos)
+                contexto.diagnosticos.extend(parcial.diagnosticos)
+            return contexto, len(trechos)
+
+    _, _, tokens_lidos = analisar_codigo(codigo, contexto)
+    analisar_sintaxe(codigo, tokens_lidos, contexto)
+    return contexto, 0
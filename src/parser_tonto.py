@@ -1,17 +1,56 @@
+import copy
+import threading
 import ply.yacc as yacc
-import os
-from lexico_tonto import tokens, build_lexer
-
-# Estrutura para o relatório e análise semântica
-sintese = {
-    "pacotes": [],
-    "classes": {},
-    "tipos": {},
-    "enums": {},
-    "generalizacoes": [],
-    "relacoes_externas": []
-}
-erros_sintaticos = []
+from lexico_tonto import tokens, build_lexer, LexerDeTokens, DIR_TABELAS
+from contexto_tonto import ContextoAnalise, LimiteDeErros, novo_diagnostico
+from ast_tonto import (Cardinalidade, Atributo, RelacaoInterna, Classe, TipoDado, Enumeracao, Genset,
+                       RelacaoExterna)
+
+# As regras gravam a síntese em p.parser.contexto (ver novo_parser), um
+# ContextoAnalise próprio de cada análise. Cada declaração vira um nó de
+# ast_tonto, com a posição calculada por _limites.
+
+
+_Simbolo = yacc.YaccSymbol
+
+
+def _limites(p):
+    """
+    (linha, inicio, fim) da produção, do primeiro ao último símbolo não vazio:
+    terminais pela posição do token, não terminais pelos limites que a regra
+    deles guardou em p.slice[0].limites. Guarda o resultado no símbolo
+    reduzido e o retorna (None se a produção for vazia).
+    """
+    simbolos = p.slice
+    for sym in simbolos[1:]:
+        if sym.__class__ is not _Simbolo:
+            linha, inicio = sym.lineno, sym.lexpos
+            break
+        limites = getattr(sym, 'limites', None)
+        if limites is not None:
+            linha, inicio = limites[0], limites[1]
+            break
+    else:
+        simbolos[0].limites = None
+        return None
+    for i in range(len(simbolos) - 1, 0, -1):
+        sym = simbolos[i]
+        if sym.__class__ is not _Simbolo:
+            fim = sym.lexpos + len(str(sym.value))
+            break
+        limites = getattr(sym, 'limites', None)
+        if limites is not None:
+            fim = limites[2]
+            break
+    simbolos[0].limites = limites = (linha, inicio, fim)
+    return limites
+
+
+def _declarar(p, no):
+    """Repassa a declaração recém-reduzida ao ouvinte da análise, se houver (ver analisar_sintaxe)."""
+    ouvinte = p.parser.ao_declarar
+    if ouvinte is not None:
+        ouvinte(no)
 
 
 # ========================================================================
@@ -34,7 +73,7 @@ def p_package_decl(p):
     '''package_decl : KW_PACKAGE identifier_any
                     | empty'''
     if len(p) == 3:
-        sintese["pacotes"].append(p[2])
+        p.parser.contexto.sintese["pacotes"].append(p[2])
         p[0] = ("package", p[2])
     else:
         p[0] = None
@@ -62,6 +101,8 @@ def p_elemento(p):
 
 def p_import_decl(p):
     'import_decl : KW_IMPORT identifier_any'
+    # Guardado para o modo projeto resolver as dependências entre arquivos
+    p.parser.contexto.sintese["imports"].append(p[2])
     p[0] = ("import", p[2])
 
 
@@ -71,33 +112,24 @@ def p_import_decl(p):
 
 def p_class_decl(p):
     '''class_decl : CLASS_STEREOTYPE CLASS_NAME nature_opt inheritance_opt body_opt'''
-    nome = p[2]
-    est = p[1]
-    heranca = p[4]
-    corpo = p[5]
-    attrs, rels = [], []
-
-    if corpo:
-        for item in corpo:
-            if item[0] == 'atributo':
-                attrs.append(item)
-            elif item[0] == 'relacao_interna':
-                rels.append(item)
-
-    # Dados estruturados para o semântico
-    sintese["classes"][nome] = {
-        "estereotipo": est, 
-        "heranca": heranca if heranca else [], 
-        "atributos": attrs, 
-        "relacoes_internas": rels
-    }
-    p[0] = ("class", nome)
+    corpo = p[5] or []
+    classe = Classe(p[2], p[1], heranca=p[4] or [], natureza=p[3],
+                    atributos=[m for m in corpo if isinstance(m, Atributo)],
+                    relacoes_internas=[m for m in corpo if isinstance(m, RelacaoInterna)],
+                    span=_limites(p))
+    p.parser.contexto.sintese["classes"][classe.nome] = classe
+    _declarar(p, classe)
+    p[0] = classe
 
 
 def p_nature_opt(p):
     '''nature_opt : KW_OF RELATION_NAME
                   | empty'''
-    pass
+    if len(p) == 3:
+        p[0] = p[2]
+        _limites(p)
+    else:
+        p[0] = None
 
 
 def p_inheritance_opt(p):
@@ -105,6 +137,7 @@ def p_inheritance_opt(p):
                        | empty'''
     if len(p) == 3:
         p[0] = p[2]
+        _limites(p)
     else:
         p[0] = None
 
@@ -114,6 +147,7 @@ def p_body_opt(p):
                 | empty'''
     if len(p) == 4:
         p[0] = p[2]
+        _limites(p)
     else:
         p[0] = None
 
@@ -141,19 +175,25 @@ def p_member(p):
 def p_cardinality_opt(p):
     '''cardinality_opt : cardinality
                        | empty'''
-    pass
+    p[0] = p[1]
+    if p[1] is not None:
+        _limites(p)
 
 
 def p_atributo(p):
     '''atributo : RELATION_NAME COLON tipo cardinality_opt meta_attribs_opt'''
-    p[0] = ("atributo", p[1], p[3])
+    p[0] = Atributo(p[1], p[3], cardinalidade=p[4], meta=p[5], span=_limites(p))
 
 
 def p_meta_attribs_opt(p):
     '''meta_attribs_opt : LBRACE RELATION_NAME RBRACE
                         | LBRACE RBRACE
                         | empty'''
-    pass
+    if len(p) > 2:
+        p[0] = p[2] if len(p) == 4 else None
+        _limites(p)
+    else:
+        p[0] = None
 
 
 def p_tipo(p):
@@ -161,6 +201,7 @@ def p_tipo(p):
             | NEW_TYPE
             | CLASS_NAME'''
     p[0] = p[1]
+    _limites(p)
 
 
 # ========================================================================
@@ -173,18 +214,18 @@ def p_internal_relation(p):
                          | opt_at REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME
                          | REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME
                          | opt_at REL_SYM CLASS_NAME'''
-    
-    target = p[len(p) - 1]
-    stereotypes = []
-    if p[1]: 
-        stereotypes.append(p[1])
-    
-    # Estrutura rica para o semântico
-    p[0] = ("relacao_interna", {
-        "target": target,
-        "stereotypes": stereotypes,
-        "raw": f"-> {target}"
-    })
+    simbolos = p.slice[1:]
+    # Sem opt_at (4ª forma) o primeiro símbolo já é o REL_SYM, não um estereótipo
+    estereotipos = [p[1]] if simbolos[0].type == 'opt_at' and p[1] else []
+    # Com duas cardinalidades, a primeira é a do lado da classe declarante
+    cardinalidades = [s.value for s in simbolos if s.type == 'cardinality']
+    p[0] = RelacaoInterna(
+        estereotipos, p[len(p) - 1],
+        nome=next((s.value for s in simbolos if s.type == 'RELATION_NAME'), None),
+        simbolo=next(s.value for s in simbolos if s.type == 'REL_SYM'),
+        cardinalidade_origem=cardinalidades[0] if len(cardinalidades) == 2 else None,
+        cardinalidade_destino=cardinalidades[-1] if cardinalidades else None,
+        span=_limites(p))
 
 
 # ========================================================================
@@ -202,6 +243,7 @@ def p_datatype_target_for_spec(p):
                                 | NEW_TYPE
                                 | CLASS_NAME'''
     p[0] = p[1]
+    _limites(p)
 
 
 def p_datatype_decl(p):
@@ -209,11 +251,12 @@ def p_datatype_decl(p):
                      | KW_DATATYPE datatype_identifier KW_SPECIALIZES datatype_target_for_spec'''
 
     if len(p) == 6:
-        sintese["tipos"][p[2]] = p[4]
-        p[0] = ("datatype", p[2])
-    elif len(p) == 5:
-        sintese["tipos"][p[2]] = {"especializa": p[4]}
-        p[0] = ("datatype", p[2])
+        tipo = TipoDado(p[2], atributos=p[4], span=_limites(p))
+    else:
+        tipo = TipoDado(p[2], especializa=p[4], span=_limites(p))
+    p.parser.contexto.sintese["tipos"][tipo.nome] = tipo
+    _declarar(p, tipo)
+    p[0] = tipo
 
 
 def p_atributos_dt(p):
@@ -234,8 +277,10 @@ def p_enum_element_name(p):
 
 def p_enum_decl(p):
     'enum_decl : KW_ENUM CLASS_NAME LBRACE lista_enum RBRACE'
-    sintese["enums"][p[2]] = p[4]
-    p[0] = ("enum", p[2])
+    enum = Enumeracao(p[2], p[4], span=_limites(p))
+    p.parser.contexto.sintese["enums"][enum.nome] = enum
+    _declarar(p, enum)
+    p[0] = enum
 
 
 def p_lista_enum(p):
@@ -262,41 +307,28 @@ def p_genset_modifiers(p):
     # Extração vital dos modificadores
     if len(p) == 3:
         p[0] = ['disjoint', 'complete']
-    elif len(p) == 2:
-        if p[1]:
-            p[0] = [p[1]]
-        else:
-            p[0] = []
+        _limites(p)
+    elif len(p) == 2 and p[1]:
+        p[0] = [p[1]]
+        _limites(p)
     else:
         p[0] = []
 
 
 def p_genset_inline(p):
     '''genset_inline : genset_modifiers KW_GENSET identifier_any KW_WHERE class_list KW_SPECIALIZES CLASS_NAME'''
-    
-    dados_genset = {
-        "nome": p[3],
-        "tipo": "inline",
-        "modifiers": p[1], # Captura disjoint/complete
-        "specifics": p[5],
-        "general": p[7]
-    }
-    sintese["generalizacoes"].append(dados_genset)
-    p[0] = ("genset", p[3])
+    genset = Genset(p[3], geral=p[7], especificos=p[5], modificadores=p[1], forma="inline", span=_limites(p))
+    p.parser.contexto.sintese["generalizacoes"].append(genset)
+    _declarar(p, genset)
+    p[0] = genset
 
 
 def p_genset_block(p):
     '''genset_block : genset_modifiers KW_GENSET identifier_any LBRACE general_decl specifics_decl RBRACE'''
-    
-    dados_genset = {
-        "nome": p[3],
-        "tipo": "block",
-        "modifiers": p[1], # Captura disjoint/complete
-        "general": p[5],
-        "specifics": p[6]
-    }
-    sintese["generalizacoes"].append(dados_genset)
-    p[0] = ("genset_block", p[3])
+    genset = Genset(p[3], geral=p[5], especificos=p[6], modificadores=p[1], forma="block", span=_limites(p))
+    p.parser.contexto.sintese["generalizacoes"].append(genset)
+    _declarar(p, genset)
+    p[0] = genset
 
 
 def p_general_decl(p):
@@ -317,6 +349,7 @@ def p_class_list(p):
     else:
         p[1].append(p[3])
         p[0] = p[1]
+    _limites(p)
 
 
 # ========================================================================
@@ -327,41 +360,30 @@ def p_relation_decl_external(p):
     '''relation_decl_external : opt_at KW_RELATION CLASS_NAME cardinality REL_SYM cardinality CLASS_NAME
                               | opt_at KW_RELATION CLASS_NAME cardinality REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME
                               | RELATION_STEREOTYPE KW_RELATION CLASS_NAME cardinality REL_SYM cardinality CLASS_NAME'''
-    
-    rel_data = {}
-    
+    estereotipos = [p[1]] if p[1] else []
     if len(p) == 10:
-        rel_data = {
-            "source": p[3],
-            "target": p[9],
-            "name": p[6],
-            "stereotypes": [p[1]] if p[1] else []
-        }
-    elif len(p) == 8:
-        stereotype = p[1] if p[1] else None
-        rel_data = {
-            "source": p[3],
-            "target": p[7],
-            "name": None,
-            "stereotypes": [stereotype] if stereotype else []
-        }
+        relacao = RelacaoExterna(estereotipos, p[3], p[9], nome=p[6], simbolo=p[5],
+                                 cardinalidade_origem=p[4], cardinalidade_destino=p[8], span=_limites(p))
     else:
-        # Fallback genérico
-        rel_data = {"source": "?", "target": "?", "name": None, "stereotypes": []}
-    
-    rel_data["raw"] = f"rel: {rel_data.get('name', 'unnamed')} ({rel_data.get('source')} -> {rel_data.get('target')})"
-    sintese["relacoes_externas"].append(rel_data)
-    p[0] = ("relation", "ok")
+        relacao = RelacaoExterna(estereotipos, p[3], p[7], simbolo=p[5],
+                                 cardinalidade_origem=p[4], cardinalidade_destino=p[6], span=_limites(p))
+    p.parser.contexto.sintese["relacoes_externas"].append(relacao)
+    _declarar(p, relacao)
+    p[0] = relacao
 
 
 def p_opt_at(p):
     '''opt_at : AT RELATION_STEREOTYPE
               | RELATION_STEREOTYPE
               | empty'''
+    # '@' é um token à parte: o estereótipo já chega normalizado (sem '@')
+    # na síntese e o semântico compara os nomes diretamente
     if len(p) == 3:
         p[0] = p[2]
-    elif len(p) == 2:
+        _limites(p)
+    elif len(p) == 2 and p[1]:
         p[0] = p[1]
+        _limites(p)
     else:
         p[0] = None
 
@@ -371,7 +393,12 @@ def p_cardinality(p):
                    | LBRACKET NUMBER RANGE_DOTS STAR RBRACKET
                    | LBRACKET NUMBER RANGE_DOTS NUMBER RBRACKET
                    | LBRACKET STAR RBRACKET'''
-    pass
+    # '*' como máximo vira None; [*] é o mesmo que [0..*]
+    if len(p) == 4:
+        minimo, maximo = (0, None) if p[2] == '*' else (p[2], p[2])
+    else:
+        minimo, maximo = p[2], None if p[4] == '*' else p[4]
+    p[0] = Cardinalidade(minimo, maximo, span=_limites(p))
 
 
 def p_identifier_any(p):
@@ -385,37 +412,157 @@ def p_empty(p):
     pass
 
 
-def p_error(p):
+# Recuperação de erros: depois de um erro sintático, os tokens são
+# descartados até o início da próxima declaração de topo e o parser
+# recomeça dali. As declarações já reduzidas ficam na síntese, e cada
+# declaração com erro custa uma mensagem, não uma nova execução.
+INICIOS_DECLARACAO = frozenset({'CLASS_STEREOTYPE', 'KW_DATATYPE', 'KW_ENUM', 'KW_GENSET', 'KW_DISJOINT',
+                                'KW_COMPLETE', 'KW_IMPORT'})
+
+
+class _Ressincronizar(Exception):
+    """
+    Levantada pelo tratador de erros para analisar_sintaxe recomeçar no
+    próximo início de declaração; profundidade é o número de chaves abertas
+    na pilha do parser no momento do erro.
+    """
+
+    def __init__(self, token, profundidade):
+        super().__init__(token)
+        self.token = token
+        self.profundidade = profundidade
+
+
+def _proxima_declaracao(fonte, profundidade=0, linhas=None):
+    """
+    Descarta tokens de `fonte` (um LexerDeTokens) até o início da próxima
+    declaração de topo e devolve esse início à fonte. Uma relação externa
+    começa em KW_RELATION ou no estereótipo ('@' opcional) logo antes dele;
+    o mesmo estereótipo sem 'relation' depois é uma relação interna, que não
+    inicia declaração. Dentro de chaves (profundidade > 0) só conta um início
+    na primeira coluna (como em blocos_tonto, o '}' que faltou): uma palavra
+    reservada no corpo de uma classe não vira uma declaração nova.
+    Retorna False se o código acabar antes.
+    """
+    anteriores = []
+    while True:
+        tok = fonte.token()
+        if tok is None:
+            return False
+        tipo = tok.type
+        if tipo == 'LBRACE':
+            profundidade += 1
+        elif tipo == 'RBRACE':
+            profundidade = max(0, profundidade - 1)
+        elif tipo in INICIOS_DECLARACAO or tipo == 'KW_RELATION':
+            inicio = [tok]
+            if tipo == 'KW_RELATION' and anteriores and anteriores[-1].type == 'RELATION_STEREOTYPE':
+                inicio[:0] = anteriores[-2:] if len(anteriores) > 1 and anteriores[-2].type == 'AT' else anteriores[-1:]
+            if profundidade == 0 or (linhas is not None and linhas.coluna(inicio[0].lineno, inicio[0].lexpos) == 1):
+                fonte.devolver(*inicio)
+                return True
+        anteriores = anteriores[-1:] + [tok]
+
+
+def registrar_erro_sintatico(contexto, p):
+    if contexto.interrompida:
+        # O léxico atingiu o limite de erros: o final do fluxo de tokens não é um erro do arquivo
+        return
     if p:
-        erros_sintaticos.append(f"[ERRO SINTÁTICO] Token inesperado '{p.value}' ({p.type}) na linha {p.lineno}")
+        contexto.erros_sintaticos.append(f"[ERRO SINTÁTICO] Token inesperado '{p.value}' ({p.type}) na linha "
+                                         f"{p.lineno}, coluna {contexto.linhas.coluna(p.lineno, p.lexpos)}")
+        contexto.diagnosticos.append(novo_diagnostico(
+            "sintatico", f"Token inesperado '{p.value}' ({p.type})", p.lineno, p.lexpos, len(str(p.value)),
+            codigo="SIN001", linhas=contexto.linhas))
     else:
-        erros_sintaticos.append("[ERRO SINTÁTICO] Final inesperado do arquivo.")
+        contexto.erros_sintaticos.append("[ERRO SINTÁTICO] Final inesperado do arquivo.")
+        contexto.diagnosticos.append(novo_diagnostico("sintatico", "Final inesperado do arquivo.", codigo="SIN002"))
+    contexto.contar_erro("sintatico")
+
+
+def p_error(p):
+    # Cada análise substitui este tratador por registrar_erro_sintatico ligado
+    # ao seu contexto (ver novo_parser); no final do arquivo o PLY chama o
+    # tratador com None, sem acesso ao lexer de onde o contexto viria.
+    pass
 
 
 # ========================================================================
 # BUILD
 # ========================================================================
-
-def analisar_sintaxe(codigo):
-    sintese["pacotes"].clear()
-    sintese["classes"].clear()
-    sintese["tipos"].clear()
-    sintese["enums"].clear()
-    sintese["generalizacoes"].clear()
-    sintese["relacoes_externas"].clear()
-    erros_sintaticos.clear()
-
-    # Limpeza para evitar cache antigo
-    arquivos_para_remover = ["parsetab.py", os.path.join("src", "parsetab.py")]
-    for arq in arquivos_para_remover:
-        if os.path.exists(arq):
+# As tabelas LALR ficam em parsetab.py junto com a assinatura da gramática
+# (calculada pelo PLY a partir das regras p_*). Elas são lidas nas execuções
+# seguintes e só são regeneradas quando a gramática muda.
+PARSETAB = 'parsetab'
+
+_parser = None
+_trava_parser = threading.Lock()
+
+
+def construir_parser():
+    """Retorna o parser LALR base, construído uma única vez por processo."""
+    global _parser
+    if _parser is None:
+        with _trava_parser:
+            if _parser is None:
+                _parser = yacc.yacc(tabmodule=PARSETAB, outputdir=DIR_TABELAS)
+    return _parser
+
+
+def novo_parser(contexto):
+    """
+    Cópia rasa do parser base para uma análise: compartilha as tabelas LALR
+    (somente leitura), mas tem seu próprio estado de execução, contexto e
+    tratador de erros, podendo rodar em paralelo com outras análises.
+    """
+    parser = copy.copy(construir_parser())
+    parser.contexto = contexto
+    parser.errorfunc = lambda p: _tratar_erro(parser, p)
+    parser.ao_declarar = None
+    return parser
+
+
+def _tratar_erro(parser, p):
+    registrar_erro_sintatico(parser.contexto, p)
+    if p is not None:
+        raise _Ressincronizar(p, sum(1 for simbolo in parser.symstack if simbolo.type == 'LBRACE'))
+
+
+def analisar_sintaxe(codigo, tokens_lidos=None, contexto=None, ao_declarar=None):
+    """
+    Analisa o código e preenche a síntese sintática do contexto (um novo, se
+    não for informado). Se tokens_lidos (saída de lexico_tonto.analisar_codigo,
+    ou um gerador como lexico_tonto.iterar_tokens) for informado, o parser
+    consome esses tokens em vez de tokenizar o código novamente.
+    ao_declarar(no), se informado, é chamado com cada declaração de topo
+    (classe, datatype, enum, genset, relação externa) assim que ela é reduzida.
+    Depois de cada erro sintático, a análise recomeça na próxima declaração
+    de topo (class, datatype, enum, genset, relação externa ou import): a
+    declaração com erro é descartada e todas as válidas chegam à síntese.
+    Se o limite de erros do contexto for atingido, a análise para ali; se o
+    léxico já o tinha atingido, o parser nem roda.
+    Retorna (sintese, erros_sintaticos, parser).
+    """
+    contexto = contexto or ContextoAnalise()
+    parser = novo_parser(contexto)
+    parser.ao_declarar = ao_declarar
+    if contexto.interrompida:
+        return contexto.sintese, contexto.erros_sintaticos, parser
+
+    if tokens_lidos is None:
+        tokens_lidos = build_lexer(contexto)
+        tokens_lidos.input(codigo)
+    fonte = LexerDeTokens(tokens_lidos, contexto)
+    try:
+        while True:
             try:
-                os.remove(arq)
-            except:
-                pass
-
-    lexer_fresco = build_lexer()
-    parser = yacc.yacc()
-
-    parser.parse(codigo, lexer=lexer_fresco)
-    return sintese, erros_sintaticos, parser
\ No newline at end of file
+                parser.parse(lexer=fonte)
+                break
+            except _Ressincronizar as erro:
+                # O token do erro pode ser ele mesmo o início da próxima declaração
+                fonte.devolver(erro.token)
+                if not _proxima_declaracao(fonte, erro.profundidade, contexto.linhas):
+                    break
+    except LimiteDeErros:
+        pass
+    return contexto.sintese, contexto.erros_sintaticos, parser
@@ -1,109 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = 'AT CLASS_NAME CLASS_STEREOTYPE COLON COMMA DATA_TYPE INSTANCE_NAME KW_COMPLETE KW_DATATYPE KW_DISJOINT KW_ENUM KW_GENERAL KW_GENSET KW_IMPORT KW_OF KW_PACKAGE KW_RELATION KW_SPECIALIZES KW_SPECIFICS KW_WHERE LBRACE LBRACKET LPAREN NEW_TYPE NUMBER RANGE_DOTS RBRACE RBRACKET RELATION_NAME RELATION_STEREOTYPE REL_SYM RPAREN SPECIAL_SYMBOL STARprogram : imports_opt package_decl elementosimports_opt : imports_opt import_decl\n| import_decl\n| emptypackage_decl : KW_PACKAGE identifier_any\n| emptyelementos : elementos elemento\n| elementoelemento : class_decl\n| datatype_decl\n| enum_decl\n| genset_decl\n| relation_decl_external\n| import_declimport_decl : KW_IMPORT identifier_anyclass_decl : CLASS_STEREOTYPE CLASS_NAME nature_opt inheritance_opt body_optnature_opt : KW_OF RELATION_NAME\n| emptyinheritance_opt : KW_SPECIALIZES class_list\n| emptybody_opt : LBRACE class_body RBRACE\n| emptyclass_body : class_body member\n| membermember : atributo\n| internal_relationcardinality_opt : cardinality\n| emptyatributo : RELATION_NAME COLON tipo cardinality_opt meta_attribs_optmeta_attribs_opt : LBRACE RELATION_NAME RBRACE\n| LBRACE RBRACE\n| emptytipo : DATA_TYPE\n| NEW_TYPE\n| CLASS_NAMEinternal_relation : opt_at cardinality REL_SYM cardinality CLASS_NAME\n| opt_at cardinality REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME\n| opt_at REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME\n| REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME\n| opt_at REL_SYM CLASS_NAMEdatatype_identifier : NEW_TYPE\n| CLASS_NAMEdatatype_target_for_spec : DATA_TYPE\n| NEW_TYPE\n| CLASS_NAMEdatatype_decl : KW_DATATYPE datatype_identifier LBRACE atributos_dt RBRACE\n| KW_DATATYPE datatype_identifier KW_SPECIALIZES datatype_target_for_specatributos_dt : atributos_dt atributo\n| atributoenum_element_name : CLASS_NAME\n| INSTANCE_NAMEenum_decl : KW_ENUM CLASS_NAME LBRACE lista_enum RBRACElista_enum : lista_enum COMMA enum_element_name\n| enum_element_namegenset_decl : genset_inline\n| genset_blockgenset_modifiers : KW_DISJOINT KW_COMPLETE\n| KW_DISJOINT\n| KW_COMPLETE\n| emptygenset_inline : genset_modifiers KW_GENSET identifier_any KW_WHERE class_list KW_SPECIALIZES CLASS_NAMEgenset_block : genset_modifiers KW_GENSET identifier_any LBRACE general_decl specifics_decl RBRACEgeneral_decl : KW_GENERAL CLASS_NAMEspecifics_decl : KW_SPECIFICS class_listclass_list : class_list COMMA CLASS_NAME\n| CLASS_NAMErelation_decl_external : opt_at KW_RELATION CLASS_NAME cardinality REL_SYM cardinality CLASS_NAME\n| opt_at KW_RELATION CLASS_NAME cardinality REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME\n| RELATION_STEREOTYPE KW_RELATION CLASS_NAME cardinality REL_SYM cardinality CLASS_NAMEopt_at : AT RELATION_STEREOTYPE\n| RELATION_STEREOTYPE\n| emptycardinality : LBRACKET NUMBER RBRACKET\n| LBRACKET NUMBER RANGE_DOTS STAR RBRACKET\n| LBRACKET NUMBER RANGE_DOTS NUMBER RBRACKET\n| LBRACKET STAR RBRACKETidentifier_any : CLASS_NAME\n| RELATION_NAMEempty :'
-    
-_lr_action_items = {'KW_IMPORT':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,33,34,35,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[5,5,-3,-4,5,-2,-6,-15,-77,-78,5,-8,-9,-10,-11,-12,-13,-14,-55,-56,-5,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'KW_PACKAGE':([0,2,3,4,7,10,11,12,],[-79,8,-3,-4,-2,-15,-77,-78,]),'CLASS_STEREOTYPE':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,33,34,35,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[-79,-79,-3,-4,21,-2,-6,-15,-77,-78,21,-8,-9,-10,-11,-12,-13,-14,-55,-56,-5,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'KW_DATATYPE':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,33,34,35,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[-79,-79,-3,-4,22,-2,-6,-15,-77,-78,22,-8,-9,-10,-11,-12,-13,-14,-55,-56,-5,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'KW_ENUM':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,33,34,35,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[-79,-79,-3,-4,23,-2,-6,-15,-77,-78,23,-8,-9,-10,-11,-12,-13,-14,-55,-56,-5,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'RELATION_STEREOTYPE':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,29,33,34,35,45,47,54,56,57,61,62,63,64,74,75,76,77,78,79,82,91,92,93,94,100,101,102,103,107,109,115,116,120,121,122,123,124,128,129,130,134,136,138,140,141,147,148,149,152,153,155,156,],[-79,-79,-3,-4,27,-2,-6,-15,-77,-78,27,-8,-9,-10,-11,-12,-13,-14,-55,-56,43,-5,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,97,-22,-19,-66,-46,-52,97,-24,-25,-26,-79,-33,-34,-35,-73,-76,-21,-23,-65,-79,-27,-28,-67,-69,-61,-62,-40,-29,-32,-75,-74,-31,-68,-36,-39,-30,-38,-37,]),'AT':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,33,34,35,45,47,54,56,57,61,62,63,64,74,75,76,77,78,79,82,91,92,93,94,100,101,102,103,107,109,115,116,120,121,122,123,124,128,129,130,134,136,138,140,141,147,148,149,152,153,155,156,],[-79,-79,-3,-4,29,-2,-6,-15,-77,-78,29,-8,-9,-10,-11,-12,-13,-14,-55,-56,-5,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,29,-22,-19,-66,-46,-52,29,-24,-25,-26,-79,-33,-34,-35,-73,-76,-21,-23,-65,-79,-27,-28,-67,-69,-61,-62,-40,-29,-32,-75,-74,-31,-68,-36,-39,-30,-38,-37,]),'KW_DISJOINT':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,33,34,35,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[-79,-79,-3,-4,31,-2,-6,-15,-77,-78,31,-8,-9,-10,-11,-12,-13,-14,-55,-56,-5,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'KW_COMPLETE':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,31,33,34,35,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[-79,-79,-3,-4,32,-2,-6,-15,-77,-78,32,-8,-9,-10,-11,-12,-13,-14,-55,-56,44,-5,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'KW_RELATION':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,26,27,30,33,34,35,43,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[-79,-79,-3,-4,-79,-2,-6,-15,-77,-78,-79,-8,-9,-10,-11,-12,-13,-14,-55,-56,40,41,-72,-5,-7,-79,-70,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'KW_GENSET':([0,2,3,4,6,7,9,10,11,12,13,14,15,16,17,18,19,20,24,25,28,30,31,32,33,34,35,44,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[-79,-79,-3,-4,-79,-2,-6,-15,-77,-78,-79,-8,-9,-10,-11,-12,-13,-14,-55,-56,42,-60,-58,-59,-5,-7,-79,-57,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'$end':([1,10,11,12,13,14,15,16,17,18,19,20,24,25,34,35,45,47,54,56,57,61,62,63,64,74,76,77,78,79,82,115,120,124,128,129,130,148,],[0,-15,-77,-78,-1,-8,-9,-10,-11,-12,-13,-14,-55,-56,-7,-79,-79,-18,-79,-20,-17,-47,-43,-44,-45,-16,-22,-19,-66,-46,-52,-21,-65,-67,-69,-61,-62,-68,]),'CLASS_NAME':([5,8,21,22,23,40,41,42,49,50,55,72,81,83,90,99,105,107,109,110,111,113,118,139,140,141,142,145,151,154,],[11,11,35,38,39,51,52,11,64,65,78,78,103,65,114,120,124,-73,-76,128,129,78,134,148,-75,-74,149,152,155,156,]),'RELATION_NAME':([5,8,42,46,48,58,59,75,80,84,91,92,93,94,96,100,101,102,103,107,109,116,118,121,122,123,132,134,136,137,138,140,141,147,149,152,153,155,156,],[12,12,12,57,60,60,-49,60,-48,106,60,-24,-25,-26,119,-79,-33,-34,-35,-73,-76,-23,133,-79,-27,-28,143,-40,-29,146,-32,-75,-74,-31,-36,-39,-30,-38,-37,]),'KW_WHERE':([11,12,53,],[-77,-78,72,]),'LBRACE':([11,12,35,36,37,38,39,45,47,53,54,56,57,77,78,100,101,102,103,107,109,120,121,122,123,140,141,],[-77,-78,-79,48,-41,-42,50,-79,-18,73,75,-20,-17,-19,-66,-79,-33,-34,-35,-73,-76,-65,137,-27,-28,-75,-74,]),'NEW_TYPE':([22,49,81,],[37,63,102,]),'KW_OF':([35,],[46,]),'KW_SPECIALIZES':([35,36,37,38,45,47,57,78,88,120,],[-79,49,-41,-42,55,-18,-17,-66,111,-65,]),'REL_SYM':([43,69,71,75,91,92,93,94,95,97,98,100,101,102,103,106,107,109,116,117,119,121,122,123,133,134,136,138,140,141,143,147,149,152,153,155,156,],[-70,84,87,96,96,-24,-25,-26,118,-71,-72,-79,-33,-34,-35,125,-73,-76,-23,132,135,-79,-27,-28,144,-40,-29,-32,-75,-74,150,-31,-36,-39,-30,-38,-37,]),'LBRACKET':([43,51,52,75,84,87,91,92,93,94,95,97,98,100,101,102,103,107,109,116,121,122,123,125,132,134,135,136,138,140,141,144,147,149,150,152,153,155,156,],[-70,70,70,-79,70,70,-79,-24,-25,-26,70,-71,-72,70,-33,-34,-35,-73,-76,-23,-79,-27,-28,70,70,-40,70,-29,-32,-75,-74,70,-31,-36,70,-39,-30,-38,-37,]),'DATA_TYPE':([49,81,],[62,101,]),'INSTANCE_NAME':([50,83,],[68,68,]),'RBRACE':([58,59,65,66,67,68,78,80,91,92,93,94,100,101,102,103,104,107,109,112,116,120,121,122,123,131,134,136,137,138,140,141,146,147,149,152,153,155,156,],[79,-49,-50,82,-54,-51,-66,-48,115,-24,-25,-26,-79,-33,-34,-35,-53,-73,-76,130,-23,-65,-79,-27,-28,-64,-40,-29,147,-32,-75,-74,153,-31,-36,-39,-30,-38,-37,]),'COLON':([60,],[81,]),'COMMA':([65,66,67,68,77,78,88,104,120,131,],[-50,83,-54,-51,99,-66,99,-53,-65,99,]),'NUMBER':([70,108,],[85,126,]),'STAR':([70,108,],[86,127,]),'KW_GENERAL':([73,],[90,]),'RBRACKET':([85,86,126,127,],[107,109,140,141,]),'RANGE_DOTS':([85,],[108,]),'KW_SPECIFICS':([89,114,],[113,-63,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'program':([0,],[1,]),'imports_opt':([0,],[2,]),'import_decl':([0,2,6,13,],[3,7,20,20,]),'empty':([0,2,6,13,35,45,54,75,91,100,121,],[4,9,30,30,47,56,76,98,98,123,138,]),'package_decl':([2,],[6,]),'identifier_any':([5,8,42,],[10,33,53,]),'elementos':([6,],[13,]),'elemento':([6,13,],[14,34,]),'class_decl':([6,13,],[15,15,]),'datatype_decl':([6,13,],[16,16,]),'enum_decl':([6,13,],[17,17,]),'genset_decl':([6,13,],[18,18,]),'relation_decl_external':([6,13,],[19,19,]),'genset_inline':([6,13,],[24,24,]),'genset_block':([6,13,],[25,25,]),'opt_at':([6,13,75,91,],[26,26,95,95,]),'genset_modifiers':([6,13,],[28,28,]),'datatype_identifier':([22,],[36,]),'nature_opt':([35,],[45,]),'inheritance_opt':([45,],[54,]),'atributos_dt':([48,],[58,]),'atributo':([48,58,75,91,],[59,80,93,93,]),'datatype_target_for_spec':([49,],[61,]),'lista_enum':([50,],[66,]),'enum_element_name':([50,83,],[67,104,]),'cardinality':([51,52,84,87,95,100,125,132,135,144,150,],[69,71,105,110,117,122,139,142,145,151,154,]),'body_opt':([54,],[74,]),'class_list':([55,72,113,],[77,88,131,]),'general_decl':([73,],[89,]),'class_body':([75,],[91,]),'member':([75,91,],[92,116,]),'internal_relation':([75,91,],[94,94,]),'tipo':([81,],[100,]),'specifics_decl':([89,],[112,]),'cardinality_opt':([100,],[121,]),'meta_attribs_opt':([121,],[136,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> program","S'",1,None,None,None),
-  ('program -> imports_opt package_decl elementos','program',3,'p_program','parser_tonto.py',22),
-  ('imports_opt -> imports_opt import_decl','imports_opt',2,'p_imports_opt','parser_tonto.py',27),
-  ('imports_opt -> import_decl','imports_opt',1,'p_imports_opt','parser_tonto.py',28),
-  ('imports_opt -> empty','imports_opt',1,'p_imports_opt','parser_tonto.py',29),
-  ('package_decl -> KW_PACKAGE identifier_any','package_decl',2,'p_package_decl','parser_tonto.py',34),
-  ('package_decl -> empty','package_decl',1,'p_package_decl','parser_tonto.py',35),
-  ('elementos -> elementos elemento','elementos',2,'p_elementos','parser_tonto.py',44),
-  ('elementos -> elemento','elementos',1,'p_elementos','parser_tonto.py',45),
-  ('elemento -> class_decl','elemento',1,'p_elemento','parser_tonto.py',54),
-  ('elemento -> datatype_decl','elemento',1,'p_elemento','parser_tonto.py',55),
-  ('elemento -> enum_decl','elemento',1,'p_elemento','parser_tonto.py',56),
-  ('elemento -> genset_decl','elemento',1,'p_elemento','parser_tonto.py',57),
-  ('elemento -> relation_decl_external','elemento',1,'p_elemento','parser_tonto.py',58),
-  ('elemento -> import_decl','elemento',1,'p_elemento','parser_tonto.py',59),
-  ('import_decl -> KW_IMPORT identifier_any','import_decl',2,'p_import_decl','parser_tonto.py',64),
-  ('class_decl -> CLASS_STEREOTYPE CLASS_NAME nature_opt inheritance_opt body_opt','class_decl',5,'p_class_decl','parser_tonto.py',73),
-  ('nature_opt -> KW_OF RELATION_NAME','nature_opt',2,'p_nature_opt','parser_tonto.py',98),
-  ('nature_opt -> empty','nature_opt',1,'p_nature_opt','parser_tonto.py',99),
-  ('inheritance_opt -> KW_SPECIALIZES class_list','inheritance_opt',2,'p_inheritance_opt','parser_tonto.py',104),
-  ('inheritance_opt -> empty','inheritance_opt',1,'p_inheritance_opt','parser_tonto.py',105),
-  ('body_opt -> LBRACE class_body RBRACE','body_opt',3,'p_body_opt','parser_tonto.py',113),
-  ('body_opt -> empty','body_opt',1,'p_body_opt','parser_tonto.py',114),
-  ('class_body -> class_body member','class_body',2,'p_class_body','parser_tonto.py',122),
-  ('class_body -> member','class_body',1,'p_class_body','parser_tonto.py',123),
-  ('member -> atributo','member',1,'p_member','parser_tonto.py',132),
-  ('member -> internal_relation','member',1,'p_member','parser_tonto.py',133),
-  ('cardinality_opt -> cardinality','cardinality_opt',1,'p_cardinality_opt','parser_tonto.py',142),
-  ('cardinality_opt -> empty','cardinality_opt',1,'p_cardinality_opt','parser_tonto.py',143),
-  ('atributo -> RELATION_NAME COLON tipo cardinality_opt meta_attribs_opt','atributo',5,'p_atributo','parser_tonto.py',148),
-  ('meta_attribs_opt -> LBRACE RELATION_NAME RBRACE','meta_attribs_opt',3,'p_meta_attribs_opt','parser_tonto.py',153),
-  ('meta_attribs_opt -> LBRACE RBRACE','meta_attribs_opt',2,'p_meta_attribs_opt','parser_tonto.py',154),
-  ('meta_attribs_opt -> empty','meta_attribs_opt',1,'p_meta_attribs_opt','parser_tonto.py',155),
-  ('tipo -> DATA_TYPE','tipo',1,'p_tipo','parser_tonto.py',160),
-  ('tipo -> NEW_TYPE','tipo',1,'p_tipo','parser_tonto.py',161),
-  ('tipo -> CLASS_NAME','tipo',1,'p_tipo','parser_tonto.py',162),
-  ('internal_relation -> opt_at cardinality REL_SYM cardinality CLASS_NAME','internal_relation',5,'p_internal_relation','parser_tonto.py',171),
-  ('internal_relation -> opt_at cardinality REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME','internal_relation',7,'p_internal_relation','parser_tonto.py',172),
-  ('internal_relation -> opt_at REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME','internal_relation',6,'p_internal_relation','parser_tonto.py',173),
-  ('internal_relation -> REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME','internal_relation',5,'p_internal_relation','parser_tonto.py',174),
-  ('internal_relation -> opt_at REL_SYM CLASS_NAME','internal_relation',3,'p_internal_relation','parser_tonto.py',175),
-  ('datatype_identifier -> NEW_TYPE','datatype_identifier',1,'p_datatype_identifier','parser_tonto.py',195),
-  ('datatype_identifier -> CLASS_NAME','datatype_identifier',1,'p_datatype_identifier','parser_tonto.py',196),
-  ('datatype_target_for_spec -> DATA_TYPE','datatype_target_for_spec',1,'p_datatype_target_for_spec','parser_tonto.py',201),
-  ('datatype_target_for_spec -> NEW_TYPE','datatype_target_for_spec',1,'p_datatype_target_for_spec','parser_tonto.py',202),
-  ('datatype_target_for_spec -> CLASS_NAME','datatype_target_for_spec',1,'p_datatype_target_for_spec','parser_tonto.py',203),
-  ('datatype_decl -> KW_DATATYPE datatype_identifier LBRACE atributos_dt RBRACE','datatype_decl',5,'p_datatype_decl','parser_tonto.py',208),
-  ('datatype_decl -> KW_DATATYPE datatype_identifier KW_SPECIALIZES datatype_target_for_spec','datatype_decl',4,'p_datatype_decl','parser_tonto.py',209),
-  ('atributos_dt -> atributos_dt atributo','atributos_dt',2,'p_atributos_dt','parser_tonto.py',220),
-  ('atributos_dt -> atributo','atributos_dt',1,'p_atributos_dt','parser_tonto.py',221),
-  ('enum_element_name -> CLASS_NAME','enum_element_name',1,'p_enum_element_name','parser_tonto.py',230),
-  ('enum_element_name -> INSTANCE_NAME','enum_element_name',1,'p_enum_element_name','parser_tonto.py',231),
-  ('enum_decl -> KW_ENUM CLASS_NAME LBRACE lista_enum RBRACE','enum_decl',5,'p_enum_decl','parser_tonto.py',236),
-  ('lista_enum -> lista_enum COMMA enum_element_name','lista_enum',3,'p_lista_enum','parser_tonto.py',242),
-  ('lista_enum -> enum_element_name','lista_enum',1,'p_lista_enum','parser_tonto.py',243),
-  ('genset_decl -> genset_inline','genset_decl',1,'p_genset_decl','parser_tonto.py',252),
-  ('genset_decl -> genset_block','genset_decl',1,'p_genset_decl','parser_tonto.py',253),
-  ('genset_modifiers -> KW_DISJOINT KW_COMPLETE','genset_modifiers',2,'p_genset_modifiers','parser_tonto.py',258),
-  ('genset_modifiers -> KW_DISJOINT','genset_modifiers',1,'p_genset_modifiers','parser_tonto.py',259),
-  ('genset_modifiers -> KW_COMPLETE','genset_modifiers',1,'p_genset_modifiers','parser_tonto.py',260),
-  ('genset_modifiers -> empty','genset_modifiers',1,'p_genset_modifiers','parser_tonto.py',261),
-  ('genset_inline -> genset_modifiers KW_GENSET identifier_any KW_WHERE class_list KW_SPECIALIZES CLASS_NAME','genset_inline',7,'p_genset_inline','parser_tonto.py',275),
-  ('genset_block -> genset_modifiers KW_GENSET identifier_any LBRACE general_decl specifics_decl RBRACE','genset_block',7,'p_genset_block','parser_tonto.py',289),
-  ('general_decl -> KW_GENERAL CLASS_NAME','general_decl',2,'p_general_decl','parser_tonto.py',303),
-  ('specifics_decl -> KW_SPECIFICS class_list','specifics_decl',2,'p_specifics_decl','parser_tonto.py',308),
-  ('class_list -> class_list COMMA CLASS_NAME','class_list',3,'p_class_list','parser_tonto.py',313),
-  ('class_list -> CLASS_NAME','class_list',1,'p_class_list','parser_tonto.py',314),
-  ('relation_decl_external -> opt_at KW_RELATION CLASS_NAME cardinality REL_SYM cardinality CLASS_NAME','relation_decl_external',7,'p_relation_decl_external','parser_tonto.py',327),
-  ('relation_decl_external -> opt_at KW_RELATION CLASS_NAME cardinality REL_SYM RELATION_NAME REL_SYM cardinality CLASS_NAME','relation_decl_external',9,'p_relation_decl_external','parser_tonto.py',328),
-  ('relation_decl_external -> RELATION_STEREOTYPE KW_RELATION CLASS_NAME cardinality REL_SYM cardinality CLASS_NAME','relation_decl_external',7,'p_relation_decl_external','parser_tonto.py',329),
-  ('opt_at -> AT RELATION_STEREOTYPE','opt_at',2,'p_opt_at','parser_tonto.py',358),
-  ('opt_at -> RELATION_STEREOTYPE','opt_at',1,'p_opt_at','parser_tonto.py',359),
-  ('opt_at -> empty','opt_at',1,'p_opt_at','parser_tonto.py',360),
-  ('cardinality -> LBRACKET NUMBER RBRACKET','cardinality',3,'p_cardinality','parser_tonto.py',370),
-  ('cardinality -> LBRACKET NUMBER RANGE_DOTS STAR RBRACKET','cardinality',5,'p_cardinality','parser_tonto.py',371),
-  ('cardinality -> LBRACKET NUMBER RANGE_DOTS NUMBER RBRACKET','cardinality',5,'p_cardinality','parser_tonto.py',372),
-  ('cardinality -> LBRACKET STAR RBRACKET','cardinality',3,'p_cardinality','parser_tonto.py',373),
-  ('identifier_any -> CLASS_NAME','identifier_any',1,'p_identifier_any','parser_tonto.py',378),
-  ('identifier_any -> RELATION_NAME','identifier_any',1,'p_identifier_any','parser_tonto.py',379),
-  ('empty -> <empty>','empty',0,'p_empty','parser_tonto.py',384),
-]
@@ -0,0 +1,95 @@
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+# Arquivo gravado por --profile na pasta de saída de cada arquivo analisado
+ARQUIVO_PERFIL = "perfil.json"
+
+
+class Perfil:
+    """
+    Instrumentação por etapa (--profile): para cada bloco `with perfil.etapa(nome)`
+    registra tempo de parede e de CPU, pico de memória alocada no Python
+    (tracemalloc) e as contagens informadas pela etapa. Com pasta_cprofile,
+    cada etapa também grava um <etapa>.prof do cProfile (abrir com pstats
+    ou snakeviz).
+    O tracemalloc deixa a análise algumas vezes mais lenta; os tempos servem
+    para comparar etapas entre si, não com uma execução sem --profile.
+    """
+
+    def __init__(self, arquivo=None, pasta_cprofile=None):
+        # cProfile, tracemalloc e json só são importados quando há perfil (SEM_PERFIL não os carrega)
+        import tracemalloc
+        self._tracemalloc = tracemalloc
+        self.arquivo = arquivo
+        self.pasta_cprofile = pasta_cprofile
+        self.etapas = []
+        self._inicio = time.perf_counter()
+        self._inicio_cpu = time.process_time()
+        self._iniciou_tracemalloc = not tracemalloc.is_tracing()
+        if self._iniciou_tracemalloc:
+            tracemalloc.start()
+
+    @contextmanager
+    def etapa(self, nome):
+        """Mede o bloco; o dict devolvido recebe as contagens da etapa (tokens, classes...)."""
+        contagens = {}
+        tracemalloc = self._tracemalloc
+        perfilador = None
+        if self.pasta_cprofile:
+            import cProfile
+            perfilador = cProfile.Profile()
+        antes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        if perfilador:
+            perfilador.enable()
+        try:
+            yield contagens
+        finally:
+            if perfilador:
+                perfilador.disable()
+            parede, cpu = time.perf_counter() - inicio, time.process_time() - inicio_cpu
+            depois, pico = tracemalloc.get_traced_memory()
+            registro = {
+                "etapa": nome,
+                "parede_s": round(parede, 6),
+                "cpu_s": round(cpu, 6),
+                "memoria_pico_bytes": pico - antes,
+                "memoria_retida_bytes": depois - antes,
+                "contagens": contagens,
+            }
+            if perfilador:
+                os.makedirs(self.pasta_cprofile, exist_ok=True)
+                registro["cprofile"] = os.path.join(self.pasta_cprofile, f"{nome}.prof")
+                perfilador.dump_stats(registro["cprofile"])
+            self.etapas.append(registro)
+
+    def resultado(self):
+        return {
+            "arquivo": self.arquivo,
+            "parede_s": round(time.perf_counter() - self._inicio, 6),
+            "cpu_s": round(time.process_time() - self._inicio_cpu, 6),
+            "etapas": self.etapas,
+        }
+
+    def salvar(self, caminho):
+        """Grava o JSON do perfil e encerra o tracemalloc, se foi este perfil que o iniciou."""
+        import json
+        if self._iniciou_tracemalloc:
+            self._tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.resultado(), f, ensure_ascii=False, indent=2)
+        return caminho
+
+
+class SemPerfil:
+    """Perfil desativado: etapa() só executa o bloco."""
+
+    def etapa(self, nome):
+        return nullcontext({})
+
+
+SEM_PERFIL = SemPerfil()
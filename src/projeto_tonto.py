@@ -0,0 +1,200 @@
+import os
+import glob
+import heapq
+
+from contexto_tonto import ContextoAnalise, nova_sintese, mesclar_sinteses
+from lexico_tonto import ler_codigo, analisar_codigo
+from parser_tonto import analisar_sintaxe
+from semantico_tonto import verificar_semantica
+
+
+class ModuloTonto:
+    """Um arquivo do projeto: nome do módulo, imports e o contexto da sua análise."""
+
+    def __init__(self, caminho, contexto):
+        self.caminho = caminho
+        self.contexto = contexto
+        pacotes = contexto.sintese["pacotes"]
+        # O módulo é identificado pelo pacote declarado ou, na falta dele, pelo nome do arquivo
+        self.nome = pacotes[0] if pacotes else os.path.splitext(os.path.basename(caminho))[0]
+        self.imports = list(dict.fromkeys(contexto.sintese["imports"]))
+
+
+class ResultadoProjeto:
+    def __init__(self):
+        self.modulos = {}
+        # Módulos em ordem topológica; os que estão em um ciclo de import, ou
+        # dependem de um, não têm essa ordem e ficam em em_ciclo (alfabética)
+        self.ordem = []
+        self.em_ciclo = []
+        self.ciclos = []
+        self.ausentes = []
+        self.erros_projeto = []
+        self.sintese = nova_sintese()
+        self.padroes = []
+        self.erros_semanticos = []
+
+
+def analisar_modulo(caminho, cache):
+    """Léxico + sintático de um arquivo; cada arquivo é analisado uma única vez por cache."""
+    chave = os.path.abspath(caminho)
+    if chave not in cache:
+        contexto = ContextoAnalise()
+        codigo = ler_codigo(caminho)
+        _, _, tokens_lidos = analisar_codigo(codigo, contexto)
+        analisar_sintaxe(codigo, tokens_lidos, contexto)
+        cache[chave] = ModuloTonto(caminho, contexto)
+    return cache[chave]
+
+
+def _indexar(caminhos, cache, resultado):
+    """Mapeia nome do pacote e nome do arquivo de cada .tonto para o módulo correspondente."""
+    por_pacote, por_arquivo = {}, {}
+    for caminho in caminhos:
+        modulo = analisar_modulo(caminho, cache)
+        if modulo.nome in por_pacote:
+            resultado.erros_projeto.append(
+                f"Módulo '{modulo.nome}' declarado em '{por_pacote[modulo.nome].caminho}' e em '{caminho}'; "
+                f"usando o primeiro.")
+        por_pacote.setdefault(modulo.nome, modulo)
+        por_arquivo.setdefault(os.path.splitext(os.path.basename(caminho))[0], modulo)
+    return por_pacote, por_arquivo
+
+
+def ordenar_topologicamente(grafo):
+    """
+    Kahn com desempate alfabético: dependências antes de quem as importa.
+    grafo: {modulo: [dependencias]}. Módulos presos em ciclos ficam de fora
+    da ordem e são devolvidos à parte.
+    Retorna (ordem, modulos_em_ciclo).
+    """
+    pendentes = {m: len(deps) for m, deps in grafo.items()}
+    dependentes = {m: [] for m in grafo}
+    for m, deps in grafo.items():
+        for d in deps:
+            dependentes[d].append(m)
+
+    prontos = [m for m, n in pendentes.items() if n == 0]
+    heapq.heapify(prontos)
+    ordem = []
+    while prontos:
+        m = heapq.heappop(prontos)
+        ordem.append(m)
+        for dependente in dependentes[m]:
+            pendentes[dependente] -= 1
+            if pendentes[dependente] == 0:
+                heapq.heappush(prontos, dependente)
+
+    restantes = sorted(m for m, n in pendentes.items() if n > 0)
+    return ordem, restantes
+
+
+def encontrar_ciclos(grafo):
+    """Componentes fortemente conexas (Tarjan, iterativo) que formam ciclos de import."""
+    indice, menor, na_pilha = {}, {}, set()
+    pilha, ciclos = [], []
+    contador = 0
+
+    for raiz in sorted(grafo):
+        if raiz in indice:
+            continue
+        trabalho = [(raiz, iter(grafo[raiz]))]
+        indice[raiz] = menor[raiz] = contador
+        contador += 1
+        pilha.append(raiz)
+        na_pilha.add(raiz)
+
+        while trabalho:
+            no, filhos = trabalho[-1]
+            avancou = False
+            for filho in filhos:
+                if filho not in indice:
+                    indice[filho] = menor[filho] = contador
+                    contador += 1
+                    pilha.append(filho)
+                    na_pilha.add(filho)
+                    trabalho.append((filho, iter(grafo[filho])))
+                    avancou = True
+                    break
+                if filho in na_pilha:
+                    menor[no] = min(menor[no], indice[filho])
+            if avancou:
+                continue
+
+            trabalho.pop()
+            if trabalho:
+                pai = trabalho[-1][0]
+                menor[pai] = min(menor[pai], menor[no])
+            if menor[no] == indice[no]:
+                componente = []
+                while True:
+                    m = pilha.pop()
+                    na_pilha.discard(m)
+                    componente.append(m)
+                    if m == no:
+                        break
+                if len(componente) > 1:
+                    ciclos.append(sorted(componente))
+    return sorted(ciclos)
+
+
+def mesclar_modulos(modulos, resultado):
+    """Junta as sínteses dos módulos (na ordem dada) em um único modelo."""
+    origem_classe = {}
+    for modulo in modulos:
+        parcial = modulo.contexto.sintese
+        for nome in parcial["classes"]:
+            if nome in origem_classe:
+                resultado.erros_projeto.append(
+                    f"Classe '{nome}' definida em '{origem_classe[nome]}' e redefinida em '{modulo.nome}'.")
+            origem_classe[nome] = modulo.nome
+        mesclar_sinteses(resultado.sintese, parcial)
+
+
+def analisar_projeto(caminho, cache=None):
+    """
+    Modo projeto. caminho pode ser um diretório (todos os .tonto dele formam o
+    projeto) ou um arquivo de entrada (o projeto é o que ele importa, direta ou
+    indiretamente, entre os .tonto da mesma pasta). Os imports são resolvidos
+    pelo nome do pacote ou do arquivo; os módulos são analisados uma única vez,
+    ordenados topologicamente e suas sínteses mescladas para o semântico.
+    """
+    cache = {} if cache is None else cache
+    resultado = ResultadoProjeto()
+
+    pasta = caminho if os.path.isdir(caminho) else os.path.dirname(caminho) or "."
+    por_pacote, por_arquivo = _indexar(sorted(glob.glob(os.path.join(pasta, "*.tonto"))), cache, resultado)
+
+    def resolver(nome):
+        return por_pacote.get(nome) or por_arquivo.get(nome)
+
+    if os.path.isdir(caminho):
+        a_visitar = sorted(por_pacote.values(), key=lambda m: m.nome)
+    else:
+        a_visitar = [analisar_modulo(caminho, cache)]
+
+    # Percorre os imports a partir dos módulos iniciais montando o grafo
+    grafo = {}
+    while a_visitar:
+        modulo = a_visitar.pop()
+        if modulo.nome in grafo:
+            continue
+        resultado.modulos[modulo.nome] = modulo
+        grafo[modulo.nome] = []
+        for nome in modulo.imports:
+            importado = resolver(nome)
+            if importado is None:
+                resultado.ausentes.append((modulo.nome, nome))
+            elif importado.nome == modulo.nome:
+                resultado.erros_projeto.append(f"Módulo '{modulo.nome}' importa a si mesmo; import ignorado.")
+            else:
+                grafo[modulo.nome].append(importado.nome)
+                a_visitar.append(importado)
+
+    resultado.ordem, resultado.em_ciclo = ordenar_topologicamente(grafo)
+    resultado.ciclos = encontrar_ciclos(grafo)
+
+    # Módulos em ciclo (ou que dependem de um) são mesclados depois dos demais
+    mesclar_modulos([resultado.modulos[n] for n in resultado.ordem + resultado.em_ciclo], resultado)
+    resultado.padroes, resultado.erros_semanticos = verificar_semantica(resultado.sintese)
+    return resultado
@@ -0,0 +1,103 @@
+import os
+# gzip e tempfile só são importados ao gravar um relatório (Saida): quem só
+# precisa de FORMATOS/ler_formatos (a linha de comando, --format json) não os carrega
+
+# Formatos disponíveis para a tabela de símbolos (--formats)
+FORMATOS = ("txt", "csv", "html")
+
+# Texto acumulado antes de cada gravação no disco
+LIMITE_BUFFER = 1 << 20
+
+# Compressão do --gzip: o nível padrão do gzip, bem mais rápido que o 9 do módulo
+NIVEL_GZIP = 6
+
+# Permissão dos relatórios: a mesma de um open() comum (mkstemp cria com 0600)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def ler_formatos(texto):
+    """'txt,csv' -> ('txt', 'csv'), na ordem de FORMATOS; ValueError se houver formato desconhecido."""
+    pedidos = {f.strip().lower() for f in texto.split(",") if f.strip()}
+    desconhecidos = pedidos - set(FORMATOS)
+    if desconhecidos or not pedidos:
+        raise ValueError(f"formatos inválidos: {', '.join(sorted(desconhecidos)) or texto!r} "
+                         f"(use {', '.join(FORMATOS)})")
+    return tuple(f for f in FORMATOS if f in pedidos)
+
+
+class Saida:
+    """
+    Arquivo de relatório com escrita atômica: o conteúdo vai para um arquivo
+    temporário na mesma pasta e só substitui o relatório em confirmar(), de
+    modo que leitores nunca veem um relatório pela metade. O texto é acumulado
+    e gravado em blocos de ~LIMITE_BUFFER; com comprimir=True o relatório é
+    gravado em gzip (com o sufixo .gz).
+    newline segue open(): None traduz '\n' para os.linesep, '' não traduz.
+    Usada como gerenciador de contexto, confirma ao sair sem exceção e
+    descarta o temporário em caso de erro.
+    """
+
+    def __init__(self, caminho, comprimir=False, newline=None):
+        self.caminho = caminho + ".gz" if comprimir else caminho
+        self._quebra = os.linesep if newline is None else ""
+        self._pedacos = []
+        self._tamanho = 0
+
+        import tempfile
+
+        pasta = os.path.dirname(self.caminho) or "."
+        os.makedirs(pasta, exist_ok=True)
+        fd, self._temporario = tempfile.mkstemp(dir=pasta, prefix="." + os.path.basename(self.caminho) + ".",
+                                                suffix=".tmp")
+        self._bruto = os.fdopen(fd, "wb")
+        if comprimir:
+            import gzip
+            # mtime=0: o mesmo conteúdo gera o mesmo .gz
+            self._arquivo = gzip.GzipFile(fileobj=self._bruto, mode="wb", compresslevel=NIVEL_GZIP, mtime=0)
+        else:
+            self._arquivo = self._bruto
+
+    def write(self, texto):
+        self._pedacos.append(texto)
+        self._tamanho += len(texto)
+        if self._tamanho >= LIMITE_BUFFER:
+            self._descarregar()
+
+    def _descarregar(self):
+        if not self._pedacos:
+            return
+        texto = "".join(self._pedacos)
+        if self._quebra and self._quebra != "\n":
+            texto = texto.replace("\n", self._quebra)
+        self._arquivo.write(texto.encode("utf-8"))
+        self._pedacos.clear()
+        self._tamanho = 0
+
+    def confirmar(self):
+        self._descarregar()
+        if self._arquivo is not self._bruto:
+            self._arquivo.close()
+        self._bruto.close()
+        os.chmod(self._temporario, 0o666 & ~_UMASK)
+        os.replace(self._temporario, self.caminho)
+        return self.caminho
+
+    def descartar(self):
+        try:
+            if self._arquivo is not self._bruto:
+                self._arquivo.close()
+            self._bruto.close()
+        finally:
+            if os.path.exists(self._temporario):
+                os.remove(self._temporario)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        if tipo is None:
+            self.confirmar()
+        else:
+            self.descartar()
+        return False
@@ -1,218 +1,388 @@
-def verificar_semantica(sintese):
+from contexto_tonto import novo_diagnostico
+from estereotipos_tonto import (nome_estereotipo, SORTAIS_ULTIMOS, SORTAIS_DERIVADOS, KIND, SUBKIND, ROLE, PHASE,
+                                RELATOR, MODE, ROLE_MIXIN, MATERIAL, MEDIATION, CHARACTERIZATION,
+                                EXTERNAL_DEPENDENCE)
+
+# Os estereótipos chegam do parser como códigos inteiros (estereotipos_tonto):
+# as verificações comparam códigos e consultam conjuntos de códigos por categoria.
+
+# Estereótipos dos específicos de um genset em cada padrão
+_FILHOS_SUBKIND = frozenset({SUBKIND, KIND})
+_SO_ROLE = frozenset({ROLE})
+_SO_PHASE = frozenset({PHASE})
+
+
+_VAZIO = frozenset()
+
+
+def _fechos(grafo):
+    """
+    Fecho transitivo de um grafo {no: [vizinhos]} em tempo linear no número
+    de componentes fortemente conexas (Tarjan iterativo). Tarjan fecha cada
+    componente depois de todas as que ela alcança, então o fecho de uma
+    componente é a união dos fechos já prontos dos vizinhos; nós de um mesmo
+    ciclo compartilham o mesmo conjunto (e se alcançam).
+    Retorna (fecho {no: frozenset}, ciclos [lista ordenada de nós]).
+    """
+    indice, menor, na_pilha = {}, {}, set()
+    pilha, fecho, ciclos = [], {}, []
+    contador = 0
+
+    for raiz in grafo:
+        if raiz in indice:
+            continue
+        trabalho = [(raiz, iter(grafo[raiz]))]
+        indice[raiz] = menor[raiz] = contador
+        contador += 1
+        pilha.append(raiz)
+        na_pilha.add(raiz)
+
+        while trabalho:
+            no, vizinhos = trabalho[-1]
+            avancou = False
+            for vizinho in vizinhos:
+                if vizinho not in indice:
+                    indice[vizinho] = menor[vizinho] = contador
+                    contador += 1
+                    pilha.append(vizinho)
+                    na_pilha.add(vizinho)
+                    trabalho.append((vizinho, iter(grafo[vizinho])))
+                    avancou = True
+                    break
+                if vizinho in na_pilha:
+                    menor[no] = min(menor[no], indice[vizinho])
+            if avancou:
+                continue
+
+            trabalho.pop()
+            if trabalho:
+                pai = trabalho[-1][0]
+                menor[pai] = min(menor[pai], menor[no])
+            if menor[no] != indice[no]:
+                continue
+
+            if pilha[-1] == no and no not in grafo[no]:
+                # Caso comum: componente de um nó só, fora de ciclo
+                pilha.pop()
+                na_pilha.discard(no)
+                alcancados = set(grafo[no])
+                for vizinho in grafo[no]:
+                    alcancados |= fecho[vizinho]
+                fecho[no] = frozenset(alcancados) if alcancados else _VAZIO
+                continue
+
+            componente = []
+            while True:
+                m = pilha.pop()
+                na_pilha.discard(m)
+                componente.append(m)
+                if m == no:
+                    break
+            membros = set(componente)
+            alcancados = set()
+            for m in componente:
+                for vizinho in grafo[m]:
+                    if vizinho not in membros:
+                        alcancados.add(vizinho)
+                        alcancados |= fecho[vizinho]
+            if len(componente) > 1 or no in grafo[no]:
+                alcancados |= membros
+                ciclos.append(sorted(componente))
+            alcancados = frozenset(alcancados)
+            for m in componente:
+                fecho[m] = alcancados
+    return fecho, sorted(ciclos)
+
+
+class IndiceHierarquia:
+    """
+    Hierarquia de especialização do modelo, juntando as cláusulas
+    `specializes` de cada classe com as arestas geral/específicos dos
+    gensets. Ancestrais (e descendentes, na primeira consulta) são calculados
+    de uma vez para todas as classes; as consultas seguintes são O(1).
+    codigos é {nome da classe: código do estereótipo}.
+    """
+
+    def __init__(self, classes, gensets, codigos):
+        self.classes = classes
+        self.codigos = codigos
+        self.pais = {}
+        self.filhos = {}
+
+        def ligar(filho, pai):
+            pais = self.pais.setdefault(filho, [])
+            if pai not in pais:
+                pais.append(pai)
+                self.filhos.setdefault(pai, []).append(filho)
+            self.pais.setdefault(pai, [])
+            self.filhos.setdefault(filho, [])
+
+        for nome, classe in classes.items():
+            self.pais.setdefault(nome, [])
+            self.filhos.setdefault(nome, [])
+            for pai in classe.heranca:
+                ligar(nome, pai)
+        for g in gensets:
+            for spec in g.especificos:
+                ligar(spec, g.geral)
+
+        self._ancestrais, self.ciclos = _fechos(self.pais)
+        self._descendentes = None
+        self._sortal_ultimo = {}
+        self._por_estereotipo = {}
+
+    def ancestrais(self, nome):
+        return self._ancestrais.get(nome, frozenset())
+
+    def descendentes(self, nome):
+        if self._descendentes is None:
+            self._descendentes, _ = _fechos(self.filhos)
+        return self._descendentes.get(nome, frozenset())
+
+    def sortal_ultimo(self, nome):
+        """
+        O sortal último (kind, collective, quantity, relator, mode ou quality)
+        que fornece identidade a `nome`: a própria classe ou o único ancestral
+        com um desses estereótipos. None se não houver nenhum ou mais de um.
+        """
+        if nome not in self._sortal_ultimo:
+            codigos = self.codigos
+            if codigos.get(nome) in SORTAIS_ULTIMOS:
+                resultado = nome
+            else:
+                candidatos = [a for a in self.ancestrais(nome) if codigos.get(a) in SORTAIS_ULTIMOS]
+                resultado = candidatos[0] if len(candidatos) == 1 else None
+            self._sortal_ultimo[nome] = resultado
+        return self._sortal_ultimo[nome]
+
+    def descendentes_com_estereotipo(self, nome, codigo):
+        """Descendentes de `nome` (em qualquer nível) com o estereótipo de código dado, em ordem alfabética."""
+        chave = (nome, codigo)
+        if chave not in self._por_estereotipo:
+            self._por_estereotipo[chave] = sorted(d for d in self.descendentes(nome)
+                                                  if self.codigos.get(d) == codigo)
+        return self._por_estereotipo[chave]
+
+
+class IndiceModelo:
+    """
+    Índices do modelo, montados uma única vez a partir da síntese:
+    - classes por estereótipo (na ordem de declaração);
+    - gensets por classe geral;
+    - relações externas por estereótipo e origem -> destinos;
+    - hierarquia de especialização (specializes + gensets), ver IndiceHierarquia.
+    Estereótipos são códigos (estereotipos_tonto); `codigos` é
+    {nome da classe: código do estereótipo}.
+    """
+
+    def __init__(self, sintese):
+        self.classes = sintese["classes"]
+        self.gensets = sintese["generalizacoes"]
+
+        self.codigos = {}
+        self.por_estereotipo = {}
+        for nome, classe in self.classes.items():
+            self.codigos[nome] = classe.codigo
+            self.por_estereotipo.setdefault(classe.codigo, []).append(nome)
+
+        self.gensets_por_geral = {}
+        for g in self.gensets:
+            self.gensets_por_geral.setdefault(g.geral, []).append(g)
+
+        self.relacoes_por_origem = {}
+        for rel in sintese["relacoes_externas"]:
+            for codigo in rel.codigos:
+                destinos = self.relacoes_por_origem.setdefault((codigo, rel.origem), set())
+                destinos.add(rel.alvo)
+
+        self.hierarquia = IndiceHierarquia(self.classes, self.gensets, self.codigos)
+
+    def codigo(self, nome):
+        """Código do estereótipo da classe `nome` (None se ela não foi declarada)."""
+        return self.codigos.get(nome)
+
+    def classes_do_estereotipo(self, codigo):
+        return self.por_estereotipo.get(codigo, [])
+
+    def destinos(self, codigo, origem):
+        return self.relacoes_por_origem.get((codigo, origem), set())
+
+
+def _diagnostico(mensagem, codigo, no, linhas=None):
+    """Aviso do semântico posicionado na declaração `no` (sem posição se no for None)."""
+    if no is None or no.linha is None:
+        return novo_diagnostico("semantico", mensagem, codigo=codigo, severidade="aviso")
+    return novo_diagnostico("semantico", mensagem, no.linha, no.inicio, no.fim - no.inicio, codigo=codigo,
+                            severidade="aviso", linhas=linhas)
+
+
+def verificar_semantica(sintese, diagnosticos=None, linhas=None):
     """
     Analisa a estrutura sintática coletada e valida os 6 padrões ODP do Tonto.
     Retorna:
     - padroes_identificados: Lista de strings descrevendo o que foi achado.
     - erros_semanticos: Lista de erros com sugestões de coerção.
+    Com uma lista em diagnosticos, acrescenta a ela um diagnóstico (código
+    SEM*, severidade "aviso") por erro e por relator sem relação material,
+    posicionado na declaração envolvida; com o IndiceLinhas do código em
+    linhas, os diagnósticos também trazem colunas.
     """
-    
-    classes = sintese["classes"]
-    gensets = sintese["generalizacoes"]
-    relacoes_externas = sintese["relacoes_externas"]
-    
-    padroes_identificados = []
-    erros = []
 
-    # =========================================================================
-    # 1. SUBKIND PATTERN
-    # Regra: Kind -> Subkind. Genset deve ser disjoint.
-    # =========================================================================
-    for g in gensets:
-        general = g['general']
-        specifics = g['specifics']
-        modifiers = g['modifiers']
-        
-        # Verifica estereótipos
-        gen_stereo = classes.get(general, {}).get('estereotipo')
-        
-        # Se o pai é Kind
-        if gen_stereo == 'kind':
-            # Verifica se todos os filhos são subkind
-            all_subkinds = True
-            for spec in specifics:
-                spec_stereo = classes.get(spec, {}).get('estereotipo')
-                # Ignora se for kind (erro de modelagem, mas foca no padrao)
-                if spec_stereo != 'subkind' and spec_stereo != 'kind': 
-                     if spec_stereo != 'subkind':
-                         all_subkinds = False
-            
-            # Detecção do Padrão
-            if all_subkinds and specifics:
-                padrao_nome = f"Subkind Pattern ({general} -> {specifics})"
-                
-                if 'disjoint' in modifiers:
-                    padroes_identificados.append(f"[OK] {padrao_nome}")
-                else:
-                    msg = f"Erro no {padrao_nome}: Genset '{g['nome']}' deve ser 'disjoint'."
-                    coercao = f" -> Coerção: Assumindo 'disjoint' implicitamente para validar o padrão."
-                    erros.append(msg + coercao)
-                    padroes_identificados.append(f"[COERGIDO] {padrao_nome}")
+    indice = IndiceModelo(sintese)
+    classes = indice.classes
+    hierarquia = indice.hierarquia
 
     # =========================================================================
-    # 2. ROLE PATTERN
-    # Regra: Kind -> Role. Disjoint NÃO se aplica (não é obrigatório/comum).
+    # 0. CICLOS DE ESPECIALIZAÇÃO (specializes + gensets)
     # =========================================================================
-    for g in gensets:
-        general = g['general']
-        specifics = g['specifics']
-        # modifiers = g['modifiers'] # Não usamos para validar erro aqui, pois é opcional
-        gen_stereo = classes.get(general, {}).get('estereotipo')
-
-        if gen_stereo == 'kind':
-            # Verifica se filhos são role
-            all_roles = True
-            for spec in specifics:
-                if classes.get(spec, {}).get('estereotipo') != 'role':
-                    all_roles = False
-            
-            if all_roles and specifics:
-                padrao_nome = f"Role Pattern ({general} -> {specifics})"
-                padroes_identificados.append(f"[OK] {padrao_nome}")
+    ciclo_erros = []
+    for ciclo in hierarquia.ciclos:
+        msg = f"Ciclo de especialização entre {ciclo}: uma classe não pode especializar a si mesma."
+        coercao = " -> Coerção: Tratando as classes do ciclo como equivalentes na hierarquia."
+        ciclo_erros.append((msg + coercao, "SEM001", classes.get(ciclo[0])))
+
+    # Cada padrão acumula em sua própria lista; o relatório mantém a ordem
+    # Subkind, Role, Phase, Relator, Mode, RoleMixin
+    subkind_padroes, subkind_erros = [], []
+    role_padroes = []
+    phase_padroes, phase_erros = [], []
 
     # =========================================================================
-    # 3. PHASE PATTERN
-    # Regra: Kind -> Phase. Disjoint é MANDATÓRIO.
+    # 1-3. SUBKIND, ROLE E PHASE PATTERNS (uma passada pelos gensets)
+    # Subkind: Kind -> Subkind. Genset deve ser disjoint.
+    # Role: Kind -> Role. Disjoint NÃO se aplica (não é obrigatório/comum).
+    # Phase: Kind -> Phase. Disjoint é MANDATÓRIO.
+    # O general pode estar em qualquer nível abaixo do Kind (ex.: subkinds de
+    # um subkind, fases de uma fase), desde que seu sortal último seja um Kind.
     # =========================================================================
-    for g in gensets:
-        general = g['general']
-        specifics = g['specifics']
-        modifiers = g['modifiers']
-        gen_stereo = classes.get(general, {}).get('estereotipo')
-
-        if gen_stereo == 'kind':
-            all_phases = True
-            for spec in specifics:
-                if classes.get(spec, {}).get('estereotipo') != 'phase':
-                    all_phases = False
-            
-            if all_phases and specifics:
-                padrao_nome = f"Phase Pattern ({general} -> {specifics})"
-                if 'disjoint' in modifiers:
-                    padroes_identificados.append(f"[OK] {padrao_nome}")
-                else:
-                    msg = f"Erro no {padrao_nome}: Genset '{g['nome']}' de fases DEVE ser 'disjoint'."
-                    coercao = f" -> Coerção: Inserindo 'disjoint' no genset para prosseguir."
-                    erros.append(msg + coercao)
-                    padroes_identificados.append(f"[COERGIDO] {padrao_nome}")
+    codigos = indice.codigos
+    for g in indice.gensets:
+        general = g.geral
+        specifics = g.especificos
+        modifiers = g.modificadores
+        gen_stereo = codigos.get(general)
+
+        if not specifics:
+            continue
+        if gen_stereo != KIND and not (gen_stereo in SORTAIS_DERIVADOS and
+                                       codigos.get(hierarquia.sortal_ultimo(general)) == KIND):
+            continue
+
+        estereotipos_filhos = {codigos.get(spec) for spec in specifics}
+
+        # Filhos kind são ignorados no Subkind (erro de modelagem, mas foca no padrão);
+        # subkinds (rígidos) não especializam roles nem phases
+        if estereotipos_filhos <= _FILHOS_SUBKIND and (gen_stereo == KIND or gen_stereo == SUBKIND):
+            padrao_nome = f"Subkind Pattern ({general} -> {specifics})"
+            if 'disjoint' in modifiers:
+                subkind_padroes.append(f"[OK] {padrao_nome}")
+            else:
+                msg = f"Erro no {padrao_nome}: Genset '{g.nome}' deve ser 'disjoint'."
+                coercao = f" -> Coerção: Assumindo 'disjoint' implicitamente para validar o padrão."
+                subkind_erros.append((msg + coercao, "SEM002", g))
+                subkind_padroes.append(f"[COERGIDO] {padrao_nome}")
+
+        elif estereotipos_filhos == _SO_ROLE:
+            padrao_nome = f"Role Pattern ({general} -> {specifics})"
+            role_padroes.append(f"[OK] {padrao_nome}")
+
+        elif estereotipos_filhos == _SO_PHASE:
+            padrao_nome = f"Phase Pattern ({general} -> {specifics})"
+            if 'disjoint' in modifiers:
+                phase_padroes.append(f"[OK] {padrao_nome}")
+            else:
+                msg = f"Erro no {padrao_nome}: Genset '{g.nome}' de fases DEVE ser 'disjoint'."
+                coercao = f" -> Coerção: Inserindo 'disjoint' no genset para prosseguir."
+                phase_erros.append((msg + coercao, "SEM003", g))
+                phase_padroes.append(f"[COERGIDO] {padrao_nome}")
+
+    padroes_identificados = subkind_padroes + role_padroes + phase_padroes
+    erros = ciclo_erros + subkind_erros + phase_erros
+    # Relatores sem relação material: só viram diagnóstico (no relatório são padrões [AVISO])
+    avisos = []
 
     # =========================================================================
     # 4. RELATOR PATTERN
     # Relator --(mediation)--> Role --(specializes)--> Kind
     # E deve haver uma Material Relation conectando os Roles
     # =========================================================================
-    relators = [name for name, data in classes.items() if data.get('estereotipo') == 'relator']
-    
-    for relator in relators:
-        # Busca relações internas de mediação
-        rels_internas = classes[relator].get('relacoes_internas', [])
-        # Filtra as mediações. Formato parser: ('relacao_interna', {target, stereotypes, ...})
-        mediations = []
-        for r in rels_internas:
-            dados = r[1]
-            stereos = dados.get('stereotypes', [])
-            # Normaliza esteriotipos (pode vir com @ ou sem)
-            stereos_clean = [s.replace('@', '') for s in stereos if s]
-            if 'mediation' in stereos_clean:
-                mediations.append(dados['target'])
-        
+    for relator in indice.classes_do_estereotipo(RELATOR):
+        mediations = [rel for rel in classes[relator].relacoes_internas if MEDIATION in rel.codigos]
+
         # Validar alvos das mediações (Devem ser Roles)
         roles_envolvidos = []
-        for target in mediations:
-            t_stereo = classes.get(target, {}).get('estereotipo')
-            if t_stereo == 'role':
-                roles_envolvidos.append(target)
-            else:
-                msg = f"Erro no Relator Pattern '{relator}': Mediação aponta para '{target}' que é '{t_stereo}', esperava-se 'role'."
+        for mediacao in mediations:
+            target = mediacao.alvo
+            t_stereo = codigos.get(target)
+            if t_stereo != ROLE:
+                msg = f"Erro no Relator Pattern '{relator}': Mediação aponta para '{target}' que é '{nome_estereotipo(t_stereo)}', esperava-se 'role'."
                 coercao = f" -> Coerção: Tratando '{target}' como Role temporariamente."
-                erros.append(msg + coercao)
-                roles_envolvidos.append(target) # Coerção: aceita na lista para verificar o resto
-        
+                erros.append((msg + coercao, "SEM004", mediacao))
+            # Coerção: aceita na lista para verificar o resto
+            roles_envolvidos.append(target)
+
         if len(roles_envolvidos) >= 2:
-            # Verifica Material Relation entre os Roles
-            has_material = False
-            
-            # Checa externas
-            for rel_ext in relacoes_externas:
-                # rel_ext é dict {source, target, stereotypes...}
-                stereos = [s.replace('@', '') for s in rel_ext.get('stereotypes', []) if s]
-                if 'material' in stereos:
-                    # Verifica se conecta dois roles da lista
-                    if rel_ext.get('source') in roles_envolvidos and rel_ext.get('target') in roles_envolvidos:
-                        has_material = True
-            
+            # Material Relation externa entre dois roles da lista
+            conjunto_roles = set(roles_envolvidos)
+            has_material = any(not indice.destinos(MATERIAL, role).isdisjoint(conjunto_roles)
+                               for role in conjunto_roles)
+
             padrao_nome = f"Relator Pattern ({relator} conecta {roles_envolvidos})"
             if has_material:
                 padroes_identificados.append(f"[OK] {padrao_nome}")
             else:
                 # Material relation é parte do padrão completo, mas às vezes implícita
                 padroes_identificados.append(f"[AVISO] {padrao_nome}: Relação Material explícita entre os roles não encontrada.")
+                avisos.append((f"{padrao_nome}: Relação Material explícita entre os roles não encontrada.",
+                               "SEM007", classes[relator]))
 
     # =========================================================================
     # 5. MODE PATTERN
     # Mode --(characterization)--> Kind
     # Mode --(externalDependence)--> Kind (outro)
     # =========================================================================
-    modes = [name for name, data in classes.items() if data.get('estereotipo') == 'mode']
-    
-    for mode in modes:
-        rels = classes[mode].get('relacoes_internas', [])
-        has_charac = False
-        has_ext_dep = False
-        
-        for r in rels:
-            dados = r[1]
-            stereos = [s.replace('@', '') for s in dados.get('stereotypes', []) if s]
-            
-            if 'characterization' in stereos:
-                has_charac = True
-            if 'externalDependence' in stereos:
-                has_ext_dep = True
-        
+    for mode in indice.classes_do_estereotipo(MODE):
+        stereos = set()
+        for rel in classes[mode].relacoes_internas:
+            stereos.update(rel.codigos)
+
         padrao_nome = f"Mode Pattern ({mode})"
-        if has_charac: 
-            if has_ext_dep:
+        if CHARACTERIZATION in stereos:
+            if EXTERNAL_DEPENDENCE in stereos:
                 padroes_identificados.append(f"[OK] {padrao_nome} completo.")
             else:
                 msg = f"Padrão Mode '{mode}' incompleto: Falta @externalDependence."
                 coercao = " -> Coerção: Marcando como Mode Pattern Parcial."
-                erros.append(msg + coercao)
+                erros.append((msg + coercao, "SEM005", classes[mode]))
                 padroes_identificados.append(f"[PARCIAL] {padrao_nome}")
 
     # =========================================================================
     # 6. ROLE MIXIN PATTERN
-    # RoleMixin especializado por Roles. Roles especializam Kinds. 
+    # RoleMixin especializado por Roles. Roles especializam Kinds.
     # Genset do RoleMixin deve ser disjoint e complete.
     # =========================================================================
-    rolemixins = [name for name, data in classes.items() if data.get('estereotipo') == 'roleMixin']
-    
-    for rm in rolemixins:
-        # Achar genset onde rm é o general
-        genset_rm = None
-        for g in gensets:
-            if g['general'] == rm:
-                genset_rm = g
-                break
-        
-        if genset_rm:
-            specifics = genset_rm['specifics']
-            modifiers = genset_rm['modifiers']
-            
-            # Checa se specifics são Roles
-            all_roles = True
-            for spec in specifics:
-                if classes.get(spec, {}).get('estereotipo') != 'role':
-                    all_roles = False
-            
-            if all_roles:
-                padrao_nome = f"RoleMixin Pattern ({rm} -> {specifics})"
-                
-                # Checa modificadores
-                if 'disjoint' in modifiers and 'complete' in modifiers:
-                    padroes_identificados.append(f"[OK] {padrao_nome}")
-                else:
-                    msg = f"Erro no {padrao_nome}: Genset de RoleMixin DEVE ser 'disjoint' e 'complete'."
-                    coercao = f" -> Coerção: Assumindo {['disjoint', 'complete']} para validar."
-                    erros.append(msg + coercao)
-                    padroes_identificados.append(f"[COERGIDO] {padrao_nome}")
-
-    return padroes_identificados, erros
\ No newline at end of file
+    for rm in indice.classes_do_estereotipo(ROLE_MIXIN):
+        # Primeiro genset em que rm é o general
+        gensets_rm = indice.gensets_por_geral.get(rm)
+        if not gensets_rm:
+            continue
+        specifics = gensets_rm[0].especificos
+        modifiers = gensets_rm[0].modificadores
+
+        # Checa se specifics são Roles
+        if all(codigos.get(spec) == ROLE for spec in specifics):
+            padrao_nome = f"RoleMixin Pattern ({rm} -> {specifics})"
+
+            # Checa modificadores
+            if 'disjoint' in modifiers and 'complete' in modifiers:
+                padroes_identificados.append(f"[OK] {padrao_nome}")
+            else:
+                msg = f"Erro no {padrao_nome}: Genset de RoleMixin DEVE ser 'disjoint' e 'complete'."
+                coercao = f" -> Coerção: Assumindo {['disjoint', 'complete']} para validar."
+                erros.append((msg + coercao, "SEM006", gensets_rm[0]))
+                padroes_identificados.append(f"[COERGIDO] {padrao_nome}")
+
+    if diagnosticos is not None:
+        for mensagem, codigo, no in erros + avisos:
+            diagnosticos.append(_diagnostico(mensagem, codigo, no, linhas))
+    return padroes_identificados, [mensagem for mensagem, _, _ in erros]
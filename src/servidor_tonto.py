@@ -0,0 +1,612 @@
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import socket
+import argparse
+import threading
+import http.client
+import socketserver
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as EsperaEsgotada
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from contexto_tonto import ContextoAnalise, analisar_documento
+from lexico_tonto import ler_codigo, build_lexer, BACKENDS
+from parser_tonto import construir_parser
+from ast_tonto import nos_da_sintese
+
+# Servidor local de análise: JSON-RPC 2.0 sobre HTTP, em uma porta TCP local
+# ou em um socket Unix. Os processos do pool já têm as tabelas do lexer e do
+# parser carregadas, então cada pedido paga só a análise, e não o import do
+# PLY nem a leitura das tabelas como uma execução de main.py.
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+# Limites superiores (ms) das faixas do histograma de latência; a última faixa não tem limite
+FAIXAS_LATENCIA_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Códigos de erro do JSON-RPC 2.0
+ERRO_JSON, PEDIDO_INVALIDO, METODO_INEXISTENTE, PARAMETROS_INVALIDOS, ERRO_INTERNO = (
+    -32700, -32600, -32601, -32602, -32603)
+# Erros do servidor (faixa -32000 a -32099): arquivo ilegível, tempo esgotado
+ERRO_ARQUIVO, TEMPO_ESGOTADO = -32001, -32002
+
+
+# ================================================================
+# 1. ANÁLISE (executada nos processos do pool)
+# ================================================================
+
+def analisar_pedido(params):
+    """
+    Parâmetros do método "analisar" -> resultado JSON: {"caminho": ...} ou
+    {"codigo": ...}, e opcionalmente "lexer" ("ply" ou "fast"). Os
+    diagnósticos têm os mesmos campos dos registros de --format json.
+    ValueError para parâmetros inválidos; OSError se o arquivo não pôde ser lido.
+    """
+    if not isinstance(params, dict):
+        raise ValueError("params deve ser um objeto")
+    caminho, codigo = params.get("caminho"), params.get("codigo")
+    if (caminho is None) == (codigo is None):
+        raise ValueError('informe "caminho" ou "codigo"')
+    for nome, valor in (("caminho", caminho), ("codigo", codigo)):
+        if valor is not None and not isinstance(valor, str):
+            raise ValueError(f'"{nome}" deve ser uma string')
+    lexer = params.get("lexer", "ply")
+    if lexer not in BACKENDS:
+        raise ValueError(f"lexer inválido: {lexer!r} (use {', '.join(BACKENDS)})")
+    if codigo is None:
+        codigo = ler_codigo(caminho)
+
+    contexto = analisar_documento(codigo, ContextoAnalise(lexer))
+    sintese = contexto.sintese
+    return {
+        "arquivo": caminho,
+        "tokens": len(contexto.tabela),
+        "pacotes": sintese["pacotes"],
+        "imports": sintese["imports"],
+        "declaracoes": [no.como_dict() for no in sorted(nos_da_sintese(sintese), key=lambda no: no.inicio)],
+        "padroes": contexto.padroes,
+        "diagnosticos": [
+            {"codigo": d["codigo"], "severidade": d["severidade"], "etapa": d["etapa"], "linha": d["linha"],
+             "coluna": d["coluna"], "linha_fim": d["linha_fim"], "coluna_fim": d["coluna_fim"],
+             "posicao": d["posicao"], "tamanho": d["tamanho"], "mensagem": d["mensagem"]}
+            for d in contexto.diagnosticos
+        ],
+    }
+
+
+def _analisar_lote(lote):
+    """
+    Analisa um lote de pedidos; cada item vira (True, resultado) ou
+    (False, código, mensagem), de forma independente dos demais.
+    """
+    respostas = []
+    for params in lote:
+        try:
+            respostas.append((True, analisar_pedido(params)))
+        except OSError as e:
+            respostas.append((False, ERRO_ARQUIVO, str(e)))
+        except ValueError as e:
+            respostas.append((False, PARAMETROS_INVALIDOS, str(e)))
+        except Exception as e:
+            # Um pedido que quebra a análise não derruba os outros pedidos do lote
+            respostas.append((False, ERRO_INTERNO, f"{type(e).__name__}: {e}"))
+    return respostas
+
+
+def _aquecer():
+    construir_parser()
+    build_lexer()
+
+
+def _iniciar_worker():
+    # Ctrl+C chega a todo o grupo de processos: quem encerra os workers é o servidor (Despachante.fechar)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Com fork os workers já herdam as tabelas; com spawn, cada worker as carrega uma vez ao iniciar
+    _aquecer()
+
+
+# ================================================================
+# 2. FILA, LOTES E MÉTRICAS
+# ================================================================
+
+class Metricas:
+    """Contadores do servidor e histograma de latência (da chegada do pedido à resposta)."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.inicio = time.monotonic()
+        self.pedidos = 0
+        self.erros = 0
+        self.lotes = 0
+        self.segundos = 0.0
+        self.faixas = [0] * (len(FAIXAS_LATENCIA_MS) + 1)
+
+    def registrar(self, segundos, erro=False):
+        milissegundos = segundos * 1000
+        faixa = next((i for i, limite in enumerate(FAIXAS_LATENCIA_MS) if milissegundos <= limite),
+                     len(FAIXAS_LATENCIA_MS))
+        with self._trava:
+            self.pedidos += 1
+            self.erros += erro
+            self.segundos += segundos
+            self.faixas[faixa] += 1
+
+    def registrar_lote(self):
+        with self._trava:
+            self.lotes += 1
+
+    def como_dict(self):
+        with self._trava:
+            return {
+                "tempo_ativo_s": round(time.monotonic() - self.inicio, 3),
+                "pedidos": self.pedidos,
+                "erros": self.erros,
+                "lotes": self.lotes,
+                "latencia_media_ms": round(self.segundos * 1000 / self.pedidos, 3) if self.pedidos else None,
+                "latencia_ms": [{"ate_ms": limite, "pedidos": n}
+                                for limite, n in zip(FAIXAS_LATENCIA_MS + (None,), self.faixas)],
+            }
+
+
+class _Lote:
+    """Pedidos enviados juntos a um worker: (params, Future, chegada) de cada um, prazo e tentativas."""
+
+    __slots__ = ('itens', 'prazo', 'tentativas')
+
+    def __init__(self, itens):
+        self.itens = itens
+        self.prazo = None
+        self.tentativas = 0
+
+
+def _encerrar_executor(executor):
+    # O executor não interrompe uma tarefa em andamento: seus processos são terminados à força
+    for processo in list((executor._processes or {}).values()):
+        processo.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Despachante:
+    """
+    Repassa os pedidos de análise a um pool de processos. Cada worker livre
+    recebe de uma vez tudo o que está na fila (até `lote` pedidos): com pouca
+    carga, cada pedido segue sozinho e sem espera; sob carga, os pedidos que
+    chegaram enquanto os workers estavam ocupados viajam juntos, e o custo de
+    comunicação com o pool é pago uma vez por lote.
+    Um worker que morre quebra o pool, e um lote que passa de `tempo_limite`
+    segundos recebe TEMPO_ESGOTADO e faz o pool ser encerrado: nos dois casos
+    um pool novo assume, os lotes que estavam nos outros workers são enviados
+    de novo (uma vez) e nenhum worker nem vaga do pool fica perdido.
+    """
+
+    def __init__(self, workers=None, lote=16, tempo_limite=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.lote = lote
+        self.tempo_limite = tempo_limite
+        self.metricas = Metricas()
+        self.reinicios = 0
+        self._fila = queue.Queue()
+        self._livres = threading.Semaphore(self.workers)
+        self._trava = threading.Lock()
+        self._fechado = threading.Event()
+        # Future do executor -> (lote, executor que o recebeu)
+        self._pendentes = {}
+        self.em_andamento = 0
+        # Tabelas prontas antes do pool: com fork os workers já nascem aquecidos
+        _aquecer()
+        self._executor = self._novo_executor()
+        self._despacho = threading.Thread(target=self._despachar, daemon=True)
+        self._despacho.start()
+        if tempo_limite:
+            threading.Thread(target=self._vigiar, daemon=True).start()
+
+    def _novo_executor(self):
+        return ProcessPoolExecutor(self.workers, initializer=_iniciar_worker)
+
+    def enviar(self, params):
+        """Enfileira um pedido "analisar"; retorna um Future com (True, resultado) ou (False, código, mensagem)."""
+        futuro = Future()
+        self._fila.put((params, futuro, time.perf_counter()))
+        return futuro
+
+    @property
+    def fila(self):
+        return self._fila.qsize()
+
+    def _despachar(self):
+        while True:
+            self._livres.acquire()
+            item = self._fila.get()
+            if item is None:
+                return
+            lote = [item]
+            while len(lote) < self.lote:
+                try:
+                    item = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._fila.put(None)
+                    break
+                lote.append(item)
+            with self._trava:
+                self.em_andamento += len(lote)
+            self.metricas.registrar_lote()
+            self._submeter(_Lote(lote))
+
+    def _submeter(self, lote):
+        params = [p for p, _, _ in lote.itens]
+        with self._trava:
+            if self._fechado.is_set():
+                return
+            lote.prazo = time.monotonic() + self.tempo_limite if self.tempo_limite else None
+            try:
+                tarefa = self._executor.submit(_analisar_lote, params)
+            except BrokenProcessPool:
+                # O pool quebrou depois do último lote: um novo assume já
+                velho, self._executor = self._executor, self._novo_executor()
+                self.reinicios += 1
+                tarefa = self._executor.submit(_analisar_lote, params)
+            else:
+                velho = None
+            self._pendentes[tarefa] = (lote, self._executor)
+        if velho is not None:
+            _encerrar_executor(velho)
+        tarefa.add_done_callback(self._ao_terminar)
+
+    def _trocar_executor(self, executor):
+        """Põe um pool novo no lugar de `executor` (se ele ainda é o atual) e encerra o antigo."""
+        with self._trava:
+            if self._executor is not executor or self._fechado.is_set():
+                return
+            self._executor = self._novo_executor()
+            self.reinicios += 1
+        _encerrar_executor(executor)
+
+    def _ao_terminar(self, tarefa):
+        with self._trava:
+            pendente = self._pendentes.pop(tarefa, None)
+        if pendente is None:
+            # Já respondido pelo prazo (ou o servidor está fechando)
+            return
+        lote, executor = pendente
+        if tarefa.cancelled():
+            # Ainda na fila de um pool encerrado por causa de outro lote: vai para o pool novo
+            self._submeter(lote)
+            return
+        erro = tarefa.exception()
+        if erro is None:
+            self._concluir(lote, tarefa.result())
+            return
+        if isinstance(erro, BrokenProcessPool):
+            self._trocar_executor(executor)
+            # Não dá para saber qual lote derrubou o worker: cada um tem mais uma chance
+            if lote.tentativas == 0 and not self._fechado.is_set():
+                lote.tentativas += 1
+                self._submeter(lote)
+                return
+            self._concluir(lote, erro=f"worker encerrado durante a análise ({type(erro).__name__})")
+            return
+        self._concluir(lote, erro=f"{type(erro).__name__}: {erro}")
+
+    def _vigiar(self):
+        intervalo = min(1.0, self.tempo_limite / 4)
+        while not self._fechado.wait(intervalo):
+            agora = time.monotonic()
+            with self._trava:
+                vencidos = [(tarefa, lote, executor) for tarefa, (lote, executor) in self._pendentes.items()
+                            if lote.prazo is not None and lote.prazo < agora]
+                for tarefa, _, _ in vencidos:
+                    del self._pendentes[tarefa]
+            for _, lote, executor in vencidos:
+                self._concluir(lote, erro="tempo esgotado", codigo=TEMPO_ESGOTADO)
+                # O worker continua preso no lote: só um pool novo o libera
+                self._trocar_executor(executor)
+
+    def _concluir(self, lote, respostas=None, erro=None, codigo=ERRO_INTERNO):
+        if respostas is None:
+            respostas = [(False, codigo, erro)] * len(lote.itens)
+        agora = time.perf_counter()
+        for (_, futuro, inicio), resposta in zip(lote.itens, respostas):
+            self.metricas.registrar(agora - inicio, erro=not resposta[0])
+            futuro.set_result(resposta)
+        with self._trava:
+            self.em_andamento -= len(lote.itens)
+        self._livres.release()
+
+    def saude(self):
+        return {"status": "ok", "workers": self.workers, "pid": os.getpid()}
+
+    def estado(self):
+        with self._trava:
+            em_andamento = self.em_andamento
+            reinicios = self.reinicios
+        return {**self.metricas.como_dict(), "fila": self.fila, "em_andamento": em_andamento,
+                "workers": self.workers, "lote_maximo": self.lote, "reinicios_pool": reinicios}
+
+    def fechar(self):
+        self._fechado.set()
+        self._fila.put(None)
+        with self._trava:
+            executor = self._executor
+            self._pendentes.clear()
+        _encerrar_executor(executor)
+
+
+# ================================================================
+# 3. SERVIDOR (JSON-RPC sobre HTTP)
+# ================================================================
+
+def _erro(id_pedido, codigo, mensagem):
+    return {"jsonrpc": "2.0", "id": id_pedido, "error": {"code": codigo, "message": mensagem}}
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    """
+    POST / com um pedido JSON-RPC (ou uma lista deles): métodos "analisar",
+    "saude" e "metricas". GET /saude e GET /metricas devolvem o mesmo que os
+    métodos, para sondas que não falam JSON-RPC. Conexões persistentes (HTTP/1.1).
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _enviar(self, status, corpo=None):
+        """Responde com `corpo` em JSON; sem corpo (só notificações), com 204."""
+        if corpo is None:
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_GET(self):
+        despachante = self.server.despachante
+        if self.path == "/saude":
+            self._enviar(200, despachante.saude())
+        elif self.path == "/metricas":
+            self._enviar(200, despachante.estado())
+        else:
+            self._enviar(404, {"erro": f"caminho desconhecido: {self.path}"})
+
+    def do_POST(self):
+        try:
+            mensagem = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError as e:
+            self._enviar(200, _erro(None, ERRO_JSON, f"JSON inválido: {e}"))
+            return
+        if isinstance(mensagem, list):
+            if not mensagem:
+                self._enviar(200, _erro(None, PEDIDO_INVALIDO, "lote vazio"))
+                return
+            # Todos os pedidos do lote entram na fila antes de esperar qualquer resposta
+            pendentes = [self._iniciar(m) for m in mensagem]
+            respostas = [r for r in map(self._terminar, pendentes) if r is not None]
+            self._enviar(200, respostas or None)
+        else:
+            self._enviar(200, self._terminar(self._iniciar(mensagem)))
+
+    def _iniciar(self, mensagem):
+        """
+        Pedido -> (id, Future, notificação) para "analisar" e (id, resposta
+        pronta, notificação) para os demais. Notificações (sem "id") são
+        executadas, mas não recebem resposta.
+        """
+        despachante = self.server.despachante
+        if not isinstance(mensagem, dict) or mensagem.get("jsonrpc") != "2.0" or "method" not in mensagem:
+            return None, _erro(None, PEDIDO_INVALIDO, "pedido JSON-RPC 2.0 inválido"), False
+        id_pedido, metodo, notificacao = mensagem.get("id"), mensagem["method"], "id" not in mensagem
+        if metodo == "analisar":
+            resposta = despachante.enviar(mensagem.get("params") or {})
+        elif metodo == "saude":
+            resposta = {"jsonrpc": "2.0", "id": id_pedido, "result": despachante.saude()}
+        elif metodo == "metricas":
+            resposta = {"jsonrpc": "2.0", "id": id_pedido, "result": despachante.estado()}
+        else:
+            resposta = _erro(id_pedido, METODO_INEXISTENTE, f"Método não suportado: {metodo}")
+        return id_pedido, resposta, notificacao
+
+    def _terminar(self, pendente):
+        id_pedido, resposta, notificacao = pendente
+        if isinstance(resposta, Future):
+            try:
+                resposta = resposta.result(self.server.tempo_limite)
+            except EsperaEsgotada:
+                resposta = (False, TEMPO_ESGOTADO, "tempo esgotado")
+            if resposta[0]:
+                resposta = {"jsonrpc": "2.0", "id": id_pedido, "result": resposta[1]}
+            else:
+                resposta = _erro(id_pedido, resposta[1], resposta[2])
+        return None if notificacao else resposta
+
+
+class ServidorHTTP(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class ServidorUnix(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def criar_servidor(despachante, socket_unix=None, host=HOST_PADRAO, porta=PORTA_PADRAO, tempo_limite=60.0):
+    """Servidor HTTP no socket Unix `socket_unix` ou em host:porta (porta 0 escolhe uma livre)."""
+    if socket_unix:
+        servidor = ServidorUnix(socket_unix, _Manipulador)
+    else:
+        servidor = ServidorHTTP((host, porta), _Manipulador)
+    servidor.despachante = despachante
+    servidor.tempo_limite = tempo_limite
+    return servidor
+
+
+def servir(socket_unix=None, host=HOST_PADRAO, porta=PORTA_PADRAO, workers=None, lote=16, tempo_limite=60.0):
+    despachante = Despachante(workers, lote, tempo_limite)
+    servidor = criar_servidor(despachante, socket_unix, host, porta, tempo_limite)
+    endereco = socket_unix or f"http://{servidor.server_address[0]}:{servidor.server_address[1]}"
+    print(f"Servidor TONTO em {endereco} (workers={despachante.workers}, lote={lote}); Ctrl+C para sair",
+          flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        despachante.fechar()
+
+
+# ================================================================
+# 4. CLIENTE
+# ================================================================
+
+class ErroServidor(Exception):
+    """Erro JSON-RPC devolvido pelo servidor; `codigo` é o código do erro."""
+
+    def __init__(self, codigo, mensagem):
+        super().__init__(mensagem)
+        self.codigo = codigo
+
+
+class _ConexaoUnix(http.client.HTTPConnection):
+    def __init__(self, caminho, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.caminho = caminho
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.caminho)
+
+
+class ClienteTonto:
+    """Cliente do servidor, com uma conexão persistente (não compartilhar entre threads)."""
+
+    def __init__(self, socket_unix=None, host=HOST_PADRAO, porta=PORTA_PADRAO, tempo_limite=120.0):
+        if socket_unix:
+            self._conexao = _ConexaoUnix(socket_unix, tempo_limite)
+        else:
+            self._conexao = http.client.HTTPConnection(host, porta, timeout=tempo_limite)
+        self._proximo_id = 0
+
+    def _pedir(self, metodo, caminho, corpo=None):
+        dados = None if corpo is None else json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        cabecalhos = {"Content-Type": "application/json"} if dados is not None else {}
+        self._conexao.request(metodo, caminho, dados, cabecalhos)
+        resposta = self._conexao.getresponse()
+        conteudo = resposta.read()
+        return json.loads(conteudo) if conteudo else None
+
+    def _mensagem(self, metodo, params=None):
+        self._proximo_id += 1
+        return {"jsonrpc": "2.0", "id": self._proximo_id, "method": metodo, "params": params or {}}
+
+    @staticmethod
+    def _resultado(resposta):
+        if "error" in resposta:
+            raise ErroServidor(resposta["error"]["code"], resposta["error"]["message"])
+        return resposta["result"]
+
+    def chamar(self, metodo, params=None):
+        return self._resultado(self._pedir("POST", "/", self._mensagem(metodo, params)))
+
+    def chamar_lote(self, chamadas):
+        """[(método, params), ...] em um único pedido JSON-RPC; retorna os resultados na mesma ordem,
+        com uma ErroServidor no lugar de cada pedido que falhou."""
+        mensagens = [self._mensagem(metodo, params) for metodo, params in chamadas]
+        respostas = {r["id"]: r for r in self._pedir("POST", "/", mensagens)}
+        resultados = []
+        for mensagem in mensagens:
+            try:
+                resultados.append(self._resultado(respostas[mensagem["id"]]))
+            except ErroServidor as e:
+                resultados.append(e)
+        return resultados
+
+    def analisar(self, caminho=None, codigo=None, lexer="ply"):
+        params = {"lexer": lexer}
+        if caminho is not None:
+            params["caminho"] = os.path.abspath(caminho)
+        if codigo is not None:
+            params["codigo"] = codigo
+        return self.chamar("analisar", params)
+
+    def saude(self):
+        return self._pedir("GET", "/saude")
+
+    def metricas(self):
+        return self._pedir("GET", "/metricas")
+
+    def fechar(self):
+        self._conexao.close()
+
+
+def _adicionar_endereco(parser):
+    parser.add_argument("--socket", help="Socket Unix do servidor (em vez de host:porta)")
+    parser.add_argument("--host", default=HOST_PADRAO)
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de análise TONTO (JSON-RPC sobre HTTP)")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p_servir = comandos.add_parser("servir", help="Inicia o servidor")
+    _adicionar_endereco(p_servir)
+    p_servir.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos de análise")
+    p_servir.add_argument("--lote", type=int, default=16, help="Pedidos enviados de uma vez a um worker")
+    p_servir.add_argument("--tempo-limite", type=float, default=60.0, help="Espera máxima por análise (s)")
+
+    p_analisar = comandos.add_parser("analisar", help="Analisa arquivos no servidor e imprime o JSON")
+    _adicionar_endereco(p_analisar)
+    p_analisar.add_argument("arquivos", nargs="+")
+    p_analisar.add_argument("--lexer", choices=BACKENDS, default="ply")
+
+    for comando in ("saude", "metricas"):
+        _adicionar_endereco(comandos.add_parser(comando, help=f"Consulta /{comando}"))
+
+    args = parser.parse_args()
+    if args.comando == "servir":
+        servir(args.socket, args.host, args.porta, max(1, args.workers), max(1, args.lote), args.tempo_limite)
+        return 0
+
+    cliente = ClienteTonto(args.socket, args.host, args.porta)
+    try:
+        if args.comando == "analisar":
+            resultados = cliente.chamar_lote([("analisar", {"caminho": os.path.abspath(a), "lexer": args.lexer})
+                                              for a in args.arquivos])
+            falhou = False
+            for arquivo, resultado in zip(args.arquivos, resultados):
+                if isinstance(resultado, ErroServidor):
+                    falhou = True
+                    resultado = {"arquivo": arquivo, "erro": {"codigo": resultado.codigo, "mensagem": str(resultado)}}
+                print(json.dumps(resultado, ensure_ascii=False))
+            return 1 if falhou else 0
+        print(json.dumps(cliente.saude() if args.comando == "saude" else cliente.metricas(),
+                         ensure_ascii=False, indent=2))
+        return 0
+    finally:
+        cliente.fechar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
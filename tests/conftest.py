@@ -0,0 +1,16 @@
+import os
+import sys
+import glob
+
+import pytest
+
+DIR_TESTES = os.path.dirname(os.path.abspath(__file__))
+
+# Os módulos do analisador ficam em src/ e se importam pelo nome (sem pacote)
+sys.path.insert(0, os.path.join(DIR_TESTES, "..", "src"))
+
+
+@pytest.fixture(scope="session")
+def arquivos_tonto():
+    """Os modelos de exemplo da pasta tests/ (todos os .tonto, inclusive em subpastas)."""
+    return sorted(glob.glob(os.path.join(DIR_TESTES, "**", "*.tonto"), recursive=True))
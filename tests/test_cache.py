@@ -0,0 +1,63 @@
+import os
+import pickle
+
+import pytest
+
+from cache_tonto import CacheAnalise
+from contexto_tonto import analisar_documento
+
+CODIGO = "package P\nkind Pessoa\nrole Aluno specializes Pessoa\n"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheAnalise(str(tmp_path / "cache"))
+
+
+def _entrada(cache, codigo):
+    return cache._caminho(cache.chave(codigo))
+
+
+def test_acerto_devolve_o_contexto_guardado(cache):
+    assert cache.obter(CODIGO) is None
+    contexto = analisar_documento(CODIGO)
+    cache.guardar(CODIGO, contexto)
+
+    guardado = cache.obter(CODIGO)
+    assert guardado.sintese == contexto.sintese
+    assert list(guardado.tabela.linhas()) == list(contexto.tabela.linhas())
+    assert guardado.erros_semanticos == contexto.erros_semanticos
+    assert cache.obter(CODIGO + "\n") is None
+
+
+@pytest.mark.parametrize("conteudo", [
+    b"",
+    b"\x80\x05\x8c\x08builtins\x8c\x03int\x93\x8c\x01x\x85R.",  # ValueError ao carregar
+    b"lixo que nao e pickle",
+    pickle.dumps({"sintese": {}}),  # pickle válido de outro objeto
+])
+def test_entrada_corrompida_e_descartada(cache, conteudo):
+    cache.guardar(CODIGO, analisar_documento(CODIGO))
+    caminho = _entrada(cache, CODIGO)
+    with open(caminho, "wb") as f:
+        f.write(conteudo)
+
+    assert cache.obter(CODIGO) is None
+    assert not os.path.exists(caminho)
+
+
+def test_podar_remove_as_menos_usadas_e_ignora_temporarios(cache):
+    codigos = [f"kind Classe{i}\n" for i in range(4)]
+    for i, codigo in enumerate(codigos):
+        cache.guardar(codigo, analisar_documento(codigo))
+        os.utime(_entrada(cache, codigo), (1000 + i, 1000 + i))
+    # Um guardar() em andamento em outro processo
+    temporario = os.path.join(os.path.dirname(_entrada(cache, codigos[0])), "em_andamento.tmp")
+    with open(temporario, "wb") as f:
+        f.write(b"x" * 10 ** 6)
+
+    tamanho = os.path.getsize(_entrada(cache, codigos[0]))
+    cache.limite_bytes = 2 * tamanho
+    assert cache.podar() == 2
+    assert [os.path.exists(_entrada(cache, c)) for c in codigos] == [False, False, True, True]
+    assert os.path.exists(temporario)
@@ -0,0 +1,61 @@
+import sys
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from contexto_tonto import ContextoAnalise, analisar_documento
+from lexico_tonto import ler_codigo
+
+
+def _resultado(contexto):
+    return (list(contexto.tabela.linhas()), contexto.sintese, contexto.erros_lexicos, contexto.erros_sintaticos,
+            contexto.padroes, contexto.erros_semanticos, contexto.diagnosticos)
+
+
+@pytest.fixture
+def trocas_frequentes():
+    # Trocas de thread bem mais frequentes que o padrão para forçar intercalações
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(intervalo)
+
+
+def _em_threads(funcao, tarefas, threads=4):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(funcao, tarefas))
+
+
+def test_analises_concorrentes_iguais_a_serial(arquivos_tonto, trocas_frequentes):
+    codigos = {arquivo: ler_codigo(arquivo) for arquivo in arquivos_tonto}
+    esperado = {arquivo: _resultado(analisar_documento(codigo)) for arquivo, codigo in codigos.items()}
+    tarefas = list(codigos) * 3
+    random.Random(0).shuffle(tarefas)
+
+    obtidos = _em_threads(lambda arquivo: _resultado(analisar_documento(codigos[arquivo])), tarefas)
+    assert [arquivo for arquivo, obtido in zip(tarefas, obtidos) if obtido != esperado[arquivo]] == []
+
+
+def test_estado_de_cada_analise_fica_no_seu_contexto(trocas_frequentes):
+    # Backends, limites e erros diferentes ao mesmo tempo: nada vaza de uma análise para outra
+    variantes = [
+        ("kind Pessoa\n$ kind Animal\n", "ply", None),
+        ("kind Pessoa\n% kind Animal\n", "fast", None),
+        ("kind A {\n x string\n}\nkind B {\n y string\n}\nkind C\n", "ply", 1),
+        ("kind Pessoa\nsubkind Aluno specializes Pessoa\n", "fast", None),
+        ("kind A\n& kind B\n& kind C\n& kind D\n", "ply", 2),
+    ]
+
+    def _analisar(variante):
+        codigo, backend, limite = variante
+        return _resultado(analisar_documento(codigo, ContextoAnalise(backend, limite)))
+
+    esperado = [_analisar(v) for v in variantes]
+    tarefas = list(range(len(variantes))) * 20
+    random.Random(1).shuffle(tarefas)
+    obtidos = _em_threads(lambda i: _analisar(variantes[i]), tarefas, threads=8)
+    assert [i for i, obtido in zip(tarefas, obtidos) if obtido != esperado[i]] == []
+    # As próprias referências distinguem as variantes (o teste não compara resultados iguais por acaso)
+    assert esperado[0][2] != esperado[1][2]
+    assert [d["codigo"] for d in esperado[4][6]] == ["LEX001", "LEX001", "LIM001"]
@@ -0,0 +1,68 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from contexto_tonto import ContextoAnalise, analisar_documento
+from lexico_tonto import ArquivoNaoTexto, ler_codigo, BACKENDS
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_sequencia_invalida_e_um_unico_erro(backend):
+    contexto = analisar_documento("kind Pessoa\n$$$%% & kind Animal\n", ContextoAnalise(backend))
+
+    lexicos = [d for d in contexto.diagnosticos if d["codigo"] == "LEX001"]
+    assert [(d["linha"], d["coluna"], d["posicao"], d["tamanho"]) for d in lexicos] == [(2, 1, 12, 5), (2, 7, 18, 1)]
+    assert contexto.erros_lexicos == [
+        "Erro Léxico: 5 caracteres inesperados '$$$%%' na linha 2, coluna 1.",
+        "Erro Léxico: caractere inesperado '&' na linha 2, coluna 7.",
+    ]
+    assert list(contexto.sintese["classes"]) == ["Pessoa", "Animal"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_limite_de_erros_interrompe_a_analise(backend):
+    codigo = "kind A\n$ kind B\n% kind C\n& kind D\n"
+    contexto = analisar_documento(codigo, ContextoAnalise(backend, limite_erros=2))
+
+    assert contexto.interrompida
+    assert [d["codigo"] for d in contexto.diagnosticos] == ["LEX001", "LEX001", "LIM001"]
+    assert contexto.erros_lexicos[-1] == "Erro Léxico: Limite de 2 erros atingido; análise interrompida."
+    # O semântico não roda sobre uma análise interrompida
+    assert contexto.padroes == [] and contexto.erros_semanticos == []
+
+
+def test_limite_conta_erros_sintaticos():
+    contexto = analisar_documento("kind A {\n x string\n}\nkind B {\n y string\n}\nkind C\n",
+                                  ContextoAnalise(limite_erros=1))
+    assert contexto.interrompida
+    assert [d["codigo"] for d in contexto.diagnosticos] == ["SIN001", "LIM001"]
+
+
+def test_max_errors_na_linha_de_comando(tmp_path):
+    modelo = tmp_path / "m.tonto"
+    modelo.write_text("kind A\n$ kind B\n% kind C\n", encoding="utf-8")
+    saida = tmp_path / "saida"
+    processo = subprocess.run([sys.executable, MAIN, str(modelo), "--saida", str(saida), "--max-errors", "1"],
+                              capture_output=True, text=True)
+    assert processo.returncode == 1
+    erros = (saida / "lexico" / "erros_lexicos.txt").read_text(encoding="utf-8")
+    assert "Limite de 1 erros atingido" in erros
+    assert "'%'" not in erros
+
+
+@pytest.mark.parametrize("conteudo", [b"kind A\0\n", "kind Ação\n".encode("latin-1")])
+def test_arquivo_que_nao_e_texto_e_recusado(tmp_path, conteudo):
+    caminho = tmp_path / "binario.tonto"
+    caminho.write_bytes(conteudo)
+    with pytest.raises(ArquivoNaoTexto):
+        ler_codigo(str(caminho))
+
+
+def test_texto_utf8_e_aceito(tmp_path):
+    caminho = tmp_path / "texto.tonto"
+    caminho.write_text("kind Ação\n", encoding="utf-8")
+    assert ler_codigo(str(caminho)) == "kind Ação\n"
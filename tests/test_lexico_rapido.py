@@ -0,0 +1,63 @@
+import pytest
+
+from contexto_tonto import ContextoAnalise
+from lexico_tonto import tokenizar, ler_codigo, BACKENDS
+
+MODELO = ("package Escola\n"
+          "import Base\n"
+          "kind Pessoa {\n"
+          "    nome: string [1]\n"
+          "}\n"
+          "@material relation Pessoa [1..*] -- estuda -- [*] Aluno\n")
+
+TOKENS_MODELO = [
+    ('KW_PACKAGE', 'package', 1, 0), ('CLASS_NAME', 'Escola', 1, 8),
+    ('KW_IMPORT', 'import', 2, 15), ('CLASS_NAME', 'Base', 2, 22),
+    ('CLASS_STEREOTYPE', 'kind', 3, 27), ('CLASS_NAME', 'Pessoa', 3, 32), ('LBRACE', '{', 3, 39),
+    ('RELATION_NAME', 'nome', 4, 45), ('COLON', ':', 4, 49), ('DATA_TYPE', 'string', 4, 51),
+    ('LBRACKET', '[', 4, 58), ('NUMBER', 1, 4, 59), ('RBRACKET', ']', 4, 60),
+    ('RBRACE', '}', 5, 62),
+    ('AT', '@', 6, 64), ('RELATION_STEREOTYPE', 'material', 6, 65), ('KW_RELATION', 'relation', 6, 74),
+    ('CLASS_NAME', 'Pessoa', 6, 83), ('LBRACKET', '[', 6, 90), ('NUMBER', 1, 6, 91), ('RANGE_DOTS', '..', 6, 92),
+    ('STAR', '*', 6, 94), ('RBRACKET', ']', 6, 95), ('REL_SYM', '--', 6, 97), ('RELATION_NAME', 'estuda', 6, 100),
+    ('REL_SYM', '--', 6, 107), ('LBRACKET', '[', 6, 110), ('STAR', '*', 6, 111), ('RBRACKET', ']', 6, 112),
+    ('CLASS_NAME', 'Aluno', 6, 114),
+]
+
+
+def _tokens(codigo, backend):
+    contexto = ContextoAnalise(backend)
+    tokens_lidos = tokenizar(codigo, contexto)
+    return ([(tok.type, type(tok.value), tok.value, tok.lineno, tok.lexpos) for tok in tokens_lidos],
+            contexto.erros_lexicos, contexto.diagnosticos, list(contexto.linhas.inicios))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_sequencia_de_tokens_conhecida(backend):
+    tokens_lidos, erros, _, _ = _tokens(MODELO, backend)
+    assert [(tipo, valor, linha, posicao) for tipo, _, valor, linha, posicao in tokens_lidos] == TOKENS_MODELO
+    # O número sai como int nos dois backends
+    assert tokens_lidos[11][1] is int
+    assert erros == []
+
+
+@pytest.mark.parametrize("codigo", [
+    "",
+    "kind Pessoa {\n    nome: string\n}\n",
+    "kind Pessoa\n$$$ kind Animal # comentário\n% &\n",
+    "datatype CPF {\n    numero: int\n}\nenum Cor { Azul, Verde }\n",
+    "kind bad-name\nKind_Com_Sublinhado\nrelator Contrato\n",
+    "genset G where Aluno, Prof specializes Pessoa\n",
+    "kind Ação 😀 Café\n",
+])
+def test_backends_concordam_em_casos_limite(codigo):
+    assert _tokens(codigo, "fast") == _tokens(codigo, "ply")
+
+
+def test_backends_concordam_nos_modelos_de_exemplo(arquivos_tonto):
+    divergentes = []
+    for arquivo in arquivos_tonto:
+        codigo = ler_codigo(arquivo)
+        if _tokens(codigo, "fast") != _tokens(codigo, "ply"):
+            divergentes.append(arquivo)
+    assert divergentes == []
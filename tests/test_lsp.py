@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from benchmark_tonto import ClienteLSP
+from blocos_tonto import dividir_em_blocos
+from lsp_tonto import Documento, SINCRONIA_INCREMENTAL, ERRO, AVISO
+
+URI = "file:///modelo.tonto"
+
+MODELO = (
+    "package P\n"
+    "// ação 😀 é\n"
+    "kind Pessoa\n"
+    "subkind Aluno specializes Pessoa\n"
+    "subkind Prof specializes Pessoa\n"
+    "genset G { general Pessoa specifics Aluno, Prof }\n"
+    "kind 😀x $\n"
+)
+
+
+def _faixa(linha, inicio, fim):
+    return {"start": {"line": linha, "character": inicio}, "end": {"line": linha, "character": fim}}
+
+
+def _mudanca(linha, inicio, fim, texto):
+    return {"range": _faixa(linha, inicio, fim), "text": texto}
+
+
+@pytest.fixture
+def cliente():
+    cliente = ClienteLSP()
+    yield cliente
+    if cliente.processo.poll() is None:
+        cliente.processo.kill()
+        cliente.processo.wait()
+
+
+def _publicados(cliente, versao, *mudancas):
+    cliente.enviar("textDocument/didChange",
+                   {"textDocument": {"uri": URI, "version": versao}, "contentChanges": list(mudancas)})
+    return _diagnosticos(cliente, versao)
+
+
+def _diagnosticos(cliente, versao):
+    mensagem = cliente.esperar("textDocument/publishDiagnostics")
+    assert mensagem["params"]["uri"] == URI
+    assert mensagem["params"]["version"] == versao
+    return sorted(((d["severity"], d["source"], d["range"]) for d in mensagem["params"]["diagnostics"]),
+                  key=lambda d: (d[2]["start"]["line"], d[2]["start"]["character"]))
+
+
+def test_ciclo_por_stdio(cliente):
+    cliente.enviar("initialize", {"capabilities": {}}, requisicao=True)
+    resposta = cliente.esperar()
+    assert resposta["result"]["capabilities"]["textDocumentSync"]["change"] == SINCRONIA_INCREMENTAL
+
+    cliente.enviar("textDocument/didOpen",
+                   {"textDocument": {"uri": URI, "languageId": "tonto", "version": 1, "text": MODELO}})
+    # Colunas em unidades UTF-16: o emoji ocupa duas
+    assert _diagnosticos(cliente, 1) == [
+        (AVISO, "tonto-semantico", _faixa(5, 0, 49)),
+        (ERRO, "tonto-lexico", _faixa(6, 5, 7)),
+        (ERRO, "tonto-sintatico", _faixa(6, 7, 8)),
+        (ERRO, "tonto-lexico", _faixa(6, 9, 10)),
+    ]
+
+    # Uma linha nova acima, com acento e emoji: tudo desce uma linha (o modelo
+    # não mudou, e o aviso do semântico só é deslocado)
+    assert _publicados(cliente, 2, _mudanca(1, 12, 12, "\n// 😀 ç")) == [
+        (AVISO, "tonto-semantico", _faixa(6, 0, 49)),
+        (ERRO, "tonto-lexico", _faixa(7, 5, 7)),
+        (ERRO, "tonto-sintatico", _faixa(7, 7, 8)),
+        (ERRO, "tonto-lexico", _faixa(7, 9, 10)),
+    ]
+
+    # O intervalo recebido também está em UTF-16: apaga o '$' depois do emoji
+    assert _publicados(cliente, 3, _mudanca(7, 9, 10, "")) == [
+        (AVISO, "tonto-semantico", _faixa(6, 0, 49)),
+        (ERRO, "tonto-lexico", _faixa(7, 5, 7)),
+        (ERRO, "tonto-sintatico", _faixa(7, 7, 8)),
+    ]
+
+    # Duas mudanças na mesma notificação: o genset vira disjoint (o semântico
+    # roda de novo) e o emoji e o 'x' dão lugar a um nome
+    assert _publicados(cliente, 4, _mudanca(6, 0, 0, "disjoint "), _mudanca(7, 5, 8, "Coisa")) == []
+
+    cliente.encerrar()
+    assert cliente.processo.returncode == 0
+
+
+def test_divisao_incremental_igual_a_completa(arquivos_tonto):
+    rnd = random.Random(3)
+    pedacos = ["{", "}", "\n", "kind ", "relation ", "@mediation ", "// ", "é😀", "\nkind Nova {\n", "genset G {", ""]
+    for caminho in arquivos_tonto[:6]:
+        with open(caminho, encoding="utf-8") as f:
+            documento = Documento(URI, f.read(), 1)
+        for _ in range(40):
+            inicio = rnd.randrange(len(documento.texto) + 1)
+            fim = min(len(documento.texto), inicio + rnd.choice([0, 1, 20, 200]))
+            documento._substituir(inicio, fim, rnd.choice(pedacos))
+            blocos = dividir_em_blocos(documento.texto)
+            assert list(documento.inicios_trechos) == [deslocamento for deslocamento, _, _ in blocos]
+            assert documento.trechos == [texto for _, _, texto in blocos]
+            assert list(documento.linhas.inicios) == list(Documento(URI, documento.texto, 1).linhas.inicios)
+        assert documento.diagnosticar() == Documento(URI, documento.texto, 1).diagnosticar()
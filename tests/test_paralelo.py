@@ -0,0 +1,96 @@
+import pytest
+
+from ast_tonto import nos_da_sintese
+from contexto_tonto import ContextoAnalise
+from lexico_tonto import analisar_codigo, ler_codigo, BACKENDS
+from parser_tonto import analisar_sintaxe
+from paralelo_tonto import analisar_em_paralelo, dividir_em_trechos
+
+# Chaves em comentários, declarações logo depois de '}' e linhas recuadas que
+# começam com '@' ou 'relation' dentro de chaves: nenhuma delas é um ponto de divisão
+MODELO = """package Escola
+// comentário com { chave aberta
+kind Pessoa {
+    nome: string
+    @mediation [1] -- [1..*] Contrato
+}
+relator Contrato {
+    // relation { ainda dentro
+    valor: int
+}
+datatype CPF {
+    numero: string
+}
+role Aluno specializes Pessoa
+disjoint complete genset Papeis {
+    general Pessoa
+    specifics Aluno
+}
+@material relation Pessoa [1] -- estuda -- [*] Aluno
+enum Cor { Azul, Verde }
+"""
+
+
+def _serial(codigo, backend="ply"):
+    contexto = ContextoAnalise(backend)
+    _, _, tokens_lidos = analisar_codigo(codigo, contexto)
+    analisar_sintaxe(codigo, tokens_lidos, contexto)
+    return contexto
+
+
+def _resumo(contexto):
+    sintese = contexto.sintese
+    return (list(contexto.tabela.linhas()), list(contexto.linhas.inicios), contexto.erros_lexicos,
+            contexto.erros_sintaticos, contexto.diagnosticos, sintese["pacotes"], sintese["imports"],
+            [list(sintese[chave]) for chave in ("classes", "tipos", "enums")],
+            [no.como_dict() for no in nos_da_sintese(sintese)])
+
+
+def _paralelo(codigo, backend="ply"):
+    # Trechos sem tamanho mínimo: até um modelo pequeno é dividido em todas as declarações
+    return analisar_em_paralelo(codigo, ContextoAnalise(backend), processos=2, tamanho_minimo=0)
+
+
+def test_trechos_comecam_em_declaracoes_de_topo_fora_de_chaves():
+    trechos = dividir_em_trechos(MODELO, partes=100, tamanho_minimo=0)
+    inicios = ["relator Contrato", "datatype CPF", "role Aluno", "disjoint complete", "@material", "enum Cor"]
+    assert [(deslocamento, linha) for deslocamento, linha, _ in trechos] == (
+        [(0, 1)] + [(MODELO.index(i), MODELO[:MODELO.index(i)].count("\n") + 1) for i in inicios])
+    # Os trechos cobrem o código inteiro, sem buracos
+    assert [fim for _, _, fim in trechos[:-1]] == [deslocamento for deslocamento, _, _ in trechos[1:]]
+    assert trechos[-1][2] == len(MODELO)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_divisao_em_chaves_igual_a_serial(backend):
+    contexto, trechos = _paralelo(MODELO, backend)
+    assert trechos > 1
+    assert _resumo(contexto) == _resumo(_serial(MODELO, backend))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_erros_lexicos_nos_trechos_igual_a_serial(backend):
+    codigo = MODELO.replace("valor: int", "valor: int $$") + "kind Final\n% \n"
+    contexto, trechos = _paralelo(codigo, backend)
+    assert trechos > 1
+    assert _resumo(contexto) == _resumo(_serial(codigo, backend))
+    assert len(contexto.erros_lexicos) == 2
+
+
+def test_erro_sintatico_volta_para_a_analise_serial():
+    codigo = MODELO.replace("numero: string", "numero string")
+    contexto, trechos = _paralelo(codigo)
+    assert trechos == 0
+    assert contexto.erros_sintaticos == [
+        "[ERRO SINTÁTICO] Token inesperado 'string' (DATA_TYPE) na linha 12, coluna 12"]
+    assert _resumo(contexto) == _resumo(_serial(codigo))
+
+
+def test_paralelo_igual_a_serial_nos_modelos_de_exemplo(arquivos_tonto):
+    divergentes = []
+    for arquivo in arquivos_tonto:
+        codigo = ler_codigo(arquivo)
+        for backend in BACKENDS:
+            if _resumo(_paralelo(codigo, backend)[0]) != _resumo(_serial(codigo, backend)):
+                divergentes.append((arquivo, backend))
+    assert divergentes == []
@@ -0,0 +1,61 @@
+import pytest
+
+from projeto_tonto import analisar_projeto, ordenar_topologicamente, encontrar_ciclos
+from main import salvar_projeto
+
+MODULOS = {
+    "Base.tonto": "package Base\nkind Pessoa\n",
+    # Sem 'package': o módulo é identificado pelo nome do arquivo
+    "utilidades.tonto": "datatype CPF {\n    numero: string\n}\n",
+    "Escola.tonto": "package Escola\nimport Base\nimport utilidades\nrole Aluno specializes Pessoa\n",
+    "curso_arquivo.tonto": "package Curso\nimport Escola\nkind Disciplina\n",
+    # A <-> B formam um ciclo; Usa depende dele; B importa um módulo que não existe
+    "A.tonto": "package A\nimport B\nkind X\n",
+    "B.tonto": "package B\nimport A\nimport Inexistente\nkind Y\n",
+    "Usa.tonto": "package Usa\nimport A\nkind Z\n",
+}
+
+
+@pytest.fixture
+def projeto(tmp_path):
+    for nome, codigo in MODULOS.items():
+        (tmp_path / nome).write_text(codigo, encoding="utf-8")
+    return tmp_path
+
+
+def test_ordem_ciclos_e_ausentes(projeto):
+    resultado = analisar_projeto(str(projeto))
+
+    assert resultado.ordem == ["Base", "utilidades", "Escola", "Curso"]
+    assert resultado.em_ciclo == ["A", "B", "Usa"]
+    assert resultado.ciclos == [["A", "B"]]
+    assert resultado.ausentes == [("B", "Inexistente")]
+    assert resultado.erros_projeto == []
+    # O modelo mesclado tem as classes de todos os módulos, inclusive os do ciclo
+    assert sorted(resultado.sintese["classes"]) == ["Aluno", "Disciplina", "Pessoa", "X", "Y", "Z"]
+    assert list(resultado.sintese["tipos"]) == ["CPF"]
+
+
+def test_arquivo_de_entrada_traz_so_o_que_ele_importa(projeto):
+    resultado = analisar_projeto(str(projeto / "curso_arquivo.tonto"))
+    assert resultado.ordem == ["Base", "utilidades", "Escola", "Curso"]
+    assert resultado.em_ciclo == [] and resultado.ciclos == [] and resultado.ausentes == []
+
+
+def test_relatorio_separa_modulos_em_ciclo(projeto, tmp_path):
+    caminho = salvar_projeto(analisar_projeto(str(projeto)), str(tmp_path / "saida"))
+    with open(caminho, encoding="utf-8") as f:
+        relatorio = f.read()
+    ordenados, resto = relatorio.split("2. MÓDULOS EM CICLO / DEPENDENTES DE CICLO")
+    assert "1. MÓDULOS EM ORDEM TOPOLÓGICA: 4" in ordenados
+    assert "- A [" not in ordenados and "- Usa [" not in ordenados
+    em_ciclo, _ = resto.split("3. CICLOS DE IMPORT:")
+    assert em_ciclo.startswith(" (sem ordem topológica): 3\n")
+    assert "[!] A <-> B" in resto
+    assert "[!] 'Inexistente' importado por 'B' não foi encontrado." in resto
+
+
+def test_ordenacao_e_ciclos_no_grafo():
+    grafo = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"], "x": ["y"], "y": ["z"], "z": ["x"], "w": ["x"]}
+    assert ordenar_topologicamente(grafo) == (["a", "b", "c", "d"], ["w", "x", "y", "z"])
+    assert encontrar_ciclos(grafo) == [["x", "y", "z"]]
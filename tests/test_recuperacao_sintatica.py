@@ -0,0 +1,59 @@
+import pytest
+
+from contexto_tonto import ContextoAnalise
+from lexico_tonto import analisar_codigo, BACKENDS
+from parser_tonto import analisar_sintaxe
+
+
+def _analisar(codigo, backend="ply"):
+    contexto = ContextoAnalise(backend)
+    _, _, tokens_lidos = analisar_codigo(codigo, contexto)
+    analisar_sintaxe(codigo, tokens_lidos, contexto)
+    return contexto
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_erro_dentro_de_chaves_recomeca_depois_do_fecha(backend):
+    contexto = _analisar("kind Pessoa {\n    nome string\n}\nkind Animal\n", backend)
+    assert contexto.erros_sintaticos == ["[ERRO SINTÁTICO] Token inesperado 'string' (DATA_TYPE) na linha 2, coluna 10"]
+    assert list(contexto.sintese["classes"]) == ["Animal"]
+
+
+def test_palavra_reservada_no_corpo_nao_inicia_declaracao():
+    # Recuada dentro das chaves, 'kind' não é uma declaração nova: nada de erro em cascata no ':'
+    contexto = _analisar("kind Pessoa {\n    kind: string\n}\nkind Animal\n")
+    assert contexto.erros_sintaticos == [
+        "[ERRO SINTÁTICO] Token inesperado 'kind' (CLASS_STEREOTYPE) na linha 2, coluna 5"]
+    assert list(contexto.sintese["classes"]) == ["Animal"]
+
+
+def test_declaracao_na_primeira_coluna_fecha_chaves_esquecidas():
+    contexto = _analisar("kind Pessoa {\n    nome: string\n\nkind Animal\n")
+    assert contexto.erros_sintaticos == [
+        "[ERRO SINTÁTICO] Token inesperado 'kind' (CLASS_STEREOTYPE) na linha 4, coluna 1"]
+    assert list(contexto.sintese["classes"]) == ["Animal"]
+
+
+def test_erro_no_topo_mantem_as_declaracoes_seguintes():
+    codigo = ("kind Pessoa\n"
+              "role Aluno specializes\n"
+              "@material relation Pessoa [1] -- estuda -- [*] Pessoa\n"
+              "kind Animal {\n    idade int\n}\n"
+              "kind Planta\n")
+    contexto = _analisar(codigo)
+    # Os dois erros são reportados; a relação externa recomeça no '@', antes de 'relation'
+    assert contexto.erros_sintaticos == [
+        "[ERRO SINTÁTICO] Token inesperado '@' (AT) na linha 3, coluna 1",
+        "[ERRO SINTÁTICO] Token inesperado 'int' (DATA_TYPE) na linha 5, coluna 11",
+    ]
+    assert [d["codigo"] for d in contexto.diagnosticos] == ["SIN001", "SIN001"]
+    assert list(contexto.sintese["classes"]) == ["Pessoa", "Planta"]
+    assert [(r.origem, r.nome, r.alvo) for r in contexto.sintese["relacoes_externas"]] == [
+        ("Pessoa", "estuda", "Pessoa")]
+
+
+def test_erro_no_fim_do_arquivo():
+    contexto = _analisar("kind Pessoa\nkind Animal {\n    nome: string\n")
+    assert contexto.erros_sintaticos == ["[ERRO SINTÁTICO] Final inesperado do arquivo."]
+    assert [d["codigo"] for d in contexto.diagnosticos] == ["SIN002"]
+    assert list(contexto.sintese["classes"]) == ["Pessoa"]
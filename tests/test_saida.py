@@ -0,0 +1,75 @@
+import os
+import gzip
+import time
+
+import pytest
+
+from saida_tonto import Saida, ler_formatos, LIMITE_BUFFER
+
+
+def _temporarios(pasta):
+    return [nome for nome in os.listdir(pasta) if nome.endswith(".tmp")]
+
+
+def test_relatorio_so_aparece_ao_confirmar(tmp_path):
+    caminho = tmp_path / "relatorio.txt"
+    caminho.write_text("versão anterior\n", encoding="utf-8")
+
+    with Saida(str(caminho), newline="") as f:
+        # Mais que o buffer: parte do texto já foi para o disco, mas no temporário
+        f.write("x" * (LIMITE_BUFFER + 10) + "\n")
+        assert caminho.read_text(encoding="utf-8") == "versão anterior\n"
+        assert len(_temporarios(tmp_path)) == 1
+    assert caminho.read_text(encoding="utf-8") == "x" * (LIMITE_BUFFER + 10) + "\n"
+    assert _temporarios(tmp_path) == []
+    assert os.stat(caminho).st_mode & 0o777 == 0o666 & ~_umask()
+
+
+def test_erro_durante_a_escrita_mantem_o_relatorio_anterior(tmp_path):
+    caminho = tmp_path / "relatorio.txt"
+    caminho.write_text("versão anterior\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with Saida(str(caminho)) as f:
+            f.write("pela metade")
+            raise RuntimeError("falhou no meio")
+    assert caminho.read_text(encoding="utf-8") == "versão anterior\n"
+    assert _temporarios(tmp_path) == []
+
+
+def test_cria_a_pasta_do_relatorio(tmp_path):
+    caminho = tmp_path / "a" / "b" / "relatorio.txt"
+    with Saida(str(caminho), newline="") as f:
+        f.write("ok\n")
+    assert caminho.read_bytes() == b"ok\n"
+
+
+def test_gzip_reproduzivel(tmp_path):
+    caminhos = []
+    for i in range(2):
+        with Saida(str(tmp_path / f"relatorio{i}.txt"), comprimir=True, newline="") as f:
+            f.write("tabela de símbolos\n" * 1000)
+        caminhos.append(f.caminho)
+        time.sleep(1.1)
+
+    assert all(c.endswith(".txt.gz") for c in caminhos)
+    primeiro, segundo = (open(c, "rb").read() for c in caminhos)
+    # mtime=0 no cabeçalho: o mesmo conteúdo gera os mesmos bytes, em qualquer momento
+    assert primeiro == segundo
+    assert primeiro[4:8] == b"\0\0\0\0"
+    assert gzip.decompress(primeiro).decode("utf-8") == "tabela de símbolos\n" * 1000
+
+
+def test_ler_formatos():
+    assert ler_formatos("html, TXT") == ("txt", "html")
+    assert ler_formatos("csv,csv") == ("csv",)
+    with pytest.raises(ValueError, match="pdf"):
+        ler_formatos("txt,pdf")
+    with pytest.raises(ValueError):
+        ler_formatos(" , ")
+
+
+def _umask():
+    atual = os.umask(0)
+    os.umask(atual)
+    return atual
@@ -0,0 +1,101 @@
+import io
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+from cache_tonto import CacheAnalise
+from main import processar_arquivo_json
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py")
+
+MODELO = ("package P\n"
+          "kind Pessoa {\n"
+          "    nome: string\n"
+          "}\n"
+          "kind Animal $$\n"
+          "role Aluno specializes\n"
+          "subkind Bebe specializes Pessoa\n")
+
+
+@pytest.fixture
+def modelo(tmp_path):
+    caminho = tmp_path / "modelo.tonto"
+    caminho.write_text(MODELO, encoding="utf-8")
+    return str(caminho)
+
+
+def _registros(caminho, formato, **opcoes):
+    saida = io.StringIO()
+    processar_arquivo_json(caminho, formato, saida=saida, **opcoes)
+    texto = saida.getvalue()
+    if formato == "ndjson":
+        return [json.loads(linha) for linha in texto.splitlines()]
+    return json.loads(texto)["registros"]
+
+
+def _diagnostico(registros, codigo):
+    return next(r for r in registros if r["registro"] == "diagnostico" and r["codigo"] == codigo)
+
+
+@pytest.mark.parametrize("formato", ["json", "ndjson"])
+def test_tipos_de_registro(modelo, formato):
+    registros = _registros(modelo, formato)
+
+    assert [r["registro"] for r in registros] == [
+        "diagnostico", "declaracao", "declaracao", "diagnostico", "declaracao", "resumo"]
+    assert [r["nome"] for r in registros if r["registro"] == "declaracao"] == ["Pessoa", "Animal", "Bebe"]
+    pessoa = registros[1]
+    assert pessoa["no"] == "Classe" and pessoa["estereotipo"] == "kind"
+    assert pessoa["span"] == {"linha": 2, "inicio": 10, "fim": 42}
+    assert pessoa["atributos"][0]["nome"] == "nome" and pessoa["atributos"][0]["tipo"] == "string"
+
+    resumo = registros[-1]
+    assert resumo["arquivo"] == modelo and resumo["pacotes"] == ["P"]
+    assert (resumo["tokens"], resumo["erros_lexicos"], resumo["erros_sintaticos"], resumo["classes"],
+            resumo["declaracoes"]) == (18, 1, 1, 3, 3)
+
+
+def test_campos_dos_diagnosticos(modelo):
+    registros = _registros(modelo, "ndjson")
+    campos = {"registro", "codigo", "severidade", "etapa", "arquivo", "linha", "coluna", "linha_fim",
+              "coluna_fim", "posicao", "tamanho", "mensagem"}
+
+    lexico = _diagnostico(registros, "LEX001")
+    assert set(lexico) == campos
+    assert lexico == {"registro": "diagnostico", "codigo": "LEX001", "severidade": "erro", "etapa": "lexico",
+                      "arquivo": modelo, "linha": 5, "coluna": 13, "linha_fim": 5, "coluna_fim": 15,
+                      "posicao": 55, "tamanho": 2, "mensagem": "2 caracteres inesperados '$$'"}
+    assert MODELO[lexico["posicao"]:lexico["posicao"] + lexico["tamanho"]] == "$$"
+
+    sintatico = _diagnostico(registros, "SIN001")
+    assert sintatico == {"registro": "diagnostico", "codigo": "SIN001", "severidade": "erro",
+                         "etapa": "sintatico", "arquivo": modelo, "linha": 7, "coluna": 1, "linha_fim": 7,
+                         "coluna_fim": 8, "posicao": 81, "tamanho": 7,
+                         "mensagem": "Token inesperado 'subkind' (CLASS_STEREOTYPE)"}
+
+
+def test_fluxo_e_cache_geram_os_mesmos_registros(modelo, tmp_path):
+    esperado = _registros(modelo, "ndjson")
+    chave = lambda r: json.dumps(r, sort_keys=True)
+
+    assert sorted(map(chave, _registros(modelo, "ndjson", fluxo=True))) == sorted(map(chave, esperado))
+    cache = CacheAnalise(str(tmp_path / "cache"))
+    _registros(modelo, "ndjson", cache=cache)
+    assert cache.obter(MODELO) is not None
+    assert sorted(map(chave, _registros(modelo, "ndjson", cache=cache))) == sorted(map(chave, esperado))
+
+
+def test_etapa_lexica_so_tem_diagnosticos_lexicos(modelo):
+    registros = _registros(modelo, "json", etapas=("lex",))
+    assert [(r["registro"], r.get("codigo")) for r in registros] == [("diagnostico", "LEX001"), ("resumo", None)]
+
+
+def test_linha_de_comando_grava_ndjson_na_saida_padrao(modelo):
+    processo = subprocess.run([sys.executable, MAIN, modelo, "--format", "ndjson", "--no-cache"],
+                              capture_output=True, text=True, encoding="utf-8")
+    assert processo.returncode == 0
+    registros = [json.loads(linha) for linha in processo.stdout.splitlines()]
+    assert registros == _registros(modelo, "ndjson")
@@ -0,0 +1,53 @@
+import os
+import signal
+import threading
+import multiprocessing
+
+import pytest
+
+from gerador_tonto import gerar_modelo
+from servidor_tonto import Despachante, ClienteTonto, ErroServidor, criar_servidor, TEMPO_ESGOTADO
+
+
+@pytest.fixture
+def servidor(request):
+    workers, tempo_limite = getattr(request, "param", (1, None))
+    despachante = Despachante(workers, tempo_limite=tempo_limite)
+    http = criar_servidor(despachante, porta=0, tempo_limite=30.0)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    cliente = ClienteTonto(porta=http.server_address[1], tempo_limite=30.0)
+    yield despachante, cliente
+    cliente.fechar()
+    http.shutdown()
+    http.server_close()
+    despachante.fechar()
+
+
+def _matar_workers():
+    filhos = multiprocessing.active_children()
+    for processo in filhos:
+        os.kill(processo.pid, signal.SIGKILL)
+    for processo in filhos:
+        processo.join(5)
+    return len(filhos)
+
+
+def test_responde_depois_que_workers_morrem(servidor):
+    despachante, cliente = servidor
+    assert cliente.analisar(codigo="kind Pessoa")["declaracoes"][0]["nome"] == "Pessoa"
+    # Mais mortes que workers: nenhuma vaga do pool pode ficar perdida
+    for _ in range(despachante.workers + 2):
+        assert _matar_workers() > 0
+        assert cliente.analisar(codigo="kind Pessoa")["declaracoes"][0]["nome"] == "Pessoa"
+    assert cliente.metricas()["reinicios_pool"] >= despachante.workers + 2
+
+
+@pytest.mark.parametrize("servidor", [(1, 0.3)], indirect=True)
+def test_lote_que_passa_do_prazo_libera_o_worker(servidor):
+    despachante, cliente = servidor
+    with pytest.raises(ErroServidor) as erro:
+        cliente.analisar(codigo=gerar_modelo(20000))
+    assert erro.value.codigo == TEMPO_ESGOTADO
+    # O único worker estava preso no lote vencido: um pool novo responde
+    assert cliente.analisar(codigo="kind Pessoa")["declaracoes"][0]["nome"] == "Pessoa"
+    assert cliente.metricas()["em_andamento"] == 0